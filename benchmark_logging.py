@@ -0,0 +1,97 @@
+"""
+Mede o custo por chamada do TestLogger na thread de teste:
+escrita síncrona x em fila, e mensagens de debug desabilitadas
+(f-string x argumentos x verificação de nível):
+
+    python benchmark_logging.py [--count 20000]
+
+A saída de console é descartada e os arquivos de log vão para um diretório temporário.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.utils.logger import TestLogger
+
+
+def reset_logger():
+    """Encerra o listener e remove (fechando) os handlers do logger global."""
+    TestLogger.close()
+    logger = logging.getLogger("TestAutomation")
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def create_logger(log_dir: str, level: int, queued: bool) -> TestLogger:
+    """Recria o logger global "TestAutomation" com a configuração informada."""
+    reset_logger()
+    return TestLogger(log_dir, level=level, queued=queued)
+
+
+def per_call(function, count: int) -> float:
+    """Retorna o tempo médio por chamada em microssegundos."""
+    start = time.perf_counter()
+    for i in range(count):
+        function(i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do logger")
+    parser.add_argument("--count", type=int, default=20000, help="Chamadas por cenário")
+    args = parser.parse_args()
+    control = {"auto_id": "btnSalvar", "title": "Salvar", "class_name": "Button"}
+
+    rows = []
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        stderr = sys.stderr
+        sys.stderr = devnull
+        try:
+            for name, queued in (("info síncrono", False), ("info em fila", True)):
+                logger = create_logger(log_dir, logging.DEBUG, queued)
+                elapsed = per_call(lambda i: logger.info(f"Executando ação {i}: {control}"), args.count)
+                drain_start = time.perf_counter()
+                TestLogger.close()
+                drain = time.perf_counter() - drain_start
+                rows.append((name, elapsed, drain if queued else None))
+
+            logger = create_logger(log_dir, logging.INFO, True)
+            rows.append((
+                "debug desabilitado (f-string)",
+                per_call(lambda i: logger.debug(f"Controle {i}: {control}"), args.count), None
+            ))
+            rows.append((
+                "debug desabilitado (argumentos)",
+                per_call(lambda i: logger.debug("Controle %s: %s", i, control), args.count), None
+            ))
+            rows.append((
+                "debug desabilitado (is_enabled_for)",
+                per_call(
+                    lambda i: logger.is_enabled_for(logging.DEBUG)
+                    and logger.debug(f"Controle {i}: {control}"),
+                    args.count
+                ),
+                None
+            ))
+        finally:
+            reset_logger()
+            sys.stderr = stderr
+
+    print(f"Chamadas por cenário: {args.count}")
+    print(f"\n{'Cenário':<38}{'µs por chamada':>16}{'Esvaziar fila (ms)':>20}")
+    print("-" * 74)
+    for name, elapsed, drain in rows:
+        drain_text = f"{drain * 1000:.1f}" if drain is not None else "-"
+        print(f"{name:<38}{elapsed:>16.2f}{drain_text:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Mede a memória ocupada por resultados de ações (bytes por resultado).
+Compara o modelo anterior (dataclass com __dict__ e dois datetime), o modelo
+atual (slots e instantes em ns) e as colunas de tempo (TimingColumns):
+
+    python benchmark_result_memory.py [--count 100000]
+"""
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.models.test_result import ActionResult, TestStatus
+from src.models.compact import TimingColumns, monotonic_ns
+
+
+@dataclass
+class LegacyActionResult:
+    """Réplica do ActionResult anterior, para comparação."""
+    action_type: str
+    description: str
+    status: TestStatus
+    start_time: datetime
+    end_time: datetime
+    duration: float
+    error_message: Optional[str] = None
+    screenshot_path: Optional[str] = None
+    read_value: Optional[str] = None
+    context_screenshots: List[str] = field(default_factory=list)
+    capture_area: Optional[Dict[str, Any]] = None
+
+
+def _descriptions(count: int) -> List[str]:
+    # Alocadas antes da medição: o texto é compartilhado com a definição da ação
+    return [f"Clicar no botão {i % 50}" for i in range(count)]
+
+
+def build_legacy(count: int, descriptions: List[str]):
+    now = datetime.now()
+    return [
+        LegacyActionResult(
+            "click", descriptions[i], TestStatus.PASSED,
+            now + timedelta(milliseconds=i), now + timedelta(milliseconds=i + 5), 0.005 + i * 1e-9
+        )
+        for i in range(count)
+    ]
+
+
+def build_compact(count: int, descriptions: List[str]):
+    start = monotonic_ns()
+    return [
+        ActionResult(
+            "click", descriptions[i], TestStatus.PASSED,
+            start + i * 1_000_000, start + i * 1_000_000 + 5_000_000
+        )
+        for i in range(count)
+    ]
+
+
+def build_columns(count: int, descriptions: List[str]):
+    columns = TimingColumns()
+    start = monotonic_ns()
+    for i in range(count):
+        columns.append(start + i * 1_000_000, start + i * 1_000_000 + 5_000_000, TestStatus.PASSED.value)
+    return columns
+
+
+def measure(builder, count: int) -> float:
+    """Retorna os bytes alocados por resultado."""
+    descriptions = _descriptions(count)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    results = builder(count, descriptions)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del results
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória dos resultados")
+    parser.add_argument("--count", type=int, default=100000, help="Quantidade de resultados")
+    args = parser.parse_args()
+
+    print(f"Resultados: {args.count}")
+    print(f"\n{'Modelo':<32}{'Bytes por resultado':>20}")
+    print("-" * 52)
+    for name, builder in (
+        ("ActionResult anterior", build_legacy),
+        ("ActionResult compacto", build_compact),
+        ("TimingColumns", build_columns),
+    ):
+        print(f"{name:<32}{measure(builder, args.count):>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
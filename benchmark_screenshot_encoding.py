@@ -0,0 +1,70 @@
+"""
+Compara perfis de codificação de screenshots (tempo de codificação e tamanho).
+Execute com imagens capturadas da aplicação ou sem argumentos para usar a tela atual:
+
+    python benchmark_screenshot_encoding.py [imagem.png ...] [--repeat 3]
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PIL import Image, ImageGrab
+
+from src.models.test_script import ScreenshotEncoding
+from src.core.screenshot_encoding import encode_image
+
+
+PROFILES = {
+    "png-1": ScreenshotEncoding(format="png", compress_level=1),
+    "png-6": ScreenshotEncoding(format="png", compress_level=6),
+    "png-9": ScreenshotEncoding(format="png", compress_level=9),
+    "png-6-cinza": ScreenshotEncoding(format="png", compress_level=6, grayscale=True),
+    "png-6-1280": ScreenshotEncoding(format="png", compress_level=6, max_dimension=1280),
+    "webp-80": ScreenshotEncoding(format="webp", quality=80),
+    "webp-50": ScreenshotEncoding(format="webp", quality=50),
+    "webp-80-1280": ScreenshotEncoding(format="webp", quality=80, max_dimension=1280),
+    "jpeg-85": ScreenshotEncoding(format="jpeg", quality=85),
+    "jpeg-60-cinza": ScreenshotEncoding(format="jpeg", quality=60, grayscale=True),
+}
+
+
+def benchmark(images, repeat: int):
+    """Codifica cada imagem com cada perfil e imprime a média por perfil."""
+    print(f"\n{'Perfil':<16}{'Tempo médio (ms)':>18}{'Tamanho médio (KB)':>20}")
+    print("-" * 54)
+    for name, encoding in PROFILES.items():
+        total_time = 0.0
+        total_bytes = 0
+        for image in images:
+            for _ in range(repeat):
+                buffer = io.BytesIO()
+                start = time.perf_counter()
+                encode_image(image, buffer, encoding)
+                total_time += time.perf_counter() - start
+                total_bytes += buffer.tell()
+        count = len(images) * repeat
+        print(f"{name:<16}{total_time / count * 1000:>18.1f}{total_bytes / count / 1024:>20.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de codificação de screenshots")
+    parser.add_argument("images", nargs="*", help="Imagens de exemplo (padrão: captura da tela)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por imagem")
+    args = parser.parse_args()
+
+    if args.images:
+        images = [Image.open(path).convert("RGB") for path in args.images]
+    else:
+        images = [ImageGrab.grab()]
+
+    print(f"Imagens: {len(images)} | Repetições: {args.repeat}")
+    benchmark(images, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,56 @@ Ponto de entrada da aplicação de testes automatizados.
 """
 import sys
 import argparse
+import json
+import logging
 import sys
+from datetime import datetime
+from pathlib import Path
 
 from src.utils.logger import TestLogger
 from src.utils.json_validator import JsonValidator
 from src.models.test_script import TestScript
+from src.models.execution_options import ExecutionOptions
 from src.core.test_executor import TestExecutor
+from src.core.checkpoint import CheckpointState
+from src.core.test_ordering import ORDER_STRATEGIES
+from src.core.sharding import parse_shard
+from src.core.report_merge import load_report, merge_results
+
+DEFAULT_SCRIPT = 'config/test_cristal_script.json'
+
+
+def merge_reports(report_paths, output, logger: TestLogger) -> int:
+    """
+    Combina os relatórios dos shards em um único relatório.
+    
+    Args:
+        report_paths: Relatórios dos shards (.json ou .jsonl)
+        output: Arquivo de saída (opcional)
+        logger: Logger
+        
+    Returns:
+        Código de saída (0 se todos os testes passaram)
+    """
+    results = [load_report(path) for path in report_paths]
+    merged, warnings = merge_results(results)
+    for warning in warnings:
+        logger.warning(warning)
+    
+    if output is None:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = Path('reports') / f"report_{timestamp}_merged.json"
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(merged.to_dict(), f, indent=2, ensure_ascii=False)
+    
+    logger.info(f"{len(results)} relatório(s) combinado(s) em: {output}")
+    logger.info(
+        f"Total de testes: {merged.total_tests} - {merged.passed_tests} aprovado(s), "
+        f"{merged.failed_tests} reprovado(s), {merged.error_tests} erro(s)"
+    )
+    return 1 if merged.failed_tests > 0 or merged.error_tests > 0 else 0
 
 
 def main():
@@ -20,30 +64,161 @@ def main():
     parser.add_argument(
         'script',
         type=str,
-        default='config/test_cristal_script.json',
+        default=None,
         nargs='?',
-        help='Caminho para o arquivo JSON com o script de teste'
+        help='Caminho para o arquivo JSON com o script de teste '
+             '(padrão: config/test_cristal_script.json ou o script do checkpoint)'
     )
     parser.add_argument(
         '--no-report',
         action='store_true',
         help='Não salvar relatório JSON'
     )
+    parser.add_argument(
+        '--report-format',
+        choices=['json', 'jsonl'],
+        default='json',
+        help='Formato do relatório: json (gravado ao final) ou jsonl (gravado durante a execução)'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        metavar='CHECKPOINT',
+        help='Retoma uma execução interrompida a partir do arquivo de checkpoint'
+    )
+    parser.add_argument(
+        '--order',
+        choices=ORDER_STRATEGIES,
+        default='script',
+        help='Ordem de execução: script, longest-first (maior duração histórica primeiro) '
+             'ou failed-first (falhas recentes primeiro)'
+    )
+    parser.add_argument(
+        '--history',
+        type=str,
+        default='history/history.db',
+        metavar='PATH',
+        help='Banco SQLite com o histórico de execuções'
+    )
+    parser.add_argument(
+        '--no-history',
+        action='store_true',
+        help='Não gravar nem consultar o histórico de execuções'
+    )
+    parser.add_argument(
+        '--shard',
+        type=str,
+        metavar='i/N',
+        help='Executa apenas o shard i de N (divisão pelo CRC32 dos nomes, ou por duração '
+             'com --shard-durations)'
+    )
+    parser.add_argument(
+        '--shard-durations',
+        type=str,
+        metavar='REPORT',
+        help='Relatório com as durações usadas na divisão em shards (ex.: o combinado da '
+             'execução anterior); todas as máquinas devem receber o mesmo arquivo'
+    )
+    parser.add_argument(
+        '--merge',
+        nargs='+',
+        metavar='REPORT',
+        help='Combina os relatórios dos shards em um único relatório (não executa testes)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        metavar='FILE',
+        help='Arquivo do relatório combinado (com --merge)'
+    )
+    parser.add_argument(
+        '--log-capture',
+        choices=['off', 'failures', 'all'],
+        default='failures',
+        help='Logs de cada teste em logs/test_logs_<ts>.jsonl, referenciados no relatório '
+             '(log_ref): só dos testes reprovados (padrão), de todos ou desligado'
+    )
+    parser.add_argument(
+        '--trace',
+        type=str,
+        metavar='OUT.json',
+        help='Grava o tempo de cada fase (foco, busca de controles, esperas, pausas, '
+             'screenshots) no formato Chrome trace (chrome://tracing ou ui.perfetto.dev)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Executa cada teste sob o cProfile (profile.prof no diretório de screenshots '
+             'do teste) e lista as funções mais custosas no sumário'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        metavar='PORT',
+        help='Publica métricas no formato do Prometheus em http://127.0.0.1:PORT/metrics '
+             'durante a execução'
+    )
+    parser.add_argument(
+        '--metrics-textfile',
+        type=str,
+        metavar='FILE.prom',
+        help='Atualiza periodicamente um arquivo .prom para o textfile collector do node_exporter'
+    )
+    parser.add_argument(
+        '--log-level',
+        choices=['DEBUG', 'INFO', 'WARNING'],
+        default='DEBUG',
+        help='Nível mínimo registrado no arquivo de log (o console mostra a partir de INFO)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Número de instâncias da aplicação executando testes em paralelo'
+    )
     
     args = parser.parse_args()
     
     # Inicializar logger
-    logger = TestLogger()
+    logger = TestLogger(level=getattr(logging, args.log_level))
     
     try:
+        if args.merge:
+            sys.exit(merge_reports(args.merge, args.output, logger))
+        
+        shard_index, shard_count = parse_shard(args.shard) if args.shard else (None, 1)
+        
+        script_path = args.script
+        if script_path is None and args.resume:
+            script_path = CheckpointState.load(args.resume).script_path
+        script_path = script_path or DEFAULT_SCRIPT
+        
         # Validar e carregar script
-        logger.info(f"Carregando script de teste: {args.script}")
-        script_data = JsonValidator.validate_test_script(args.script)
+        logger.info(f"Carregando script de teste: {script_path}")
+        script_data = JsonValidator.validate_test_script(script_path)
         test_script = TestScript.from_dict(script_data)
         logger.info("✓ Script carregado e validado com sucesso")
         
         # Executar testes
-        executor = TestExecutor(logger)
+        options = ExecutionOptions(
+            workers=args.workers,
+            # Sem relatório, não há o que gravar durante a execução
+            report_format='json' if args.no_report else args.report_format,
+            script_path=script_path,
+            resume_from=args.resume,
+            order=args.order,
+            history_path=None if args.no_history else args.history,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            shard_durations=args.shard_durations,
+            log_capture=args.log_capture,
+            trace_path=args.trace,
+            profile=args.profile,
+            metrics_port=args.metrics_port,
+            metrics_textfile=args.metrics_textfile
+        )
+        executor = TestExecutor(logger, options)
         result = executor.execute_script(test_script)
         
         # Salvar relatório
@@ -51,7 +226,9 @@ def main():
             executor.save_report(result)
         
         # Código de saída baseado nos resultados
-        if result.failed_tests > 0 or result.error_tests > 0:
+        if result.interrupted:
+            sys.exit(130)
+        elif result.failed_tests > 0 or result.error_tests > 0:
             
             sys.exit(1)
         else:
@@ -1,19 +1,33 @@
 """
 Classe base para ações de teste.
 """
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Any
-from datetime import datetime
+from contextlib import nullcontext
+from typing import Optional, Any, Tuple
 
 from src.models.test_script import Action
 from src.models.test_result import ActionResult, TestStatus
+from src.models.compact import monotonic_ns
 from src.core.app_manager import AppManager
+from src.core.desktop_lock import desktop_lock
 from src.core.screenshot_manager import ScreenshotManager
 from src.utils.logger import TestLogger
+from src.utils.tracer import span
+from src.utils.metrics import get_metrics
 
 
 class BaseAction(ABC):
-    """Classe base para todas as ações de teste."""
+    """
+    Classe base para todas as ações de teste.
+    
+    A ação inteira (foco, entrada e screenshots) é executada com a trava da
+    área de trabalho, para que workers paralelos não disputem foco, teclado,
+    mouse e tela. Ações que não usam a área de trabalho (uses_desktop = False)
+    usam a trava apenas no foco e nas capturas.
+    """
+    
+    uses_desktop = True
     
     def __init__(self, app_manager: AppManager, screenshot_manager: ScreenshotManager, 
                  logger: TestLogger):
@@ -28,6 +42,8 @@ class BaseAction(ABC):
         self.app_manager = app_manager
         self.screenshot_manager = screenshot_manager
         self.logger = logger
+        self.capture_area: Optional[dict] = None
+        self._last_control = None
     
     def execute(self, action: Action) -> ActionResult:
         """
@@ -39,61 +55,80 @@ class BaseAction(ABC):
         Returns:
             Resultado da execução
         """
-        start_time = datetime.now()
+        start_ns = monotonic_ns()
         status = TestStatus.RUNNING
         error_message = None
         screenshot_path = None
+        context_screenshots = ()
         read_value = None
         
         self.logger.info(f"Executando ação: {action.description}")
         
-        try:
-            # NOVO: Trazer aplicação para primeiro plano antes de executar
-            self._bring_app_to_foreground(action)
-            
-            # Executar a ação específica
-            read_value = self._execute_action(action)
-            status = TestStatus.PASSED
-            self.logger.info(f"✓ Ação concluída com sucesso")
-            
-            # Screenshot de sucesso se configurado
-            if action.screenshot_on_success:
-                # NOVO: Garantir que está em primeiro plano antes do screenshot
+        with span("action", "action", type=action.action_type, description=action.description), \
+                (desktop_lock() if self.uses_desktop else nullcontext()):
+            try:
+                # NOVO: Trazer aplicação para primeiro plano antes de executar
                 self._bring_app_to_foreground(action)
-                screenshot_path = self.screenshot_manager.capture_full_screen(
-                    prefix=f"success_{action.action_type}"
-                )       
                 
-        except Exception as e:
-            status = TestStatus.FAILED
-            error_message = str(e)
-            self.logger.error(f"✗ Ação falhou: {error_message}")
-            
-            # Screenshot de falha se configurado
-            if action.screenshot_on_failure:
-                try:
+                # Executar a ação específica
+                with span(f"action.{action.action_type}"):
+                    read_value = self._execute_action(action)
+                status = TestStatus.PASSED
+                self.logger.info(f"✓ Ação concluída com sucesso")
+                
+                # Screenshot de sucesso se configurado
+                if action.screenshot_on_success:
                     # NOVO: Garantir que está em primeiro plano antes do screenshot
                     self._bring_app_to_foreground(action)
-                    screenshot_path = self.screenshot_manager.capture_full_screen(
-                        prefix=f"failure_{action.action_type}"
-                    )
-                except Exception as screenshot_error:
-                    self.logger.warning(f"Falha ao capturar screenshot: {screenshot_error}")
-        
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
-        
-        return ActionResult(
+                    screenshot_path = self._capture_screenshot(action, f"success_{action.action_type}")
+                else:
+                    # Quadro em memória, gravado apenas se uma ação seguinte falhar
+                    try:
+                        if self.screenshot_manager.ring_buffer is not None:
+                            _, bbox = self._resolve_capture_area(action)
+                            self.screenshot_manager.record_frame(prefix=action.action_type, bbox=bbox)
+                    except Exception as frame_error:
+                        self.logger.debug("Falha ao guardar quadro em memória: %s", frame_error)
+                    
+            except Exception as e:
+                status = TestStatus.FAILED
+                error_message = str(e)
+                self.logger.error(f"✗ Ação falhou: {error_message}")
+                
+                # Gravar os quadros que antecederam a falha
+                try:
+                    context_screenshots = tuple(self.screenshot_manager.dump_ring_buffer())
+                except Exception as buffer_error:
+                    self.logger.warning(f"Falha ao gravar screenshots anteriores: {buffer_error}")
+                
+                # Screenshot de falha se configurado
+                if action.screenshot_on_failure:
+                    try:
+                        # NOVO: Garantir que está em primeiro plano antes do screenshot
+                        self._bring_app_to_foreground(action)
+                        screenshot_path = self._capture_screenshot(action, f"failure_{action.action_type}")
+                    except Exception as screenshot_error:
+                        self.logger.warning(f"Falha ao capturar screenshot: {screenshot_error}")
+            
+        result = ActionResult(
             action_type=action.action_type,
             description=action.description,
             status=status,
-            start_time=start_time,
-            end_time=end_time,
-            duration=duration,
+            start_ns=start_ns,
+            end_ns=monotonic_ns(),
             error_message=error_message,
             screenshot_path=screenshot_path,
-            read_value=read_value
+            read_value=read_value,
+            context_screenshots=context_screenshots,
+            capture_area=self.capture_area
         )
+        
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.actions.inc(action_type=action.action_type, status=status.value)
+            metrics.action_duration.observe(result.duration, action_type=action.action_type)
+        
+        return result
     
     @abstractmethod
     def _execute_action(self, action: Action) -> Optional[Any]:
@@ -121,42 +156,131 @@ class BaseAction(ABC):
         """
         timeout = action.timeout or self.app_manager.timeout
         
-        # Obter janela
-        if action.window_title:
-            window = self.app_manager.get_window(title=action.window_title)
-        else:
-            window = self.app_manager.get_window()
+        with span("get_control", control=action.control):
+            # Obter janela
+            if action.window_title:
+                window = self.app_manager.get_window(title=action.window_title)
+            else:
+                window = self.app_manager.get_window()
 
-        # Obter controle
-        if action.control:
-            # Tentar por auto_id primeiro
-            try:
-                control = window.child_window(auto_id=action.control)
-                if control.exists():
-                    return control
-            except Exception as e:
-                pass
+            # Obter controle (auto_id, title ou class_name, com cache da estratégia)
+            if action.control:
+                control = self.app_manager.locator_cache.resolve(window, action.control)
+                if control is None:
+                    raise Exception(f"Controle não encontrado: {action.control}")
+                self._last_control = control
+                return control
             
-            # Tentar por title
-            try:
-                control = window.child_window(title=action.control)
-                if control.exists():
-                    return control
-            except Exception:
-                pass
+            return window
+    
+    def _wait_for(self, control, *states: str, timeout: Optional[float] = None):
+        """
+        Aguarda o controle atingir os estados informados (ex.: 'visible', 'enabled').
+        
+        Args:
+            control: Controle do pywinauto
+            *states: Estados aguardados, em ordem
+            timeout: Tempo máximo de cada espera em segundos
+        """
+        metrics = get_metrics()
+        started_at = time.perf_counter() if metrics is not None else 0.0
+        try:
+            with span("control_wait", states=" ".join(states)):
+                for state in states:
+                    control.wait(state, timeout=timeout)
+        finally:
+            if metrics is not None:
+                metrics.wait_seconds.inc(time.perf_counter() - started_at, kind="control_wait")
+    
+    def _sleep(self, seconds: float):
+        """
+        Pausa fixa entre etapas da ação (medida como fase própria no rastreamento).
+        
+        Args:
+            seconds: Duração da pausa em segundos
+        """
+        with span("sleep", seconds=seconds):
+            time.sleep(seconds)
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.wait_seconds.inc(seconds, kind="sleep")
+
+    def _capture_screenshot(self, action: Action, prefix: str) -> str:
+        """
+        Captura screenshot da área definida pela política de captura da ação.
+        
+        Args:
+            action: Definição da ação
+            prefix: Prefixo do nome do arquivo
             
-            # Tentar por class_name
-            try:
-                control = window.child_window(class_name=action.control)
-                if control.exists():
-                    return control
-            except Exception:
-                pass
+        Returns:
+            Caminho do screenshot
+        """
+        with span("screenshot", prefix=prefix):
+            mode, bbox = self._resolve_capture_area(action)
+            self.capture_area = {"mode": mode, "rect": list(bbox) if bbox else None}
+            return self.screenshot_manager.capture_region(
+                bbox, prefix=prefix, encoding=action.screenshot_encoding
+            )
+    
+    def _resolve_capture_area(self, action: Action) -> Tuple[str, Optional[Tuple[int, int, int, int]]]:
+        """
+        Determina a área a capturar: controle, janela ou tela inteira.
+        
+        O modo vem de action.capture ou, na falta dele, da configuração de
+        screenshots do script ("window" por padrão). Se o retângulo do controle
+        ou da janela não puder ser obtido, captura a tela inteira.
+        
+        Args:
+            action: Definição da ação
             
-            raise Exception(f"Controle não encontrado: {action.control}")
+        Returns:
+            Tupla (modo efetivo, retângulo com margem ou None para tela inteira)
+        """
+        settings = self.screenshot_manager.settings
+        mode = action.capture or settings.capture
+        padding = action.capture_padding if action.capture_padding is not None else settings.capture_padding
         
-        return window
-
+        if mode == "screen":
+            return "screen", None
+        
+        rect = None
+        if mode == "control" and self._last_control is not None:
+            rect = self._rectangle(self._last_control)
+        
+        if rect is None:
+            mode = "window"
+            try:
+                window = self.app_manager.get_window(title=action.window_title)
+                rect = self._rectangle(window)
+            except Exception as e:
+                self.logger.debug("Retângulo da janela indisponível: %s", e)
+        
+        if rect is None:
+            return "screen", None
+        
+        left, top, right, bottom = rect
+        return mode, (left - padding, top - padding, right + padding, bottom + padding)
+    
+    @staticmethod
+    def _rectangle(element) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Retângulo de um controle ou janela em coordenadas de tela.
+        
+        Args:
+            element: Controle ou janela do pywinauto
+            
+        Returns:
+            Tupla (left, top, right, bottom) ou None se vazio/indisponível
+        """
+        try:
+            rect = element.rectangle()
+        except Exception:
+            return None
+        if rect.right <= rect.left or rect.bottom <= rect.top:
+            return None
+        return (rect.left, rect.top, rect.right, rect.bottom)
+    
     def _bring_app_to_foreground(self, action: Action):
         """
         Traz a aplicação para primeiro plano antes da ação.
@@ -165,13 +289,14 @@ class BaseAction(ABC):
             action: Definição da ação
         """
         try:
-            # Se tiver window_title específico, trazer aquela janela
-            if action.window_title:
-                window = self.app_manager.get_window(title=action.window_title)
-                self.app_manager.bring_to_foreground(window)
-            else:
-                # Caso contrário, trazer janela principal
-                self.app_manager.bring_to_foreground()
+            with span("foreground"):
+                # Se tiver window_title específico, trazer aquela janela
+                if action.window_title:
+                    window = self.app_manager.get_window(title=action.window_title)
+                    self.app_manager.bring_to_foreground(window)
+                else:
+                    # Caso contrário, trazer janela principal
+                    self.app_manager.bring_to_foreground()
             
             self.logger.debug("Aplicação trazida para primeiro plano")
         except Exception as e:
@@ -197,6 +322,6 @@ class BaseAction(ABC):
                 'rect': control.rectangle()
             }
             controls_info.append(control_data)
-            self.logger.debug(f"Controle encontrado: {control_data}")
+            self.logger.debug("Controle encontrado: %s", control_data)
         
         return controls_info
\ No newline at end of file
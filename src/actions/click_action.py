@@ -2,7 +2,6 @@
 Ação de clique.
 """
 from typing import Optional, Any
-import time
 
 from src.actions.base_action import BaseAction
 from src.models.test_script import Action
@@ -24,18 +23,17 @@ class ClickAction(BaseAction):
         control = self._get_control(action)
         
         # Garantir que o controle está visível e habilitado
-        control.wait('visible', timeout=action.timeout or self.app_manager.timeout)
-        control.wait('enabled', timeout=action.timeout or self.app_manager.timeout)
+        self._wait_for(control, 'visible', 'enabled', timeout=action.timeout or self.app_manager.timeout)
         
         # Focar no controle
         try:
             control.set_focus()
-            time.sleep(0.2)
+            self._sleep(0.2)
         except Exception:
             pass
         
         # Executar clique
         control.click()
-        time.sleep(0.5)  # Pequena pausa após clique
+        self._sleep(0.5)  # Pequena pausa após clique
         
         return None
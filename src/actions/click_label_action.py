@@ -2,7 +2,6 @@
 Ação de clique em label ou texto.
 """
 from typing import Optional, Any
-import time
 
 from src.actions.base_action import BaseAction
 from src.models.test_script import Action
@@ -43,6 +42,12 @@ class ClickLabelAction(BaseAction):
         Clica em um elemento de texto ou label buscando por seu conteúdo.
         Útil para elementos que não são normalmente clicáveis.
         
+        A busca usa o índice de textos da janela (título exato e, em seguida,
+        título parcial), reaproveitado entre ações na mesma janela. Antes do
+        clique, o texto atual do controle é relido: se mudou desde a indexação,
+        o controle não é clicado. Se o índice não encontrar o texto, estiver
+        desatualizado ou o controle não existir mais, ele é reconstruído uma vez.
+        
         Args:
             window: Objeto da janela pywinauto
             text_or_label: Texto a buscar
@@ -50,33 +55,45 @@ class ClickLabelAction(BaseAction):
         Returns:
             True se conseguiu clicar, False caso contrário
         """
-        try:
-            # Buscar por titulo exato
-            control = window.child_window(title=text_or_label)
-            if control.exists():
-                rect = control.rectangle()
-                x = (rect.left + rect.right) // 2
-                y = (rect.top + rect.bottom) // 2
-                control.click(coords=(x - rect.left, y - rect.top))
-                self.logger.info(f"Clicou no texto/label: {text_or_label}")
-                time.sleep(0.5)
-                return True
-        except Exception:
-            pass
+        cache = self.app_manager.text_index_cache
+        index = cache.get(window)
+        rebuilt = False
         
-        try:
-            # Buscar por titulo parcial (contém)
-            for control in window.descendants():
-                if text_or_label.lower() in (control.title or "").lower():
-                    rect = control.rectangle()
-                    x = (rect.left + rect.right) // 2
-                    y = (rect.top + rect.bottom) // 2
-                    control.click(coords=(x - rect.left, y - rect.top))
-                    self.logger.info(f"Clicou no texto/label contendo: {text_or_label}")
-                    time.sleep(0.5)
+        while True:
+            for control, exact in index.find(text_or_label):
+                if not index.still_matches(control, text_or_label, exact):
+                    # Texto alterado na mesma janela: o índice está desatualizado
+                    self.logger.debug("Texto do controle indexado mudou - ignorando")
+                    continue
+                try:
+                    self._click_center(control)
+                    self.logger.info(f"Clicou no texto/label: {text_or_label}")
+                    self._sleep(0.5)
                     return True
-        except Exception:
-            pass
+                except Exception as e:
+                    self.logger.debug("Falha ao clicar em controle indexado: %s", e)
+            
+            if rebuilt:
+                break
+            
+            self.logger.debug("Texto '%s' não encontrado no índice - reconstruindo", text_or_label)
+            index = cache.build(window)
+            rebuilt = True
         
         self.logger.warning(f"Não foi possível clicar no texto/label: {text_or_label}")
         return False
+    
+    def _click_center(self, control):
+        """
+        Clica no centro do controle.
+        
+        Args:
+            control: Wrapper do pywinauto
+        """
+        rect = control.rectangle()
+        coords = ((rect.right - rect.left) // 2, (rect.bottom - rect.top) // 2)
+        try:
+            control.click(coords=coords)
+        except (AttributeError, TypeError):
+            # Controles de texto do UIA não têm click(); usar clique do mouse
+            control.click_input(coords=coords)
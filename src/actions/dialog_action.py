@@ -2,7 +2,6 @@
 Ações relacionadas a diálogos.
 """
 from typing import Optional, Any
-import time
 
 from src.actions.base_action import BaseAction
 from src.models.test_script import Action
@@ -47,7 +46,7 @@ class CloseDialogAction(BaseAction):
                 except Exception:
                     raise Exception("Não foi possível fechar o diálogo")
         
-        time.sleep(0.5)
+        self._sleep(0.5)
         return None
 
 
@@ -140,7 +139,7 @@ class CloseWindowAction(BaseAction):
                         f"close(): {e1}, Alt+F4: {e2}, ESC: {e3}"
                     )
         
-        time.sleep(0.5)
+        self._sleep(0.5)
         return None
 
 
@@ -167,9 +166,7 @@ class ScreenshotAction(BaseAction):
         except Exception as e:
             self.logger.warning(f"Aviso ao trazer janela para frente: {e}")
         
-        screenshot_path = self.screenshot_manager.capture_full_screen(
-            prefix="manual_screenshot"
-        )
+        screenshot_path = self._capture_screenshot(action, "manual_screenshot")
         
         self.logger.info(f"Screenshot capturado: {screenshot_path}")
         return screenshot_path
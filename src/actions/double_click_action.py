@@ -2,7 +2,6 @@
 Ação de clique duplo.
 """
 from typing import Optional, Any
-import time
 
 from src.actions.base_action import BaseAction
 from src.models.test_script import Action
@@ -24,13 +23,12 @@ class DoubleClickAction(BaseAction):
         control = self._get_control(action)
         
         # Garantir que o controle está visível e habilitado
-        control.wait('visible', timeout=action.timeout or self.app_manager.timeout)
-        control.wait('enabled', timeout=action.timeout or self.app_manager.timeout)
+        self._wait_for(control, 'visible', 'enabled', timeout=action.timeout or self.app_manager.timeout)
         
         # Focar no controle
         try:
             control.set_focus()
-            time.sleep(0.2)
+            self._sleep(0.2)
         except Exception:
             pass
         
@@ -43,14 +41,14 @@ class DoubleClickAction(BaseAction):
                 control.double_click()
                 self.logger.debug("Clique duplo executado com double_click()")
             except Exception as e1:
-                self.logger.debug(f"double_click() não suportado: {e1}")
+                self.logger.debug("double_click() não suportado: %s", e1)
                 
                 # Método 2: Usar click com double_click parameter
                 try:
                     control.click(double_click=True)
                     self.logger.debug("Clique duplo executado com click(double_click=True)")
                 except Exception as e2:
-                    self.logger.debug(f"click(double_click=True) não suportado: {e2}")
+                    self.logger.debug("click(double_click=True) não suportado: %s", e2)
                     
                     # Método 3: Dois cliques rápidos em sequência
                     try:
@@ -67,7 +65,7 @@ class DoubleClickAction(BaseAction):
                         # Método 4: Dois cliques simples rápidos
                         try:
                             control.click()
-                            time.sleep(0.1)
+                            self._sleep(0.1)
                             control.click()
                             self.logger.debug("Clique duplo executado com dois clicks rápidos")
                         except Exception as e4:
@@ -83,6 +81,6 @@ class DoubleClickAction(BaseAction):
             self.logger.error(f"Erro ao executar clique duplo: {e}")
             raise
         
-        time.sleep(0.5)  # Pequena pausa após clique duplo
+        self._sleep(0.5)  # Pequena pausa após clique duplo
         
         return None
@@ -27,7 +27,7 @@ class ReadAction(BaseAction):
         control = self._get_control(action)
         
         # Garantir que o controle existe
-        control.wait('exists', timeout=action.timeout or self.app_manager.timeout)
+        self._wait_for(control, 'exists', timeout=action.timeout or self.app_manager.timeout)
         
         # Tentar diferentes métodos de leitura
         text = None
@@ -36,7 +36,7 @@ class ReadAction(BaseAction):
         try:
             text = control.window_text()
             if text:
-                self.logger.debug(f"Texto lido (window_text): {text}")
+                self.logger.debug("Texto lido (window_text): %s", text)
                 return text
         except Exception:
             pass
@@ -46,7 +46,7 @@ class ReadAction(BaseAction):
             texts = control.texts()
             if texts and len(texts) > 0:
                 text = " ".join(texts)
-                self.logger.debug(f"Texto lido (texts): {text}")
+                self.logger.debug("Texto lido (texts): %s", text)
                 return text
         except Exception:
             pass
@@ -55,7 +55,7 @@ class ReadAction(BaseAction):
         try:
             text = control.get_value()
             if text:
-                self.logger.debug(f"Texto lido (get_value): {text}")
+                self.logger.debug("Texto lido (get_value): %s", text)
                 return text
         except Exception:
             pass
@@ -64,7 +64,7 @@ class ReadAction(BaseAction):
         try:
             text = control.legacy_properties().get('Value', '')
             if text:
-                self.logger.debug(f"Texto lido (legacy_properties): {text}")
+                self.logger.debug("Texto lido (legacy_properties): %s", text)
                 return text
         except Exception:
             pass
@@ -2,7 +2,6 @@
 Ação de digitação de texto.
 """
 from typing import Optional, Any
-import time
 
 from src.actions.base_action import BaseAction
 from src.models.test_script import Action
@@ -27,12 +26,11 @@ class TypeAction(BaseAction):
         control = self._get_control(action)
         
         # Garantir que o controle está visível e habilitado
-        control.wait('visible', timeout=action.timeout or self.app_manager.timeout)
-        control.wait('enabled', timeout=action.timeout or self.app_manager.timeout)
+        self._wait_for(control, 'visible', 'enabled', timeout=action.timeout or self.app_manager.timeout)
         
         # Focar no controle
         control.set_focus()
-        time.sleep(0.2)
+        self._sleep(0.2)
         
         # Limpar conteúdo existente
         try:
@@ -41,12 +39,12 @@ class TypeAction(BaseAction):
             # Se não for um controle de edição, tentar select_all + delete
             try:
                 control.type_keys("^a{DELETE}")
-                time.sleep(0.1)
+                self._sleep(0.1)
             except Exception:
                 pass
         
         # Digitar o texto
         control.type_keys(action.value, with_spaces=True)
-        time.sleep(0.3)
+        self._sleep(0.3)
         
         return None
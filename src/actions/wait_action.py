@@ -2,7 +2,6 @@
 Ação de espera.
 """
 from typing import Optional, Any
-import time
 
 from src.actions.base_action import BaseAction
 from src.models.test_script import Action
@@ -11,6 +10,9 @@ from src.models.test_script import Action
 class WaitAction(BaseAction):
     """Ação de espera/pausa."""
     
+    # A pausa não usa foco, teclado nem mouse: não bloqueia os outros workers
+    uses_desktop = False
+    
     def _execute_action(self, action: Action) -> Optional[Any]:
         """
         Executa espera.
@@ -27,6 +29,6 @@ class WaitAction(BaseAction):
             raise ValueError("Duração da espera deve ser maior ou igual a zero")
         
         self.logger.info(f"Aguardando {duration} segundo(s)...")
-        time.sleep(duration)
+        self._sleep(duration)
         
         return None
@@ -3,23 +3,36 @@ Gerenciador de aplicações Windows.
 """
 import time
 import subprocess
-from typing import Optional
+from typing import List, Optional, Tuple
 from pathlib import Path
 from pywinauto import Application as PyWinAutoApp
 from pywinauto.findwindows import ElementNotFoundError
 
 try:
     import win32gui
-    import win32con
+    import win32process
     HAS_WIN32 = True
 except ImportError:
     HAS_WIN32 = False
 
+from src.models.test_script import ReadyCondition
+from src.core.click_worker_client import ClickWorkerClient
+from src.core.locator_cache import LocatorCache
+from src.core.text_index import TextIndexCache
+from src.core.foreground_tracker import ForegroundTracker
+from src.core.desktop_lock import desktop_lock
+from src.core.window_registry import WindowRegistry
+from src.core.window_events import WindowEventSource, WindowWaiter, create_default_event_source
+from src.utils.tracer import traced
+from src.utils.metrics import get_metrics
+
 class AppManager:
     """Gerencia o ciclo de vida de aplicações Windows."""
     
     def __init__(self, app_path: str, arguments: str = "", backend: str = "uia", 
-                 startup_delay: int = 3, timeout: int = 10):
+                 startup_delay: int = 3, timeout: int = 10,
+                 ready_condition: Optional[ReadyCondition] = None,
+                 event_source: Optional[WindowEventSource] = None):
         """
         Inicializa o gerenciador.
         
@@ -27,20 +40,32 @@ class AppManager:
             app_path: Caminho do executável
             arguments: Argumentos de linha de comando
             backend: Backend do pywinauto ('win32' ou 'uia')
-            startup_delay: Tempo de espera após iniciar
+            startup_delay: Tempo de espera após iniciar (ignorado se houver ready_condition)
             timeout: Timeout padrão para operações
+            ready_condition: Condição de prontidão verificada por polling (opcional)
+            event_source: Fonte de eventos de janela (padrão: WinEventHook no Windows)
         """
         self.app_path = Path(app_path)
         self.arguments = arguments
         self.backend = backend
         self.startup_delay = startup_delay
         self.timeout = timeout
+        self.ready_condition = ready_condition
+        self.startup_latency: Optional[float] = None
         self.app: Optional[PyWinAutoApp] = None
         self.process: Optional[subprocess.Popen] = None
+        self.click_worker: Optional[ClickWorkerClient] = None
+        self.locator_cache = LocatorCache()
+        self.text_index_cache = TextIndexCache(backend=backend)
+        self.foreground_tracker = ForegroundTracker()
+        self.window_registry = WindowRegistry(self._enumerate_windows)
+        self.window_events = event_source or create_default_event_source()
+        self.window_waiter = WindowWaiter(self.window_events)
         
         if not self.app_path.exists():
             raise FileNotFoundError(f"Aplicação não encontrada: {app_path}")
     
+    @traced("app.start")
     def start(self) -> bool:
         """
         Inicia a aplicação.
@@ -49,7 +74,8 @@ class AppManager:
             True se iniciou com sucesso
             
         Raises:
-            Exception: Se não conseguir iniciar
+            Exception: O erro original se não conseguir iniciar (ex.: TimeoutError
+                quando a aplicação não fica pronta); a instância já foi fechada
         """
         try:
             # Construir comando
@@ -58,21 +84,109 @@ class AppManager:
                 cmd.extend(self.arguments.split())
             
             # Iniciar processo
+            started_at = time.perf_counter()
             self.process = subprocess.Popen(cmd)
+            self._start_window_events(self.process.pid)
             
-            # Aguardar startup
-            time.sleep(self.startup_delay)
-            
-            # Conectar com pywinauto
-            self.app = PyWinAutoApp(backend=self.backend).connect(
-                process=self.process.pid,
-                timeout=self.timeout
-            )
+            if self.ready_condition:
+                # Aguardar a aplicação ficar pronta
+                self._wait_until_ready(self.ready_condition)
+            else:
+                # Aguardar startup
+                time.sleep(self.startup_delay)
+                
+                # Conectar com pywinauto
+                self.app = PyWinAutoApp(backend=self.backend).connect(
+                    process=self.process.pid,
+                    timeout=self.timeout
+                )
             
+            self.startup_latency = time.perf_counter() - started_at
+            metrics = get_metrics()
+            if metrics is not None:
+                metrics.app_starts.inc()
             return True
             
-        except Exception as e:
-            raise Exception(f"Falha ao iniciar aplicação: {str(e)}")
+        except Exception:
+            # Não deixar o processo, o click worker e os eventos de janela órfãos
+            try:
+                self.close(force=True)
+            except Exception:
+                pass
+            raise
+    
+    @traced("app.wait_ready")
+    def _wait_until_ready(self, condition: ReadyCondition):
+        """
+        Aguarda a janela principal do processo satisfazer a condição de prontidão.
+        
+        O intervalo entre as verificações dobra a cada tentativa, até
+        max_poll_interval, e a espera termina no prazo de condition.timeout.
+        
+        Args:
+            condition: Condição de prontidão
+            
+        Raises:
+            TimeoutError: Se a condição não for satisfeita dentro do prazo
+        """
+        deadline = time.monotonic() + condition.timeout
+        interval = condition.poll_interval
+        last_error: Optional[Exception] = None
+        
+        while True:
+            try:
+                if self.app is None:
+                    self.app = PyWinAutoApp(backend=self.backend).connect(
+                        process=self.process.pid
+                    )
+                if self._is_ready(condition):
+                    return
+            except Exception as e:
+                last_error = e
+            
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"Processo encerrou durante a inicialização (código {self.process.returncode})"
+                )
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                detail = f": {last_error}" if last_error else ""
+                raise TimeoutError(
+                    f"Aplicação não ficou pronta em {condition.timeout}s{detail}"
+                )
+            
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, condition.max_poll_interval)
+    
+    def _is_ready(self, condition: ReadyCondition) -> bool:
+        """
+        Verifica uma vez a condição de prontidão.
+        
+        Args:
+            condition: Condição de prontidão
+            
+        Returns:
+            True se a aplicação está pronta
+        """
+        if condition.window_title:
+            window = self.app.window(title_re=condition.window_title)
+        else:
+            window = self.app.top_window()
+        
+        if not window.exists(timeout=0):
+            return False
+        
+        if condition.enabled and not window.is_enabled():
+            return False
+        
+        if condition.control:
+            return (
+                window.child_window(auto_id=condition.control).exists(timeout=0)
+                or window.child_window(title=condition.control).exists(timeout=0)
+            )
+        
+        return True
     
     def connect(self, **kwargs) -> PyWinAutoApp:
         """
@@ -89,16 +203,22 @@ class AppManager:
                 timeout=self.timeout,
                 **kwargs
             )
+            self._start_window_events(self.app.process)
             return self.app
         except Exception as e:
             raise Exception(f"Falha ao conectar à aplicação: {str(e)}")
     
+    @traced("app.get_window")
     def get_window(self, title: Optional[str] = None, **kwargs):
         """
         Obtém uma janela da aplicação.
         
+        Com título, a janela é resolvida pelo registro de janelas (handle em
+        cache); sem título, retorna a janela superior. Não altera o foco: use
+        bring_to_foreground para isso.
+        
         Args:
-            title: Título da janela
+            title: Título (ou expressão regular) da janela
             **kwargs: Outros critérios de busca
             
         Returns:
@@ -108,24 +228,49 @@ class AppManager:
             raise RuntimeError("Aplicação não iniciada ou conectada")
         
         try:
-            #if title:
-                #window = self.app.window(title_re=title)
-            #    window = self.app.window(title_re=f".*{title}.*")
-            #else:
-            window = self.app.top_window()
-
-            if window.is_minimized():
-                window.restore()
-            window.set_focus()
-
-            return window
+            if title:
+                handle = self.window_registry.find(title)
+                if handle is None:
+                    raise ElementNotFoundError(f"title_re={title}")
+                return self.app.window(handle=handle)
+            
+            return self.app.top_window()
         except ElementNotFoundError as e:
             raise Exception(f"Janela não encontrada: {str(e)}")
     
+    def _enumerate_windows(self) -> List[Tuple[int, str]]:
+        """
+        Lista as janelas visíveis de nível superior do processo da aplicação.
+        
+        Returns:
+            Lista de pares (handle, título)
+        """
+        pid = self.process.pid if self.process else getattr(self.app, "process", None)
+        
+        if HAS_WIN32 and pid:
+            windows = []
+            
+            def _collect(hwnd, _):
+                if (win32gui.IsWindowVisible(hwnd)
+                        and win32process.GetWindowThreadProcessId(hwnd)[1] == pid):
+                    windows.append((hwnd, win32gui.GetWindowText(hwnd)))
+                return True
+            
+            win32gui.EnumWindows(_collect, None)
+            return windows
+        
+        if self.app:
+            return [(w.handle, w.window_text()) for w in self.app.windows()]
+        return []
+    
+    @traced("app.wait_window")
     def wait_window(self, title: str, timeout: Optional[int] = None) -> bool:
         """
         Aguarda uma janela aparecer.
         
+        A verificação é refeita a cada notificação de janela criada, exibida,
+        renomeada ou ativada; sem notificações disponíveis, usa polling.
+        
         Args:
             title: Título da janela
             timeout: Timeout em segundos
@@ -134,19 +279,48 @@ class AppManager:
             True se a janela apareceu
         """
         timeout = timeout or self.timeout
-        start_time = time.time()
         
-        while time.time() - start_time < timeout:
+        def _window_exists() -> bool:
             try:
-                window = self.get_window(title=title)
-                if window.exists():
-                    return True
+                return self.window_registry.find(title) is not None
             except Exception:
-                pass
-            time.sleep(0.5)
+                return False
         
-        return False
+        return self.window_waiter.wait_for(_window_exists, timeout)
+    
+    def _start_window_events(self, process_id: Optional[int]):
+        """
+        Começa a receber eventos das janelas do processo.
+        
+        Falhas não são críticas: wait_window volta a usar polling.
+        
+        Args:
+            process_id: PID da aplicação
+        """
+        if self.window_events is None or not process_id:
+            return
+        try:
+            self.window_events.start(process_id)
+        except Exception:
+            pass
+    
+    def get_click_worker(self) -> ClickWorkerClient:
+        """
+        Obtém o worker de cliques persistente, iniciando-o no primeiro uso.
+        
+        Returns:
+            Cliente do worker de cliques
+        """
+        if self.click_worker is None:
+            self.click_worker = ClickWorkerClient(
+                backend=self.backend,
+                # Com várias instâncias abertas, o título não identifica a aplicação
+                process_id=self.process.pid if self.process else None
+            )
+        self.click_worker.start()
+        return self.click_worker
     
+    @traced("app.close")
     def close(self, force: bool = False):
         """
         Fecha a aplicação.
@@ -154,6 +328,16 @@ class AppManager:
         Args:
             force: Se True, força o fechamento
         """
+        if self.click_worker:
+            self.click_worker.close()
+            self.click_worker = None
+        
+        if self.window_events is not None:
+            try:
+                self.window_events.stop()
+            except Exception:
+                pass
+        
         try:
             if self.app:
                 if force:
@@ -185,6 +369,9 @@ class AppManager:
         finally:
             self.app = None
             self.process = None
+            self.locator_cache.clear()
+            self.text_index_cache.invalidate()
+            self.window_registry.clear()
     
     def is_running(self) -> bool:
         """
@@ -197,10 +384,15 @@ class AppManager:
             return self.process.poll() is None
         return False
 
+    @traced("app.foreground")
     def bring_to_foreground(self, window=None):
         """
         Traz a janela para o primeiro plano.
         
+        Não faz nada se a janela já estiver em primeiro plano; caso contrário
+        aplica set_focus, restauração e APIs do win32 até a janela ser ativada
+        (ver ForegroundTracker).
+        
         Args:
             window: Janela específica (opcional). Se None, usa top_window.
         """
@@ -210,40 +402,8 @@ class AppManager:
                     raise RuntimeError("Aplicação não iniciada ou conectada")
                 window = self.app.top_window()
             
-            # Método 1: set_focus do pywinauto
-            try:
-                window.set_focus()
-                time.sleep(0.2)
-            except Exception:
-                pass
-            
-            # Método 2: Restaurar janela se minimizada
-            try:
-                if hasattr(window, 'is_minimized') and window.is_minimized():
-                    window.restore()
-                    time.sleep(0.2)
-            except Exception:
-                pass
-            
-            # Método 3: Usar win32gui se disponível (mais efetivo)
-            if HAS_WIN32:
-                try:
-                    hwnd = window.handle
-                    # Mostrar e ativar a janela
-                    win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
-                    #win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                    win32gui.SetForegroundWindow(hwnd)
-                    win32gui.BringWindowToTop(hwnd)
-                    time.sleep(0.2)
-                except Exception:
-                    pass
-            
-            # Método 4: Usar wrapper do pywinauto
-            try:
-                window.wrapper_object().set_focus()
-                time.sleep(0.1)
-            except Exception:
-                pass
+            with desktop_lock():
+                self.foreground_tracker.ensure_foreground(window)
             
         except Exception as e:
             # Não falhar criticamente, apenas registrar aviso
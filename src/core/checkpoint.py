@@ -0,0 +1,140 @@
+"""
+Checkpoint da execução, para retomar execuções interrompidas.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.models.test_result import TestCaseResult
+from src.core.report_stream import read_records
+
+# Tipos de registro
+RECORD_HEADER = "checkpoint"
+RECORD_TEST = "test"
+
+
+class CheckpointWriter:
+    """
+    Registra cada teste concluído em um arquivo JSON Lines.
+
+    Cada registro é acrescentado e sincronizado com o disco (fsync) assim que
+    o teste termina, de modo que uma interrupção perde no máximo o teste em
+    andamento. Uma última linha incompleta é ignorada na leitura.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Abre (ou continua) o arquivo de checkpoint.
+
+        Args:
+            path: Caminho do arquivo
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write_header(self, script_path: Optional[str], script_version: str,
+                     application_name: str, start_time: datetime,
+                     shard: Optional[Dict[str, Any]] = None):
+        """
+        Grava a identificação da execução.
+
+        Args:
+            script_path: Caminho do script de teste
+            script_version: Versão do script
+            application_name: Nome da aplicação
+            start_time: Horário de início
+            shard: Divisão dos testes, quando a execução é um shard (opcional)
+        """
+        self._write({
+            "type": RECORD_HEADER,
+            "script_path": script_path,
+            "script_version": script_version,
+            "application_name": application_name,
+            "start_time": start_time.isoformat(),
+            "shard": shard,
+        })
+
+    def write_test(self, suite_index: int, test_index: int, test_result: TestCaseResult):
+        """
+        Registra um teste concluído.
+
+        Args:
+            suite_index: Posição da suíte no script
+            test_index: Posição do teste na suíte
+            test_result: Resultado do teste
+        """
+        self._write({
+            "type": RECORD_TEST,
+            "suite_index": suite_index,
+            "test_index": test_index,
+            "result": test_result.to_dict(),
+        })
+
+    def close(self):
+        """Fecha o arquivo."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def remove(self):
+        """Fecha e apaga o checkpoint (execução concluída)."""
+        self.close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def _write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+
+@dataclass
+class CheckpointState:
+    """Testes concluídos lidos de um checkpoint."""
+    path: Path
+    script_path: Optional[str]
+    start_time: datetime
+    shard: Optional[Dict[str, Any]] = None
+    completed: Dict[Tuple[int, int], TestCaseResult] = field(default_factory=dict)
+
+    @staticmethod
+    def load(path: str) -> 'CheckpointState':
+        """
+        Lê um arquivo de checkpoint.
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            Estado da execução interrompida
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir
+            ValueError: Se o arquivo não for um checkpoint
+        """
+        records = read_records(Path(path))
+        if not records or records[0].get("type") != RECORD_HEADER:
+            raise ValueError(f"Arquivo de checkpoint inválido: {path}")
+
+        header = records[0]
+        state = CheckpointState(
+            path=Path(path),
+            script_path=header.get("script_path"),
+            start_time=datetime.fromisoformat(header["start_time"]),
+            shard=header.get("shard")
+        )
+        for record in records[1:]:
+            if record.get("type") == RECORD_TEST:
+                key = (record["suite_index"], record["test_index"])
+                state.completed[key] = TestCaseResult.from_dict(record["result"])
+        return state
@@ -0,0 +1,161 @@
+"""
+Cliente do worker de cliques persistente.
+"""
+import json
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+WORKER_SCRIPT = Path(__file__).resolve().parent.parent / "workers" / "click_worker.py"
+
+
+class ClickWorkerClient:
+    """
+    Mantém um processo click_worker.py em modo persistente e envia cliques a ele.
+
+    O processo é iniciado uma única vez e reaproveita a conexão do pywinauto
+    e os controles já resolvidos entre os cliques.
+    """
+
+    def __init__(self, backend: str = "uia", worker_script: Optional[str] = None,
+                 process_id: Optional[int] = None):
+        """
+        Inicializa o cliente.
+
+        Args:
+            backend: Backend do pywinauto usado pelo worker
+            worker_script: Caminho do script do worker (opcional)
+            process_id: Processo da aplicação ao qual o worker se conecta; sem ele,
+                a conexão é pelo título (ambígua com várias instâncias abertas)
+        """
+        self.backend = backend
+        self.process_id = process_id
+        self.worker_script = Path(worker_script) if worker_script else WORKER_SCRIPT
+        self.process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def start(self):
+        """Inicia o processo do worker, se ainda não estiver rodando."""
+        if self.is_running():
+            return
+
+        self._responses = queue.Queue()
+        command = [sys.executable, str(self.worker_script), "--serve", self.backend]
+        if self.process_id is not None:
+            command.append(str(self.process_id))
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)  # Windows: sem janela
+        )
+        threading.Thread(
+            target=self._read_responses,
+            args=(self.process, self._responses),
+            daemon=True
+        ).start()
+
+    def is_running(self) -> bool:
+        """
+        Verifica se o worker está rodando.
+
+        Returns:
+            True se o processo está ativo
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def click(self, window_title: str, control: str, timeout: float) -> None:
+        """
+        Solicita um clique e aguarda até que ele retorne ou fique bloqueado em uma janela modal.
+
+        Args:
+            window_title: Expressão regular do título da janela
+            control: auto_id, título ou classe do botão
+            timeout: Tempo máximo aguardando a confirmação
+
+        Raises:
+            Exception: Se o clique falhar ou o worker não confirmar o clique
+        """
+        response = self._request(
+            {"command": "click", "window": window_title, "control": control},
+            timeout
+        )
+        if not response.get("ok"):
+            raise Exception(f"Worker de clique falhou: {response.get('error')}")
+
+    def close(self):
+        """Encerra o processo do worker."""
+        if not self.process:
+            return
+        try:
+            if self.process.poll() is None:
+                self.process.stdin.write(json.dumps({"command": "shutdown"}) + "\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=2)
+        except Exception:
+            pass
+        finally:
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process = None
+
+    def _request(self, payload: dict, timeout: float) -> dict:
+        """
+        Envia um comando ao worker e aguarda a resposta correspondente.
+
+        Args:
+            payload: Comando a enviar
+            timeout: Tempo máximo aguardando a resposta
+
+        Returns:
+            Resposta do worker
+        """
+        with self._lock:
+            self.start()
+            self._next_id += 1
+            request_id = self._next_id
+            payload["id"] = request_id
+
+            self.process.stdin.write(json.dumps(payload) + "\n")
+            self.process.stdin.flush()
+
+            while True:
+                try:
+                    line = self._responses.get(timeout=timeout)
+                except queue.Empty:
+                    # Worker travado: descartar para que o próximo comando reinicie
+                    self.close()
+                    raise TimeoutError(f"Worker de clique não respondeu em {timeout}s")
+
+                if line is None:
+                    self.process = None
+                    raise Exception("Worker de clique encerrou inesperadamente")
+
+                response = json.loads(line)
+                # Ignorar respostas atrasadas de comandos anteriores
+                if response.get("id") == request_id:
+                    return response
+
+    @staticmethod
+    def _read_responses(process: subprocess.Popen, responses: "queue.Queue[Optional[str]]"):
+        """
+        Lê as respostas do worker em segundo plano.
+
+        Args:
+            process: Processo do worker
+            responses: Fila que recebe as linhas lidas (None ao encerrar)
+        """
+        try:
+            for line in process.stdout:
+                if line.strip():
+                    responses.put(line)
+        finally:
+            responses.put(None)
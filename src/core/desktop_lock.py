@@ -0,0 +1,32 @@
+"""
+Trava da área de trabalho compartilhada pelas instâncias da aplicação.
+
+Com --workers, as instâncias dividem a mesma janela em primeiro plano, o
+mesmo teclado, o mesmo mouse e a mesma tela. Foco, entrada (teclas e
+cliques) e captura de tela são feitos com esta trava, de modo que a ação
+de um worker nunca atinge a janela de outro nem uma captura mostra outra
+instância por cima.
+"""
+import threading
+from contextlib import contextmanager
+
+from src.utils.tracer import span
+
+# Reentrante: a ação já com a trava chama foco e captura, que também a usam
+_desktop_lock = threading.RLock()
+
+
+@contextmanager
+def desktop_lock():
+    """
+    Mantém a área de trabalho exclusiva para a thread atual.
+
+    O tempo de espera pela trava aparece no rastreamento (desktop.wait).
+    """
+    if not _desktop_lock.acquire(blocking=False):
+        with span("desktop.wait"):
+            _desktop_lock.acquire()
+    try:
+        yield
+    finally:
+        _desktop_lock.release()
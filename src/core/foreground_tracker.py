@@ -0,0 +1,136 @@
+"""
+Controle do primeiro plano das janelas da aplicação.
+"""
+import time
+from typing import Optional
+
+try:
+    import win32gui
+    import win32con
+    HAS_WIN32 = True
+except ImportError:
+    HAS_WIN32 = False
+
+# Tempo máximo aguardando o Windows aplicar cada método de ativação
+SETTLE_TIMEOUT = 0.2
+SETTLE_INTERVAL = 0.02
+
+
+class ForegroundTracker:
+    """
+    Traz janelas para o primeiro plano apenas quando necessário.
+
+    Antes de qualquer ação verifica (com GetForegroundWindow) se a janela alvo,
+    ou um diálogo modal pertencente a ela, já está em primeiro plano. Caso contrário
+    aplica os métodos de ativação em ordem, parando no primeiro que funcionar.
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.skipped = 0
+        self.activations = 0
+
+    def ensure_foreground(self, window) -> bool:
+        """
+        Garante que a janela está em primeiro plano.
+
+        Args:
+            window: Janela do pywinauto
+
+        Returns:
+            True se a janela ficou (ou já estava) em primeiro plano
+        """
+        started_at = time.perf_counter()
+        try:
+            hwnd = self._handle(window)
+            if self.owns_foreground(hwnd):
+                self.skipped += 1
+                return True
+
+            self.activations += 1
+            verifiable = HAS_WIN32 and hwnd
+            for method in (self._restore, self._set_focus, self._win32_activate, self._wrapper_focus):
+                try:
+                    method(window, hwnd)
+                except Exception:
+                    pass
+                if verifiable and self._wait_for_foreground(hwnd):
+                    return True
+            if not verifiable:
+                # Sem como verificar: uma única pausa depois de todos os métodos
+                time.sleep(SETTLE_TIMEOUT)
+            return False
+        finally:
+            self.elapsed += time.perf_counter() - started_at
+
+    def owns_foreground(self, hwnd: Optional[int]) -> bool:
+        """
+        Verifica se a janela (ou um diálogo modal de sua propriedade) está em primeiro plano.
+
+        Args:
+            hwnd: Handle da janela
+
+        Returns:
+            True se está em primeiro plano; False se não está ou não é possível verificar
+        """
+        if not HAS_WIN32 or not hwnd:
+            return False
+
+        current = win32gui.GetForegroundWindow()
+        if current == hwnd:
+            return True
+        # Um diálogo modal desabilita a janela dona enquanto está aberto e conta
+        # como a janela alvo; janelas pertencentes não modais (ferramentas,
+        # pop-ups) não contam, pois a janela alvo não está ativa
+        for _ in range(8):
+            if not current:
+                return False
+            owner = win32gui.GetWindow(current, win32con.GW_OWNER)
+            if not owner or win32gui.IsWindowEnabled(owner):
+                return False
+            if owner == hwnd:
+                return True
+            current = owner
+        return False
+
+    def _wait_for_foreground(self, hwnd: Optional[int]) -> bool:
+        """Aguarda brevemente o Windows aplicar a ativação."""
+        deadline = time.perf_counter() + SETTLE_TIMEOUT
+        while True:
+            if self.owns_foreground(hwnd):
+                return True
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(SETTLE_INTERVAL)
+
+    @staticmethod
+    def _handle(window) -> Optional[int]:
+        """Handle da janela, ou None se não puder ser obtido."""
+        try:
+            return window.handle
+        except Exception:
+            return None
+
+    @staticmethod
+    def _restore(window, hwnd):
+        """Restaura a janela se estiver minimizada."""
+        if hasattr(window, 'is_minimized') and window.is_minimized():
+            window.restore()
+
+    @staticmethod
+    def _set_focus(window, hwnd):
+        """set_focus do pywinauto."""
+        window.set_focus()
+
+    @staticmethod
+    def _win32_activate(window, hwnd):
+        """APIs do win32 (mais efetivo)."""
+        if HAS_WIN32 and hwnd:
+            win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
+            win32gui.SetForegroundWindow(hwnd)
+            win32gui.BringWindowToTop(hwnd)
+
+    @staticmethod
+    def _wrapper_focus(window, hwnd):
+        """set_focus pelo wrapper do pywinauto."""
+        window.wrapper_object().set_focus()
@@ -0,0 +1,176 @@
+"""
+Histórico local das execuções (SQLite).
+"""
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.models.test_result import TestCaseResult, TestStatus
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_name TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_runs (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    suite_name TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_test_runs_test ON test_runs (suite_name, test_id, started_at);
+CREATE TABLE IF NOT EXISTS action_runs (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    suite_name TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    action_index INTEGER NOT NULL,
+    action_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_action_runs_test ON action_runs (suite_name, test_id, action_index);
+"""
+
+FAILURE_STATUSES = (TestStatus.FAILED.value, TestStatus.ERROR.value)
+
+
+@dataclass
+class TestHistory:
+    """Estatísticas de um teste nas execuções anteriores."""
+    runs: int
+    average_duration: float
+    last_status: str
+    last_failure: Optional[str] = None
+
+    @property
+    def last_failed(self) -> bool:
+        """Indica se a execução mais recente do teste falhou."""
+        return self.last_status in FAILURE_STATUSES
+
+
+class HistoryStore:
+    """
+    Grava a duração e o resultado de cada teste e ação em um banco SQLite.
+
+    Cada teste é gravado (e confirmado) ao terminar, de forma que execuções
+    interrompidas também alimentam o histórico.
+    """
+
+    def __init__(self, path: str = "history/history.db", window: int = 10):
+        """
+        Abre (ou cria) o banco de histórico.
+
+        Args:
+            path: Caminho do arquivo SQLite
+            window: Quantidade de execuções recentes consideradas nas médias
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.window = window
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.run_id: Optional[int] = None
+
+    def start_run(self, application_name: str, start_time: datetime) -> int:
+        """
+        Registra o início de uma execução.
+
+        Args:
+            application_name: Nome da aplicação
+            start_time: Horário de início
+
+        Returns:
+            Identificador da execução
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (application_name, started_at) VALUES (?, ?)",
+                (application_name, start_time.isoformat())
+            )
+            self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def record_test(self, suite_name: str, test_result: TestCaseResult):
+        """
+        Grava o resultado de um teste e de suas ações.
+
+        Args:
+            suite_name: Nome da suíte
+            test_result: Resultado do teste
+        """
+        if self.run_id is None:
+            raise RuntimeError("Execução não iniciada (start_run)")
+
+        actions = [
+            (
+                self.run_id, suite_name, test_result.test_id, index,
+                action_result.action_type, action_result.status.value, action_result.duration
+            )
+            for index, action_result in enumerate(test_result.action_results, 1)
+        ]
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO test_runs (run_id, suite_name, test_id, status, duration, started_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.run_id, suite_name, test_result.test_id, test_result.status.value,
+                    test_result.duration, test_result.start_time.isoformat()
+                )
+            )
+            self._connection.executemany(
+                "INSERT INTO action_runs (run_id, suite_name, test_id, action_index, "
+                "action_type, status, duration) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                actions
+            )
+
+    def test_statistics(self) -> Dict[Tuple[str, str], TestHistory]:
+        """
+        Calcula as estatísticas de cada teste nas últimas execuções.
+
+        Returns:
+            Dicionário (suíte, test_id) -> estatísticas
+        """
+        query = """
+            SELECT suite_name, test_id, status, duration, started_at
+            FROM (
+                SELECT suite_name, test_id, status, duration, started_at,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY suite_name, test_id ORDER BY started_at DESC
+                       ) AS position
+                FROM test_runs
+            )
+            WHERE position <= ?
+            ORDER BY suite_name, test_id, started_at DESC
+        """
+        with self._lock:
+            rows = self._connection.execute(query, (self.window,)).fetchall()
+
+        statistics: Dict[Tuple[str, str], TestHistory] = {}
+        durations: Dict[Tuple[str, str], float] = {}
+        for suite_name, test_id, status, duration, started_at in rows:
+            key = (suite_name, test_id)
+            history = statistics.get(key)
+            if history is None:
+                # Primeira linha = execução mais recente
+                history = statistics[key] = TestHistory(0, 0.0, status)
+            history.runs += 1
+            durations[key] = durations.get(key, 0.0) + duration
+            if history.last_failure is None and status in FAILURE_STATUSES:
+                history.last_failure = started_at
+
+        for key, history in statistics.items():
+            history.average_duration = durations[key] / history.runs
+        return statistics
+
+    def close(self):
+        """Fecha o banco."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,129 @@
+"""
+Cache de localização de controles.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass
+class LocatorEntry:
+    """Resultado de uma busca de controle já resolvida."""
+    strategy: str
+    handle: Optional[int] = None
+    runtime_id: Optional[Tuple[int, ...]] = None
+
+
+class LocatorCache:
+    """
+    Lembra qual estratégia (auto_id, title, class_name) encontrou cada controle.
+
+    As entradas são indexadas por (handle da janela, controle). Em um acerto o
+    controle é obtido diretamente pelo handle (ou pela estratégia que funcionou)
+    e validado pelo runtime id; a busca completa só é refeita se a entrada
+    estiver obsoleta.
+    """
+
+    STRATEGIES = ("auto_id", "title", "class_name")
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Any, str], LocatorEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def resolve(self, window, control: str):
+        """
+        Localiza um controle na janela.
+
+        Args:
+            window: Janela do pywinauto
+            control: auto_id, título ou classe do controle
+
+        Returns:
+            Especificação do controle ou None se não encontrado
+        """
+        window_key = self._window_key(window)
+        key = (window_key, control)
+
+        entry = self._entries.get(key) if window_key is not None else None
+        if entry is not None:
+            spec = self._from_entry(window, control, entry)
+            if spec is not None:
+                self.hits += 1
+                return spec
+            self.stale += 1
+            del self._entries[key]
+
+        self.misses += 1
+        for strategy in self.STRATEGIES:
+            try:
+                spec = window.child_window(**{strategy: control})
+                if spec.exists():
+                    if window_key is not None:
+                        self._entries[key] = self._create_entry(spec, strategy)
+                    return spec
+            except Exception:
+                pass
+
+        return None
+
+    def clear(self):
+        """Descarta as entradas (ex.: quando a aplicação é reiniciada)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            Dicionário com acertos, falhas e entradas obsoletas
+        """
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+
+    @staticmethod
+    def _window_key(window) -> Optional[int]:
+        """Handle da janela, ou None se não puder ser obtido."""
+        try:
+            return window.handle
+        except Exception:
+            return None
+
+    @staticmethod
+    def _create_entry(spec, strategy: str) -> LocatorEntry:
+        """Registra handle e runtime id do controle encontrado."""
+        entry = LocatorEntry(strategy=strategy)
+        try:
+            element_info = spec.wrapper_object().element_info
+            entry.handle = element_info.handle or None
+            runtime_id = getattr(element_info, "runtime_id", None)
+            entry.runtime_id = tuple(runtime_id) if runtime_id else None
+        except Exception:
+            pass
+        return entry
+
+    @staticmethod
+    def _from_entry(window, control: str, entry: LocatorEntry):
+        """
+        Recupera o controle a partir de uma entrada, validando-a.
+
+        Returns:
+            Especificação do controle ou None se a entrada estiver obsoleta
+        """
+        try:
+            if entry.handle:
+                # Busca por handle não percorre a árvore de controles
+                spec = window.child_window(handle=entry.handle)
+            else:
+                spec = window.child_window(**{entry.strategy: control})
+
+            if not spec.exists(timeout=0):
+                return None
+
+            if entry.runtime_id is not None:
+                runtime_id = getattr(spec.wrapper_object().element_info, "runtime_id", None)
+                if tuple(runtime_id or ()) != entry.runtime_id:
+                    return None
+
+            return spec
+        except Exception:
+            return None
@@ -0,0 +1,144 @@
+"""
+Combinação dos relatórios de shards em um único resultado.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.models.test_result import TestCaseResult, TestExecutionResult, TestSuiteResult
+from src.core.report_stream import convert_stream
+
+
+def load_report(path: str) -> TestExecutionResult:
+    """
+    Lê um relatório (.json ou .jsonl).
+
+    Args:
+        path: Caminho do relatório
+
+    Returns:
+        Resultado da execução
+    """
+    report_path = Path(path)
+    if report_path.suffix == ".jsonl":
+        data = convert_stream(report_path)
+    else:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    return TestExecutionResult.from_dict(data)
+
+
+def merge_results(results: List[TestExecutionResult]) -> Tuple[TestExecutionResult, List[str]]:
+    """
+    Combina os resultados de vários shards.
+
+    As suítes e os testes ficam na ordem do script (registrada pelos shards);
+    os totais são recalculados a partir dos testes combinados.
+
+    Args:
+        results: Resultados dos shards
+
+    Returns:
+        Tupla (resultado combinado, avisos de inconsistência)
+    """
+    if not results:
+        raise ValueError("Nenhum relatório para combinar")
+
+    warnings: List[str] = []
+    shards = [result.shard for result in results if result.shard]
+    test_order: List[str] = []
+    if shards:
+        fingerprints = {shard["fingerprint"] for shard in shards}
+        if len(fingerprints) > 1:
+            warnings.append(
+                "Os shards usaram divisões diferentes (--shard-durations diferente entre "
+                "as máquinas); pode haver testes repetidos ou ausentes"
+            )
+        indexes = [shard["index"] for shard in shards]
+        count = shards[0]["count"]
+        missing = sorted(set(range(1, count + 1)) - set(indexes))
+        if missing:
+            warnings.append(f"Shards ausentes: {', '.join(str(i) for i in missing)} de {count}")
+        if len(set(indexes)) != len(indexes):
+            warnings.append("O mesmo shard foi informado mais de uma vez")
+        test_order = shards[0].get("test_order", [])
+    position = {name: i for i, name in enumerate(test_order)}
+
+    suite_tests: Dict[str, List[TestCaseResult]] = {}
+    seen = set()
+    for result in results:
+        for suite_result in result.suite_results:
+            tests = suite_tests.setdefault(suite_result.suite_name, [])
+            for test_result in suite_result.test_results:
+                name = f"{suite_result.suite_name}/{test_result.test_id}"
+                if name in seen:
+                    warnings.append(f"Teste presente em mais de um relatório: {name}")
+                    continue
+                seen.add(name)
+                tests.append(test_result)
+
+    not_run = [name for name in test_order if name not in seen]
+    if not_run:
+        warnings.append(f"{len(not_run)} teste(s) sem resultado: {', '.join(not_run[:10])}")
+
+    merged = TestExecutionResult(
+        application_name=results[0].application_name,
+        start_time=min(result.start_time for result in results),
+        end_time=max(result.end_time for result in results),
+        duration=0.0,
+        startup_latency=max(
+            (result.startup_latency for result in results if result.startup_latency is not None),
+            default=None
+        ),
+        locator_cache=_sum_counters(result.locator_cache for result in results),
+        screenshot_failures=[
+            failure for result in results for failure in result.screenshot_failures
+        ],
+        interrupted=any(result.interrupted for result in results)
+    )
+    merged.duration = (merged.end_time - merged.start_time).total_seconds()
+    if shards:
+        merged.shard = {
+            "merged": sorted(shard["index"] for shard in shards),
+            "count": shards[0]["count"],
+            "strategy": shards[0]["strategy"],
+            "fingerprint": shards[0]["fingerprint"],
+        }
+
+    def test_position(suite_name: str, test_result: TestCaseResult) -> int:
+        return position.get(f"{suite_name}/{test_result.test_id}", len(position))
+
+    for suite_name, tests in suite_tests.items():
+        tests.sort(key=lambda tr: test_position(suite_name, tr))
+
+    # Suítes na ordem do script, pelo primeiro teste (sem ordem registrada, na dos relatórios)
+    ordered_suites = sorted(
+        suite_tests.items(),
+        key=lambda item: test_position(item[0], item[1][0]) if item[1] else len(position)
+    )
+    for suite_name, tests in ordered_suites:
+        if tests:
+            start_time = min(tr.start_time for tr in tests)
+            end_time = max(tr.end_time for tr in tests)
+        else:
+            start_time, end_time = merged.start_time, merged.start_time
+        suite_result = TestSuiteResult(
+            suite_name=suite_name,
+            start_time=start_time,
+            end_time=end_time,
+            duration=(end_time - start_time).total_seconds()
+        )
+        for test_result in tests:
+            suite_result.add_test_result(test_result)
+        merged.add_suite_result(suite_result)
+
+    return merged, warnings
+
+
+def _sum_counters(counters) -> Optional[Dict[str, int]]:
+    """Soma dicionários de contadores (ignorando os ausentes)."""
+    total: Dict[str, int] = {}
+    for counter in counters:
+        for key, value in (counter or {}).items():
+            total[key] = total.get(key, 0) + value
+    return total or None
@@ -0,0 +1,327 @@
+"""
+Relatório em streaming (JSON Lines) gravado durante a execução.
+
+Uso do conversor para o formato JSON aninhado:
+
+    python -m src.core.report_stream reports/report_20240101_120000.jsonl
+"""
+import argparse
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models.test_result import (
+    ActionResult, TestCaseResult, TestExecutionResult, TestStatus
+)
+
+# Tipos de registro
+RECORD_RUN = "run"
+RECORD_ACTION = "action"
+RECORD_TEST = "test"
+RECORD_SUITE = "suite"
+RECORD_SUMMARY = "summary"
+
+
+class ReportStreamWriter:
+    """
+    Grava o relatório uma linha JSON por resultado, à medida que são produzidos.
+
+    Cada ActionResult e TestCaseResult é gravado ao terminar; ao final de cada
+    teste o arquivo é sincronizado com o disco (fsync), de modo que uma falha
+    ou interrupção da execução preserva todos os testes concluídos. Os
+    registros de suíte e o sumário são gravados ao final.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Abre o arquivo do relatório.
+
+        Args:
+            path: Caminho do arquivo .jsonl
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write_run(self, application_name: str, start_time: datetime, script_version: str):
+        """
+        Grava o registro de início da execução.
+
+        Args:
+            application_name: Nome da aplicação
+            start_time: Horário de início
+            script_version: Versão do script de teste
+        """
+        self._write({
+            "type": RECORD_RUN,
+            "application_name": application_name,
+            "start_time": start_time.isoformat(),
+            "script_version": script_version,
+        }, sync=True)
+
+    def write_action(self, suite_index: int, suite_name: str, test_index: int,
+                     test_id: str, action_index: int, action_result: ActionResult):
+        """
+        Grava o resultado de uma ação.
+
+        Args:
+            suite_index: Posição da suíte no script
+            suite_name: Nome da suíte
+            test_index: Posição do teste na suíte
+            test_id: ID do teste
+            action_index: Posição da ação no teste (a partir de 1)
+            action_result: Resultado da ação
+        """
+        record = {
+            "type": RECORD_ACTION,
+            "suite_index": suite_index,
+            "suite_name": suite_name,
+            "test_index": test_index,
+            "test_id": test_id,
+            "action_index": action_index,
+        }
+        record.update(action_result.to_dict())
+        self._write(record)
+
+    def write_test(self, suite_index: int, suite_name: str, test_index: int,
+                   test_result: TestCaseResult):
+        """
+        Grava o resultado de um teste (sem as ações, já gravadas) e sincroniza o arquivo.
+
+        Args:
+            suite_index: Posição da suíte no script
+            suite_name: Nome da suíte
+            test_index: Posição do teste na suíte
+            test_result: Resultado do teste
+        """
+        record = {
+            "type": RECORD_TEST,
+            "suite_index": suite_index,
+            "suite_name": suite_name,
+            "test_index": test_index,
+        }
+        record.update(test_result.to_dict())
+        record.pop("action_results")
+        self._write(record, sync=True)
+
+    def write_summary(self, result: TestExecutionResult):
+        """
+        Grava os registros de suíte e o sumário da execução.
+
+        Args:
+            result: Resultado da execução
+        """
+        for suite_index, suite_result in enumerate(result.suite_results):
+            record = {"type": RECORD_SUITE, "suite_index": suite_index}
+            record.update(suite_result.to_dict())
+            record.pop("test_results")
+            self._write(record)
+
+        record = {"type": RECORD_SUMMARY}
+        record.update(result.to_dict())
+        record.pop("suite_results")
+        self._write(record, sync=True)
+
+    def close(self):
+        """Fecha o arquivo."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _write(self, record: Dict[str, Any], sync: bool = False):
+        """
+        Acrescenta um registro ao arquivo.
+
+        Args:
+            record: Registro
+            sync: Se True, força a gravação em disco (fsync)
+        """
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+
+
+def read_records(path: Path) -> List[Dict[str, Any]]:
+    """
+    Lê os registros de um relatório em streaming.
+
+    Uma última linha incompleta (execução interrompida) é ignorada.
+
+    Args:
+        path: Caminho do arquivo .jsonl
+
+    Returns:
+        Lista de registros
+    """
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return records
+
+
+def convert_stream(path: Path) -> Dict[str, Any]:
+    """
+    Converte um relatório em streaming para o formato JSON aninhado de
+    TestExecutionResult.to_dict().
+
+    Relatórios de execuções interrompidas (sem sumário) são convertidos com os
+    totais recalculados a partir dos testes concluídos.
+
+    Args:
+        path: Caminho do arquivo .jsonl
+
+    Returns:
+        Relatório no formato aninhado
+    """
+    run: Dict[str, Any] = {}
+    summary: Optional[Dict[str, Any]] = None
+    suites: Dict[int, Dict[str, Any]] = {}
+    suite_names: Dict[int, str] = {}
+    tests: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    test_ids: Dict[Tuple[int, int], str] = {}
+    actions: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+
+    for record in read_records(path):
+        kind = record.pop("type", None)
+        if kind in (RECORD_ACTION, RECORD_TEST):
+            key = (record.pop("suite_index"), record.pop("test_index"))
+            suite_names[key[0]] = record.pop("suite_name")
+            test_ids[key] = record["test_id"]
+            if kind == RECORD_ACTION:
+                record.pop("test_id")
+                actions.setdefault(key, []).append(record)
+            else:
+                tests[key] = record
+        elif kind == RECORD_RUN:
+            run = record
+        elif kind == RECORD_SUITE:
+            suites[record.pop("suite_index")] = record
+        elif kind == RECORD_SUMMARY:
+            summary = record
+
+    # Teste interrompido antes de concluir: apenas as ações foram gravadas
+    for key, action_records in actions.items():
+        if key not in tests:
+            tests[key] = {
+                "test_id": test_ids[key],
+                "test_name": None,
+                "status": TestStatus.ERROR.value,
+                "start_time": action_records[0]["start_time"],
+                "end_time": action_records[-1]["end_time"],
+                "duration": None,
+                "focus_time": 0.0,
+                "error_message": "Execução interrompida",
+            }
+
+    suite_results = []
+    for suite_index in sorted(set(suites) | set(suite_names)):
+        test_results = []
+        for key in sorted(k for k in tests if k[0] == suite_index):
+            test = dict(tests[key])
+            error_message = test.pop("error_message")
+            action_records = sorted(actions.get(key, []), key=lambda action: action["action_index"])
+            for action in action_records:
+                del action["action_index"]
+            test["action_results"] = action_records
+            test["error_message"] = error_message
+            test_results.append(test)
+
+        suite = suites.get(suite_index) or _suite_from_tests(
+            suite_names.get(suite_index, f"suite_{suite_index}"), test_results
+        )
+        suite["test_results"] = test_results
+        suite_results.append(suite)
+
+    if summary is None:
+        summary = _summary_from_suites(run, suite_results)
+    summary["suite_results"] = suite_results
+    return summary
+
+
+def _count(test_results: List[Dict[str, Any]], status: TestStatus) -> int:
+    return sum(1 for test in test_results if test["status"] == status.value)
+
+
+def _suite_from_tests(suite_name: str, test_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reconstrói o registro de uma suíte a partir dos testes concluídos."""
+    start_time = min((test["start_time"] for test in test_results), default=None)
+    end_time = max((test["end_time"] for test in test_results), default=None)
+    duration = 0.0
+    if start_time and end_time:
+        duration = (datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)).total_seconds()
+    return {
+        "suite_name": suite_name,
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration": duration,
+        "total_tests": len(test_results),
+        "passed_tests": _count(test_results, TestStatus.PASSED),
+        "failed_tests": _count(test_results, TestStatus.FAILED),
+        "error_tests": _count(test_results, TestStatus.ERROR),
+    }
+
+
+def _summary_from_suites(run: Dict[str, Any], suite_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reconstrói o sumário de uma execução interrompida."""
+    total = sum(suite["total_tests"] for suite in suite_results)
+    passed = sum(suite["passed_tests"] for suite in suite_results)
+    end_time = max((suite["end_time"] for suite in suite_results if suite["end_time"]), default=None)
+    start_time = run.get("start_time")
+    duration = 0.0
+    if start_time and end_time:
+        duration = (datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)).total_seconds()
+    return {
+        "application_name": run.get("application_name"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration": duration,
+        "total_tests": total,
+        "passed_tests": passed,
+        "failed_tests": sum(suite["failed_tests"] for suite in suite_results),
+        "error_tests": sum(suite["error_tests"] for suite in suite_results),
+        "success_rate": (passed / total) * 100 if total else 0.0,
+        "startup_latency": None,
+        "locator_cache": None,
+        "screenshot_failures": [],
+        "interrupted": True,
+        "resumed_from": None,
+        "shard": None,
+    }
+
+
+def main():
+    """Converte um relatório .jsonl para o formato JSON aninhado."""
+    parser = argparse.ArgumentParser(
+        description='Converte um relatório em streaming (.jsonl) para o formato JSON'
+    )
+    parser.add_argument('stream', type=str, help='Relatório .jsonl')
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        help='Arquivo de saída (padrão: mesmo nome com extensão .json)'
+    )
+    args = parser.parse_args()
+
+    stream_path = Path(args.stream)
+    output_path = Path(args.output) if args.output else stream_path.with_suffix(".json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(convert_stream(stream_path), f, indent=2, ensure_ascii=False)
+    print(f"Relatório convertido: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Buffer circular de screenshots em memória.
+"""
+import io
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, List, Optional, Set
+
+from src.utils.tracer import span
+
+
+@dataclass
+class BufferedFrame:
+    """
+    Screenshot mantido em memória.
+
+    Até ser comprimido em segundo plano, o quadro guarda a imagem capturada
+    (image); depois, apenas o PNG reduzido (data).
+    """
+    prefix: str
+    timestamp: datetime
+    data: Optional[bytes] = None
+    image: Any = None
+    size: int = 0
+    evicted: bool = False
+
+
+class FrameRingBuffer:
+    """
+    Guarda os últimos screenshots (reduzidos e comprimidos em PNG) em memória.
+
+    A thread de teste apenas enfileira a imagem capturada; a redução e a
+    compressão ocorrem em uma thread própria do buffer. Os quadros mais
+    antigos são descartados ao exceder o número máximo de quadros ou o
+    orçamento de memória (quadros ainda não comprimidos contam pelo tamanho
+    estimado da imagem reduzida).
+    """
+
+    def __init__(self, max_frames: int = 10, max_bytes: int = 32 * 1024 * 1024,
+                 scale: float = 0.5):
+        """
+        Inicializa o buffer.
+
+        Args:
+            max_frames: Quantidade máxima de quadros
+            max_bytes: Memória máxima ocupada pelos quadros
+            scale: Fator de redução das imagens (1.0 = tamanho original)
+        """
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.scale = scale
+        self._frames: Deque[BufferedFrame] = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-buffer")
+        self._pending: Set[Future] = set()
+
+    def add(self, image, prefix: str):
+        """
+        Adiciona uma imagem ao buffer; a compressão ocorre em segundo plano.
+
+        Args:
+            image: Imagem PIL
+            prefix: Identificação do quadro (ex.: ação que o gerou)
+        """
+        frame = BufferedFrame(prefix, datetime.now(), image=image, size=self._estimate_size(image))
+        with self._lock:
+            self._frames.append(frame)
+            self._bytes += frame.size
+            self._evict()
+
+        future = self._executor.submit(self._compress, frame)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+
+    def drain(self) -> List[BufferedFrame]:
+        """
+        Aguarda as compressões pendentes e remove e retorna todos os quadros,
+        do mais antigo ao mais recente.
+
+        Returns:
+            Lista de quadros
+        """
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending)
+
+        with self._lock:
+            frames = [frame for frame in self._frames if frame.data is not None]
+            self._discard_all()
+        return frames
+
+    def clear(self):
+        """Descarta todos os quadros (inclusive os ainda não comprimidos)."""
+        with self._lock:
+            self._discard_all()
+
+    @property
+    def memory_used(self) -> int:
+        """Bytes ocupados pelos quadros."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def _compress(self, frame: BufferedFrame):
+        """Reduz e comprime a imagem de um quadro (thread do buffer)."""
+        with self._lock:
+            image = frame.image
+        if image is None:
+            # Descartado antes da compressão
+            return
+
+        with span("screenshot.frame_encode", "writer"):
+            if 0 < self.scale < 1:
+                width, height = image.size
+                image = image.resize(
+                    (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+                )
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", compress_level=1)
+            data = buffer.getvalue()
+
+        with self._lock:
+            if frame.evicted:
+                return
+            frame.image = None
+            frame.data = data
+            self._bytes += len(data) - frame.size
+            frame.size = len(data)
+            self._evict()
+
+    def _estimate_size(self, image) -> int:
+        """
+        Memória estimada do quadro até a compressão: a imagem já reduzida pela
+        escala, e não a captura original (uma tela inteira em dois monitores
+        4K, sem redução, já excederia o orçamento padrão).
+        """
+        width, height = image.size
+        if 0 < self.scale < 1:
+            width = max(1, int(width * self.scale))
+            height = max(1, int(height * self.scale))
+        return width * height * len(image.getbands())
+
+    def _evict(self):
+        """
+        Descarta os quadros mais antigos além dos limites (chamar com o lock
+        adquirido). O quadro mais recente nunca é descartado, mesmo que sozinho
+        exceda o orçamento; o limite volta a ser aplicado quando a compressão
+        define o tamanho real.
+        """
+        while len(self._frames) > 1 and (
+            len(self._frames) > self.max_frames or self._bytes > self.max_bytes
+        ):
+            self._drop(self._frames.popleft())
+
+    def _discard_all(self):
+        """Descarta todos os quadros (chamar com o lock adquirido)."""
+        while self._frames:
+            self._drop(self._frames.popleft())
+        self._bytes = 0
+
+    def _drop(self, frame: BufferedFrame):
+        frame.evicted = True
+        frame.image = None
+        self._bytes -= frame.size
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
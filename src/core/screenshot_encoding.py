@@ -0,0 +1,108 @@
+"""
+Codificação dos arquivos de screenshot.
+"""
+from typing import Any, Dict, Optional
+
+from src.models.test_script import ScreenshotEncoding
+
+# Extensão dos arquivos por formato
+EXTENSIONS = {
+    "png": "png",
+    "webp": "webp",
+    "jpeg": "jpg",
+}
+
+
+def file_extension(encoding: Optional[ScreenshotEncoding]) -> str:
+    """
+    Retorna a extensão de arquivo do formato.
+
+    Args:
+        encoding: Perfil de codificação (None = PNG)
+
+    Returns:
+        Extensão sem o ponto
+    """
+    if encoding is None:
+        return "png"
+    return EXTENSIONS[encoding.format]
+
+
+def prepare_image(image, encoding: Optional[ScreenshotEncoding]):
+    """
+    Aplica escala de cinza e redução de tamanho antes da codificação.
+
+    Args:
+        image: Imagem PIL
+        encoding: Perfil de codificação
+
+    Returns:
+        Imagem pronta para ser codificada
+    """
+    if encoding is None:
+        return image
+
+    if encoding.grayscale and image.mode != "L":
+        image = image.convert("L")
+
+    if encoding.max_dimension:
+        width, height = image.size
+        largest = max(width, height)
+        if largest > encoding.max_dimension:
+            ratio = encoding.max_dimension / largest
+            image = image.resize((max(1, int(width * ratio)), max(1, int(height * ratio))))
+
+    # JPEG não suporta transparência
+    if encoding.format == "jpeg" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    return image
+
+
+def save_options(encoding: Optional[ScreenshotEncoding]) -> Dict[str, Any]:
+    """
+    Monta as opções de Image.save para o perfil.
+
+    Args:
+        encoding: Perfil de codificação (None = PNG padrão)
+
+    Returns:
+        Dicionário de opções
+    """
+    if encoding is None:
+        return {"format": "PNG"}
+    if encoding.format == "png":
+        return {"format": "PNG", "compress_level": encoding.compress_level}
+    if encoding.format == "webp":
+        return {"format": "WEBP", "quality": encoding.quality}
+    return {"format": "JPEG", "quality": encoding.quality}
+
+
+def encode_image(image, target, encoding: Optional[ScreenshotEncoding] = None):
+    """
+    Codifica e grava a imagem conforme o perfil.
+
+    Args:
+        image: Imagem PIL
+        target: Caminho do arquivo ou objeto de arquivo (ex.: BytesIO)
+        encoding: Perfil de codificação (None = PNG padrão)
+    """
+    prepare_image(image, encoding).save(target, **save_options(encoding))
+
+
+def encoding_key(encoding: Optional[ScreenshotEncoding]) -> str:
+    """
+    Identifica o perfil (imagens iguais com perfis diferentes geram arquivos diferentes).
+
+    Args:
+        encoding: Perfil de codificação
+
+    Returns:
+        Texto que identifica o perfil
+    """
+    if encoding is None:
+        return "png"
+    return (
+        f"{encoding.format}:{encoding.compress_level}:{encoding.quality}:"
+        f"{int(encoding.grayscale)}:{encoding.max_dimension or 0}"
+    )
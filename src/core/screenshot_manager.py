@@ -1,20 +1,152 @@
 """
 Gerenciador de screenshots.
 """
+import functools
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
-from PIL import ImageGrab
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from PIL import Image, ImageGrab
 import pywinauto
 
+try:
+    import win32con
+    import win32gui
+    import win32ui
+    HAS_WIN32 = True
+except ImportError:
+    HAS_WIN32 = False
+
+from src.models.test_script import ScreenshotEncoding, ScreenshotSettings
+from src.core.screenshot_writer import ScreenshotWriter
+from src.core.screenshot_buffer import FrameRingBuffer
+from src.core.screenshot_store import ScreenshotStore
+from src.core.screenshot_retention import (
+    OBJECT_REFERENCES_FILE, OBJECTS_DIR, ScreenshotRetention
+)
+from src.core.desktop_lock import desktop_lock
+from src.core.screenshot_encoding import encode_image, encoding_key, file_extension
+from src.utils.tracer import traced
+from src.utils.metrics import get_metrics
+
+
+def grab_region(bbox: Tuple[int, int, int, int]):
+    """
+    Captura apenas um retângulo da tela (coordenadas da área de trabalho virtual).
+    
+    O ImageGrab do Windows captura a tela inteira (ou todos os monitores) e
+    recorta; com pywin32 o retângulo é copiado diretamente (BitBlt). Sem
+    pywin32, o ImageGrab captura só o monitor principal quando o retângulo
+    está nele.
+    
+    Args:
+        bbox: Retângulo (left, top, right, bottom)
+        
+    Returns:
+        Imagem PIL
+    """
+    if HAS_WIN32:
+        try:
+            return _bitblt(bbox)
+        except Exception:
+            pass
+    return ImageGrab.grab(bbox=bbox, all_screens=not _inside_primary_screen(bbox))
+
+
+def _bitblt(bbox: Tuple[int, int, int, int]):
+    """Copia o retângulo da tela para uma imagem (GDI BitBlt)."""
+    left, top, right, bottom = bbox
+    width, height = right - left, bottom - top
+    screen_dc = win32gui.GetDC(0)
+    source = win32ui.CreateDCFromHandle(screen_dc)
+    memory = source.CreateCompatibleDC()
+    bitmap = win32ui.CreateBitmap()
+    try:
+        bitmap.CreateCompatibleBitmap(source, width, height)
+        memory.SelectObject(bitmap)
+        memory.BitBlt((0, 0), (width, height), source, (left, top), win32con.SRCCOPY)
+        bits = bitmap.GetBitmapBits(True)
+        return Image.frombuffer("RGB", (width, height), bits, "raw", "BGRX", 0, 1)
+    finally:
+        win32gui.DeleteObject(bitmap.GetHandle())
+        memory.DeleteDC()
+        source.DeleteDC()
+        win32gui.ReleaseDC(0, screen_dc)
+
+
+def _inside_primary_screen(bbox: Tuple[int, int, int, int]) -> bool:
+    """Indica se o retângulo está inteiro no monitor principal."""
+    try:
+        import ctypes
+        user32 = ctypes.windll.user32
+    except (ImportError, AttributeError):
+        # Fora do Windows o ImageGrab ignora all_screens
+        return True
+    # SM_CXSCREEN / SM_CYSCREEN: o monitor principal começa em (0, 0)
+    width, height = user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+    left, top, right, bottom = bbox
+    return left >= 0 and top >= 0 and right <= width and bottom <= height
+
 
 class ScreenshotManager:
     """Gerencia captura e salvamento de screenshots."""
     
-    def __init__(self, screenshot_dir: str = "screenshots"):
+    def __init__(self, screenshot_dir: str = "screenshots", worker_id: Optional[int] = None,
+                 writer: Optional[ScreenshotWriter] = None, async_writes: bool = True):
+        """
+        Inicializa o gerenciador.
+        
+        Args:
+            screenshot_dir: Diretório raiz dos screenshots
+            worker_id: Identificador do worker em execução paralela (opcional)
+            writer: Gravador em segundo plano compartilhado (opcional)
+            async_writes: Se False, grava os arquivos na própria thread de teste
+        """
         self.screenshot_dir = Path(screenshot_dir)
         self.screenshot_dir.mkdir(exist_ok=True)
+        self.worker_id = worker_id
         self.current_test_dir: Optional[Path] = None
+        self._referenced_objects: Set[str] = set()
+        self.writer = writer or (ScreenshotWriter() if async_writes else None)
+        self.ring_buffer: Optional[FrameRingBuffer] = None
+        self.store: Optional[ScreenshotStore] = None
+        self.retention: Optional[ScreenshotRetention] = None
+        self.settings = ScreenshotSettings()
+    
+    def configure(self, settings: ScreenshotSettings, store: Optional[ScreenshotStore] = None,
+                  retention: Optional[ScreenshotRetention] = None):
+        """
+        Aplica a configuração de screenshots do script.
+        
+        Args:
+            settings: Configuração de screenshots
+            store: Armazenamento por conteúdo compartilhado (opcional)
+            retention: Retenção compartilhada (opcional)
+        """
+        self.settings = settings
+        if settings.dedupe:
+            self.store = store or ScreenshotStore(
+                self.screenshot_dir / OBJECTS_DIR,
+                perceptual_threshold=settings.near_duplicate_threshold
+            )
+        else:
+            self.store = None
+        
+        if settings.ring_buffer:
+            self.ring_buffer = FrameRingBuffer(
+                max_frames=settings.ring_buffer.frames,
+                max_bytes=int(settings.ring_buffer.memory_mb * 1024 * 1024),
+                scale=settings.ring_buffer.scale
+            )
+        else:
+            self.ring_buffer = None
+        
+        if settings.retention:
+            self.retention = retention or ScreenshotRetention(self.screenshot_dir, settings.retention)
+        else:
+            self.retention = None
+        if self.store is not None and self.retention is not None:
+            # O objeto reutilizado é protegido no mesmo passo em que sua existência é conferida
+            self.store.on_reference = self.retention.reference_file
     
     def prepare_test_directory(self, suite_name: str, test_id: str):
         """
@@ -26,79 +158,266 @@ class ScreenshotManager:
         """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         dir_name = f"{suite_name}_{test_id}_{timestamp}"
+        if self.worker_id is not None:
+            dir_name = f"{dir_name}_w{self.worker_id}"
         self.current_test_dir = self.screenshot_dir / dir_name
+        if self.retention is not None:
+            # Registrar antes de criar, para que a retenção nunca o trate como antigo
+            self.retention.track(self.current_test_dir)
         self.current_test_dir.mkdir(exist_ok=True)
+        self._referenced_objects = set()
+        
+        # Quadros de um teste não servem de contexto para o próximo
+        if self.ring_buffer is not None:
+            self.ring_buffer.clear()
     
-    def capture_full_screen(self, prefix: str = "screenshot") -> str:
+    @traced("screenshot.capture")
+    def capture_full_screen(self, prefix: str = "screenshot",
+                            encoding: Optional[ScreenshotEncoding] = None) -> str:
         """
         Captura screenshot da tela inteira.
         
+        A captura é imediata; a codificação e a gravação ocorrem em segundo
+        plano (ver flush).
+        
         Args:
             prefix: Prefixo do nome do arquivo
+            encoding: Perfil de codificação (None = perfil do script)
             
         Returns:
-            Caminho do arquivo salvo
+            Caminho do arquivo (reservado)
         """
-        if not self.current_test_dir:
-            raise RuntimeError("Diretório de teste não preparado")
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        filename = f"{prefix}_{timestamp}.png"
-        filepath = self.current_test_dir / filename
+        return self._capture_full_screen(prefix, encoding)
+    
+    def _capture_full_screen(self, prefix: str,
+                             encoding: Optional[ScreenshotEncoding] = None) -> str:
+        """
+        Captura a tela inteira sem abrir um novo span (usado pelas demais
+        capturas, que já estão dentro do span screenshot.capture).
+        """
+        with desktop_lock():
+            image = ImageGrab.grab()
+        return self._save(image, prefix, encoding)
+    
+    @traced("screenshot.capture")
+    def capture_region(self, bbox: Optional[Tuple[int, int, int, int]],
+                       prefix: str = "screenshot",
+                       encoding: Optional[ScreenshotEncoding] = None) -> str:
+        """
+        Captura uma região da tela (coordenadas da área de trabalho virtual).
         
-        screenshot = ImageGrab.grab()
-        screenshot.save(filepath)
+        Args:
+            bbox: Retângulo (left, top, right, bottom); None captura a tela inteira
+            prefix: Prefixo do nome do arquivo
+            encoding: Perfil de codificação (None = perfil do script)
+            
+        Returns:
+            Caminho do arquivo (reservado)
+        """
+        if bbox is None:
+            return self._capture_full_screen(prefix, encoding)
         
-        return str(filepath)
+        with desktop_lock():
+            image = grab_region(bbox)
+        return self._save(image, prefix, encoding)
     
-    def capture_window(self, window, prefix: str = "window") -> str:
+    @traced("screenshot.capture")
+    def capture_window(self, window, prefix: str = "window",
+                       encoding: Optional[ScreenshotEncoding] = None) -> str:
         """
         Captura screenshot de uma janela específica.
         
         Args:
             window: Janela do pywinauto
             prefix: Prefixo do nome do arquivo
+            encoding: Perfil de codificação (None = perfil do script)
             
         Returns:
-            Caminho do arquivo salvo
+            Caminho do arquivo (reservado)
         """
-        if not self.current_test_dir:
-            raise RuntimeError("Diretório de teste não preparado")
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        filename = f"{prefix}_{timestamp}.png"
-        filepath = self.current_test_dir / filename
-        
         try:
-            window.capture_as_image().save(filepath)
+            with desktop_lock():
+                image = window.capture_as_image()
         except Exception:
             # Fallback para captura de tela inteira
-            return self.capture_full_screen(prefix)
+            return self._capture_full_screen(prefix, encoding)
         
-        return str(filepath)
+        return self._save(image, prefix, encoding)
     
-    def capture_control(self, control, prefix: str = "control") -> str:
+    @traced("screenshot.capture")
+    def capture_control(self, control, prefix: str = "control",
+                        encoding: Optional[ScreenshotEncoding] = None) -> str:
         """
         Captura screenshot de um controle específico.
         
         Args:
             control: Controle do pywinauto
             prefix: Prefixo do nome do arquivo
+            encoding: Perfil de codificação (None = perfil do script)
             
         Returns:
-            Caminho do arquivo salvo
+            Caminho do arquivo (reservado)
+        """
+        try:
+            with desktop_lock():
+                image = control.capture_as_image()
+        except Exception:
+            # Fallback para captura de tela inteira
+            return self._capture_full_screen(prefix, encoding)
+        
+        return self._save(image, prefix, encoding)
+    
+    @traced("screenshot.frame")
+    def record_frame(self, prefix: str = "frame",
+                     bbox: Optional[Tuple[int, int, int, int]] = None):
+        """
+        Guarda um screenshot no buffer em memória (sem gravar em disco).
+        
+        Na thread de teste ocorre apenas a captura; a redução e a compressão
+        ficam com o buffer, em segundo plano. Não faz nada se o buffer não
+        estiver habilitado.
+        
+        Args:
+            prefix: Identificação do quadro
+            bbox: Região capturada (None = tela inteira)
+        """
+        if self.ring_buffer is None:
+            return
+        with desktop_lock():
+            image = grab_region(bbox) if bbox else ImageGrab.grab()
+        self.ring_buffer.add(image, prefix)
+    
+    @traced("screenshot.dump")
+    def dump_ring_buffer(self, prefix: str = "before_failure") -> List[str]:
+        """
+        Grava em disco os quadros do buffer (chamado ao ocorrer uma falha).
+        
+        Args:
+            prefix: Prefixo dos nomes dos arquivos
+            
+        Returns:
+            Caminhos dos arquivos gravados, do mais antigo ao mais recente
+        """
+        if self.ring_buffer is None or not self.current_test_dir:
+            return []
+        
+        paths = []
+        written = 0
+        for index, frame in enumerate(self.ring_buffer.drain(), 1):
+            timestamp = frame.timestamp.strftime('%Y%m%d_%H%M%S_%f')
+            filepath = self.current_test_dir / f"{prefix}_{index:02d}_{frame.prefix}_{timestamp}.png"
+            filepath.write_bytes(frame.data)
+            paths.append(str(filepath))
+            written += len(frame.data)
+        metrics = get_metrics()
+        if metrics is not None and written:
+            metrics.screenshot_bytes.inc(written)
+        return paths
+    
+    def flush(self) -> List[Dict[str, str]]:
+        """
+        Aguarda a gravação dos screenshots pendentes.
+        
+        Returns:
+            Falhas de gravação (caminho e erro) desde o último flush
+        """
+        if self.writer is None:
+            return []
+        return self.writer.flush()
+    
+    def _reserve_path(self, prefix: str, extension: str = "png") -> Path:
+        """
+        Define o caminho do próximo arquivo no diretório do teste atual.
+        
+        Args:
+            prefix: Prefixo do nome do arquivo
+            extension: Extensão do arquivo
+            
+        Returns:
+            Caminho do arquivo
         """
         if not self.current_test_dir:
             raise RuntimeError("Diretório de teste não preparado")
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        filename = f"{prefix}_{timestamp}.png"
-        filepath = self.current_test_dir / filename
+        return self.current_test_dir / f"{prefix}_{timestamp}.{extension}"
+    
+    @traced("screenshot.save")
+    def _save(self, image, prefix: str,
+              encoding: Optional[ScreenshotEncoding] = None) -> str:
+        """
+        Grava a imagem, em segundo plano se houver gravador.
         
-        try:
-            control.capture_as_image().save(filepath)
-        except Exception:
-            # Fallback para captura de tela inteira
-            return self.capture_full_screen(prefix)
+        Com deduplicação habilitada, o arquivo fica no armazenamento por
+        conteúdo e imagens já gravadas não são gravadas novamente.
         
+        Args:
+            image: Imagem PIL
+            prefix: Prefixo do nome do arquivo
+            encoding: Perfil de codificação (None = perfil do script)
+            
+        Returns:
+            Caminho do arquivo
+        """
+        encoding = encoding or self.settings.encoding
+        extension = file_extension(encoding)
+        if self.store is not None:
+            if not self.current_test_dir:
+                raise RuntimeError("Diretório de teste não preparado")
+            filepath, is_new = self.store.put(image, extension, encoding_key(encoding))
+            self._reference_object(filepath)
+            if not is_new:
+                return str(filepath)
+            on_done = functools.partial(self.store.complete, filepath)
+        else:
+            filepath = self._reserve_path(prefix, extension)
+            on_done = None
+        
+        self._write(image, filepath, encoding, on_done)
         return str(filepath)
+    
+    def _reference_object(self, filepath: Path):
+        """
+        Registra no diretório do teste (objects.txt) o objeto usado pelo teste,
+        para que não seja removido enquanto o diretório existir (a execução
+        atual já o registrou na retenção em ScreenshotStore.put).
+        
+        Args:
+            filepath: Caminho do objeto no armazenamento por conteúdo
+        """
+        relative = Path(filepath).relative_to(self.screenshot_dir).as_posix()
+        if relative in self._referenced_objects:
+            return
+        self._referenced_objects.add(relative)
+        try:
+            with open(self.current_test_dir / OBJECT_REFERENCES_FILE, 'a', encoding='utf-8') as f:
+                f.write(relative + "\n")
+        except OSError:
+            pass
+    
+    def _write(self, image, filepath: Path, encoding: Optional[ScreenshotEncoding] = None,
+               on_done: Optional[Callable[[bool], None]] = None):
+        """
+        Grava a imagem no caminho informado.
+        
+        Args:
+            image: Imagem PIL
+            filepath: Caminho do arquivo
+            encoding: Perfil de codificação
+            on_done: Função chamada com True (gravado) ou False (falha) ao terminar
+        """
+        if self.writer is not None:
+            self.writer.submit(image, filepath, encoding, on_done)
+            return
+        
+        try:
+            encode_image(image, filepath, encoding)
+        except Exception:
+            if on_done is not None:
+                on_done(False)
+            raise
+        if on_done is not None:
+            on_done(True)
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.screenshot_bytes.inc(filepath.stat().st_size)
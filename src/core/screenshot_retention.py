@@ -0,0 +1,608 @@
+"""
+Retenção dos screenshots de execuções anteriores.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.models.test_script import RetentionSettings
+from src.core.report_stream import RECORD_ACTION, RECORD_TEST, read_records
+
+# Diretório do armazenamento por conteúdo (deduplicação), dentro da raiz
+OBJECTS_DIR = "objects"
+
+# Diretórios da raiz de screenshots que não pertencem a um teste
+RESERVED_NAMES = {OBJECTS_DIR}
+
+# Arquivo, no diretório de cada teste, com os objetos usados por ele (um por linha)
+OBJECT_REFERENCES_FILE = "objects.txt"
+
+# Diretórios sem índice (anteriores à retenção) com intervalo maior que este
+# entre um e outro são considerados de execuções diferentes
+RUN_GAP_SECONDS = 30 * 60
+
+# Data e hora no nome do diretório do teste: <suite>_<teste>_YYYYmmdd_HHMMSS[_wN]
+_DIR_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})(?:_w\d+)?$")
+
+
+class ScreenshotRetention:
+    """
+    Remove diretórios de screenshots antigos conforme cota de espaço, idade e
+    quantidade de execuções mantidas.
+
+    Os diretórios conhecidos ficam em um arquivo de índice (execução, data,
+    tamanho e objetos referenciados), evitando percorrer a árvore inteira a
+    cada execução. Cada diretório criado é registrado imediatamente em um
+    diário (journal), incorporado ao índice na gravação seguinte, de modo que
+    uma execução interrompida não deixa diretórios sem execução conhecida.
+
+    Com deduplicação, as imagens ficam em objects/ e cada diretório de teste
+    lista as que usou (objects.txt). Os objetos entram na cota e são
+    removidos quando nenhum diretório mantido os referencia.
+
+    A remoção ocorre em uma thread em segundo plano, em lotes, e nunca remove
+    os diretórios e objetos da execução atual nem os screenshots de falha
+    referenciados pelos relatórios mais recentes.
+    """
+
+    INDEX_FILE = "retention_index.json"
+    JOURNAL_FILE = "retention_index.journal"
+
+    def __init__(self, screenshot_dir: Path, settings: RetentionSettings,
+                 reports_dir: Path = Path("reports"), batch_size: int = 20,
+                 batch_pause: float = 0.05):
+        """
+        Inicializa a retenção.
+
+        Args:
+            screenshot_dir: Diretório raiz dos screenshots
+            settings: Limites de retenção
+            reports_dir: Diretório dos relatórios JSON
+            batch_size: Diretórios removidos por lote
+            batch_pause: Pausa entre lotes, em segundos
+        """
+        self.root = Path(screenshot_dir)
+        self.settings = settings
+        self.reports_dir = Path(reports_dir)
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.index_path = self.root / self.INDEX_FILE
+        self.journal_path = self.root / self.JOURNAL_FILE
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        self._started_at = time.time()
+        self._current: Set[str] = set()
+        self._current_objects: Set[str] = set()
+        self._index: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.evicted = 0
+        self.evicted_objects = 0
+        self.freed_bytes = 0
+
+    def track(self, test_dir: Path):
+        """
+        Registra um diretório criado pela execução atual (nunca removido por ela).
+
+        O registro é gravado no diário na hora, para que sobreviva a uma
+        interrupção da execução.
+
+        Args:
+            test_dir: Diretório do teste
+        """
+        name = Path(test_dir).name
+        entry = {"run": self.run_id, "created": time.time(), "size": None}
+        with self._lock:
+            self._current.add(name)
+            self._ensure_index()["entries"][name] = entry
+            try:
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(dict(entry, name=name)) + "\n")
+            except OSError:
+                # Sem diário, o diretório entra no índice ao final da execução
+                pass
+
+    def reference(self, object_path: str):
+        """
+        Registra um objeto usado pela execução atual (nunca removido por ela).
+
+        Args:
+            object_path: Caminho do objeto relativo à raiz (ex.: objects/ab/abcd.png)
+        """
+        with self._lock:
+            self._current_objects.add(object_path)
+
+    def reference_file(self, path: Path):
+        """
+        Registra um objeto usado pela execução atual a partir do seu caminho.
+
+        Args:
+            path: Caminho do objeto (dentro da raiz dos screenshots)
+        """
+        self.reference(Path(path).relative_to(self.root).as_posix())
+
+    def start(self):
+        """Inicia a remoção em segundo plano."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="screenshot-retention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Interrompe a remoção (o restante fica para a próxima execução) e
+        grava o índice com os diretórios da execução atual.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            entries = self._ensure_index()["entries"]
+            for name in self._current:
+                if name not in entries and (self.root / name).is_dir():
+                    entries[name] = {"run": self.run_id, "created": self._started_at, "size": None}
+        self._save_index()
+
+    def enforce(self):
+        """Aplica os limites de retenção (executado pela thread de segundo plano)."""
+        self._scan()
+        protected = self._protected_paths()
+        self._measure()
+        self._save_index()
+
+        victims = self._select_victims(protected)
+        for count, name in enumerate(victims, 1):
+            if self._stop_event.is_set():
+                break
+            with self._lock:
+                entry = self._ensure_index()["entries"].pop(name, None)
+            if entry is None:
+                continue
+            shutil.rmtree(self.root / name, ignore_errors=True)
+            self.evicted += 1
+            self.freed_bytes += entry.get("size") or 0
+            if count % self.batch_size == 0:
+                self._save_index()
+                time.sleep(self.batch_pause)
+
+        self._remove_unreferenced_objects(protected)
+        self._save_index()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores de remoção.
+
+        Returns:
+            Dicionário com diretórios e objetos removidos e bytes liberados
+        """
+        return {
+            "evicted": self.evicted,
+            "evicted_objects": self.evicted_objects,
+            "freed_bytes": self.freed_bytes,
+        }
+
+    def _run(self):
+        try:
+            self.enforce()
+        except Exception:
+            # A retenção nunca deve interferir na execução dos testes
+            pass
+
+    def _scan(self):
+        """
+        Sincroniza o índice com os diretórios existentes (apenas nomes; os
+        diretórios já indexados não são percorridos).
+
+        Diretórios fora do índice (de antes da retenção) são agrupados em
+        execuções pela data e hora do nome: um intervalo maior que
+        RUN_GAP_SECONDS entre diretórios consecutivos separa as execuções.
+        """
+        with self._lock:
+            current = set(self._current)
+            known = set(self._ensure_index()["entries"])
+
+        existing = set()
+        unindexed: List[Tuple[float, str]] = []
+        with os.scandir(self.root) as it:
+            for item in it:
+                if not item.is_dir() or item.name in RESERVED_NAMES or item.name in current:
+                    continue
+                existing.add(item.name)
+                if item.name in known:
+                    continue
+                created = item.stat().st_mtime
+                if created >= self._started_at:
+                    # Criado durante esta execução
+                    continue
+                unindexed.append((self._name_timestamp(item.name) or created, item.name))
+
+        new_entries = {}
+        run = None
+        previous = None
+        for created, name in sorted(unindexed):
+            if previous is None or created - previous > RUN_GAP_SECONDS:
+                run = f"dir:{name}"
+            previous = created
+            new_entries[name] = {"run": run, "created": created, "size": None}
+
+        with self._lock:
+            entries = self._ensure_index()["entries"]
+            entries.update(new_entries)
+            for name in list(entries):
+                if name not in existing and name not in self._current:
+                    del entries[name]
+
+    def _measure(self):
+        """
+        Calcula o tamanho e lê os objetos referenciados dos diretórios ainda
+        não medidos (novos desde a última execução) e o tamanho dos objetos.
+        """
+        with self._lock:
+            index = self._ensure_index()
+            pending = [
+                name for name, entry in index["entries"].items()
+                if entry.get("size") is None and name not in self._current
+            ]
+            first_scan = "objects" not in index
+            objects = index.setdefault("objects", {})
+
+        found: Dict[str, int] = {}
+        if first_scan:
+            # Primeira execução com objetos no índice: incluir os já existentes
+            found.update(self._walk_objects())
+
+        measured = {}
+        for name in pending:
+            if self._stop_event.is_set():
+                break
+            references = self._read_references(self.root / name)
+            measured[name] = (self._directory_size(self.root / name), references)
+            for reference in references:
+                if reference not in objects and reference not in found:
+                    try:
+                        found[reference] = (self.root / reference).stat().st_size
+                    except OSError:
+                        pass
+
+        with self._lock:
+            entries = self._ensure_index()["entries"]
+            for name, (size, references) in measured.items():
+                if name in entries:
+                    entries[name]["size"] = size
+                    entries[name]["objects"] = references
+            for reference, size in found.items():
+                objects.setdefault(reference, {"size": size, "refs": 0})
+            self._count_references()
+
+    def _select_victims(self, protected: Set[str]) -> List[str]:
+        """
+        Escolhe os diretórios a remover, do mais antigo ao mais recente.
+
+        Na cota, cada diretório removido libera o seu tamanho e o dos objetos
+        que deixam de ser referenciados.
+
+        Args:
+            protected: Diretórios e objetos que não podem ser removidos
+
+        Returns:
+            Nomes dos diretórios
+        """
+        with self._lock:
+            index = self._ensure_index()
+            # A execução atual não conta nas execuções mantidas nem é removida
+            entries = {
+                name: dict(entry) for name, entry in index["entries"].items()
+                if entry.get("run") != self.run_id and name not in self._current
+            }
+            objects = {path: dict(info) for path, info in index.get("objects", {}).items()}
+            in_use = protected | self._current_objects
+
+        settings = self.settings
+        oldest_first = sorted(entries, key=lambda name: entries[name]["created"])
+        victims: List[str] = []
+        selected: Set[str] = set()
+
+        def _select(name: str):
+            if name not in protected and name not in selected:
+                selected.add(name)
+                victims.append(name)
+
+        if settings.max_age_days is not None:
+            limit = time.time() - settings.max_age_days * 86400
+            for name in oldest_first:
+                if entries[name]["created"] < limit:
+                    _select(name)
+
+        if settings.keep_runs is not None:
+            last_seen: Dict[str, float] = {}
+            for name in oldest_first:
+                last_seen[entries[name]["run"]] = entries[name]["created"]
+            runs = sorted(last_seen, key=last_seen.get, reverse=True)
+            expired = set(runs[settings.keep_runs:])
+            for name in oldest_first:
+                if entries[name]["run"] in expired:
+                    _select(name)
+
+        if settings.max_size_mb is not None:
+            quota = settings.max_size_mb * 1024 * 1024
+            refs = Counter({path: info.get("refs", 0) for path, info in objects.items()})
+
+            def _release(name: str) -> int:
+                """Retira as referências do diretório; retorna os bytes dos objetos liberados."""
+                freed = 0
+                for path in entries[name].get("objects") or ():
+                    if path not in refs:
+                        continue
+                    refs[path] -= 1
+                    if refs[path] <= 0 and path not in in_use:
+                        freed += objects[path].get("size") or 0
+                return freed
+
+            total = sum(entry.get("size") or 0 for entry in entries.values())
+            total += sum(
+                info.get("size") or 0 for path, info in objects.items()
+                if refs[path] > 0 or path in in_use
+            )
+            for name in selected:
+                total -= (entries[name].get("size") or 0) + _release(name)
+            for name in oldest_first:
+                if total <= quota:
+                    break
+                if name in protected or name in selected:
+                    continue
+                _select(name)
+                total -= (entries[name].get("size") or 0) + _release(name)
+
+        return victims
+
+    def _remove_unreferenced_objects(self, protected: Set[str]):
+        """
+        Remove os objetos que nenhum diretório do índice referencia.
+
+        Args:
+            protected: Diretórios e objetos que não podem ser removidos
+        """
+        with self._lock:
+            self._count_references()
+            candidates = [
+                path for path, info in self._ensure_index().get("objects", {}).items()
+                if info.get("refs", 0) <= 0
+            ]
+
+        for path in candidates:
+            if self._stop_event.is_set():
+                break
+            object_path = self.root / path
+            with self._lock:
+                # Verificado com o lock: a execução atual pode ter reutilizado o objeto
+                if path in protected or path in self._current_objects:
+                    continue
+                try:
+                    if object_path.stat().st_mtime >= self._started_at:
+                        continue
+                    object_path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                info = self._ensure_index()["objects"].pop(path, None)
+            self.evicted_objects += 1
+            self.freed_bytes += (info or {}).get("size") or 0
+
+    def _count_references(self):
+        """Recalcula quantos diretórios do índice referenciam cada objeto (chamar com o lock adquirido)."""
+        index = self._ensure_index()
+        counts = Counter(
+            path
+            for entry in index["entries"].values()
+            for path in entry.get("objects") or ()
+        )
+        for path, info in index.get("objects", {}).items():
+            info["refs"] = counts.get(path, 0)
+
+    def _protected_paths(self) -> Set[str]:
+        """
+        Diretórios e objetos com screenshots de falha referenciados pelos
+        relatórios recentes. Cada relatório é lido uma única vez (resultado
+        guardado no índice).
+
+        Returns:
+            Nomes dos diretórios e caminhos dos objetos (relativos à raiz) protegidos
+        """
+        recent = []
+        if self.reports_dir.is_dir() and self.settings.protect_reports > 0:
+            reports = sorted(
+                (
+                    path for path in self.reports_dir.glob("report_*.json*")
+                    # O relatório em streaming da execução atual ainda está incompleto
+                    if path.stat().st_mtime < self._started_at
+                ),
+                key=lambda path: path.stat().st_mtime, reverse=True
+            )
+            recent = reports[:self.settings.protect_reports]
+
+        with self._lock:
+            cached = dict(self._ensure_index()["reports"])
+
+        protected: Set[str] = set()
+        names = {}
+        for report in recent:
+            if report.name not in cached:
+                cached[report.name] = sorted(self._failure_paths(report))
+            names[report.name] = cached[report.name]
+            protected.update(cached[report.name])
+
+        # Relatórios fora da janela deixam de proteger
+        with self._lock:
+            self._ensure_index()["reports"] = names
+        return protected
+
+    def _failure_paths(self, report: Path) -> Set[str]:
+        """
+        Lê um relatório e retorna onde estão os screenshots de falha.
+
+        Args:
+            report: Caminho do relatório
+
+        Returns:
+            Nomes dos diretórios de teste e caminhos dos objetos (relativos à raiz)
+        """
+        if report.suffix == ".jsonl":
+            records = list(read_records(report))
+            actions = [record for record in records if record.get("type") == RECORD_ACTION]
+            tests = [record for record in records if record.get("type") == RECORD_TEST]
+        else:
+            try:
+                with open(report, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return set()
+            tests = [
+                test
+                for suite in data.get("suite_results", [])
+                for test in suite.get("test_results", [])
+            ]
+            actions = [action for test in tests for action in test.get("action_results", [])]
+
+        paths: List[Optional[str]] = []
+        for action in actions:
+            if action.get("status") in ("failed", "error"):
+                paths.append(action.get("screenshot_path"))
+                paths.extend(action.get("context_screenshots", []))
+        for test in tests:
+            if test.get("status") in ("failed", "error"):
+                paths.extend(test.get("error_screenshots", []))
+
+        protected = set()
+        for path in paths:
+            key = self._protected_key(path)
+            if key:
+                protected.add(key)
+        return protected
+
+    def _protected_key(self, path: Optional[str]) -> Optional[str]:
+        """
+        Item da raiz que guarda o arquivo: o diretório do teste ou, no
+        armazenamento por conteúdo, o próprio objeto.
+        """
+        if not path:
+            return None
+        try:
+            relative = Path(path).resolve().relative_to(self.root.resolve())
+        except ValueError:
+            return None
+        if len(relative.parts) < 2:
+            return None
+        if relative.parts[0] == OBJECTS_DIR:
+            return relative.as_posix()
+        return relative.parts[0]
+
+    @staticmethod
+    def _name_timestamp(name: str) -> Optional[float]:
+        """Data e hora de criação contida no nome do diretório do teste."""
+        match = _DIR_TIMESTAMP.search(name)
+        if not match:
+            return None
+        try:
+            return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').timestamp()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _read_references(test_dir: Path) -> List[str]:
+        """Objetos listados no objects.txt de um diretório de teste."""
+        try:
+            with open(test_dir / OBJECT_REFERENCES_FILE, 'r', encoding='utf-8') as f:
+                return sorted({line.strip() for line in f if line.strip()})
+        except OSError:
+            return []
+
+    def _walk_objects(self) -> Dict[str, int]:
+        """Tamanho de todos os objetos existentes (caminho relativo à raiz)."""
+        found = {}
+        objects_dir = self.root / OBJECTS_DIR
+        for dirpath, _, filenames in os.walk(objects_dir):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                try:
+                    found[path.relative_to(self.root).as_posix()] = path.stat().st_size
+                except OSError:
+                    pass
+        return found
+
+    @staticmethod
+    def _directory_size(path: Path) -> int:
+        """Soma o tamanho dos arquivos de um diretório."""
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    pass
+        return total
+
+    def _ensure_index(self) -> Dict[str, Any]:
+        """Índice em memória, lido na primeira chamada (chamar com o lock adquirido)."""
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _load_index(self) -> Dict[str, Any]:
+        """
+        Lê o índice (ou um índice vazio se não existir ou estiver corrompido)
+        e aplica os registros do diário ainda não incorporados.
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("entries", {})
+        index.setdefault("reports", {})
+
+        for record in self._read_journal():
+            name = record.pop("name", None)
+            if name and name not in index["entries"]:
+                index["entries"][name] = record
+        return index
+
+    def _read_journal(self) -> Iterable[Dict[str, Any]]:
+        """Registros do diário (linhas incompletas de uma interrupção são ignoradas)."""
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return []
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+    def _save_index(self):
+        """Grava o índice de forma atômica e esvazia o diário (já incorporado)."""
+        temp_path = self.index_path.with_suffix(".tmp")
+        with self._lock:
+            index = self._ensure_index()
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=2)
+            os.replace(temp_path, self.index_path)
+            try:
+                open(self.journal_path, 'w', encoding='utf-8').close()
+            except OSError:
+                pass
@@ -0,0 +1,157 @@
+"""
+Armazenamento de screenshots endereçado por conteúdo.
+"""
+import hashlib
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional, Set, Tuple
+
+# Tamanho da imagem reduzida usada no hash perceptual (dHash de 64 bits)
+DHASH_SIZE = 8
+
+
+def difference_hash(image) -> int:
+    """
+    Calcula o hash perceptual (dHash) de uma imagem.
+
+    Imagens visualmente quase idênticas têm hashes com poucos bits diferentes.
+
+    Args:
+        image: Imagem PIL
+
+    Returns:
+        Hash de 64 bits
+    """
+    small = image.convert("L").resize((DHASH_SIZE + 1, DHASH_SIZE))
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(DHASH_SIZE):
+        offset = row * (DHASH_SIZE + 1)
+        for col in range(DHASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+class ScreenshotStore:
+    """
+    Grava cada imagem distinta uma única vez, com o hash dos pixels como nome.
+
+    Opcionalmente, imagens quase idênticas a uma das mais recentes (distância
+    de Hamming do dHash até perceptual_threshold) reutilizam o arquivo dela.
+    """
+
+    def __init__(self, root: Path, perceptual_threshold: Optional[int] = None,
+                 recent_size: int = 16,
+                 on_reference: Optional[Callable[[Path], None]] = None):
+        """
+        Inicializa o armazenamento.
+
+        Args:
+            root: Diretório dos objetos
+            perceptual_threshold: Distância máxima para considerar quase duplicata (None = desativado)
+            recent_size: Quantidade de imagens recentes comparadas por hash perceptual
+            on_reference: Função chamada com o caminho do objeto antes de verificar
+                se ele já existe (ex.: para a retenção não removê-lo) (opcional)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.perceptual_threshold = perceptual_threshold
+        self.on_reference = on_reference
+        self._known: Set[str] = set()
+        # Imagens novas aguardando gravação: digest -> (hash perceptual, perfil)
+        self._pending: Dict[str, Tuple[Optional[int], str]] = {}
+        self._recent: Deque[Tuple[int, str, Path]] = deque(maxlen=recent_size)
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.duplicates = 0
+        self.near_duplicates = 0
+
+    def put(self, image, extension: str = "png", variant: str = "") -> Tuple[Path, bool]:
+        """
+        Resolve o caminho de uma imagem no armazenamento.
+
+        Args:
+            image: Imagem PIL
+            extension: Extensão do arquivo
+            variant: Perfil de codificação (a mesma imagem em perfis diferentes
+                gera arquivos diferentes)
+
+        Returns:
+            Tupla (caminho, True se a imagem é nova e precisa ser gravada);
+            imagens novas devem ter a gravação informada em complete()
+        """
+        perceptual = None
+        if self.perceptual_threshold is not None:
+            perceptual = difference_hash(image)
+            with self._lock:
+                for recent_hash, recent_variant, recent_path in self._recent:
+                    if recent_variant != variant:
+                        continue
+                    if bin(recent_hash ^ perceptual).count("1") <= self.perceptual_threshold:
+                        self.near_duplicates += 1
+                        return recent_path, False
+
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{variant}:{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+        hasher.update(image.tobytes())
+        digest = hasher.hexdigest()
+        path = self.root / digest[:2] / f"{digest}.{extension}"
+
+        with self._lock:
+            if self.on_reference is not None:
+                # Registrar o uso antes de conferir a existência: depois disto a
+                # retenção não remove mais o objeto; se já o removeu, ele é regravado
+                self.on_reference(path)
+            if digest in self._pending:
+                # Já agendada para gravação por outra captura
+                is_new = False
+            elif digest in self._known or path.exists():
+                self._known.add(digest)
+                if perceptual is not None:
+                    self._recent.append((perceptual, variant, path))
+                is_new = False
+            else:
+                self._pending[digest] = (perceptual, variant)
+                is_new = True
+            if not is_new:
+                self.duplicates += 1
+
+        if is_new:
+            path.parent.mkdir(exist_ok=True)
+        return path, is_new
+
+    def complete(self, path: Path, success: bool):
+        """
+        Informa o resultado da gravação de uma imagem nova (retornada por put).
+
+        Só depois de gravada a imagem passa a ser reaproveitada; se a gravação
+        falhar, a próxima captura idêntica é tratada como nova.
+
+        Args:
+            path: Caminho retornado por put
+            success: True se o arquivo foi gravado
+        """
+        digest = Path(path).stem
+        with self._lock:
+            pending = self._pending.pop(digest, None)
+            if pending is None or not success:
+                return
+            perceptual, variant = pending
+            self._known.add(digest)
+            self.stored += 1
+            if perceptual is not None:
+                self._recent.append((perceptual, variant, Path(path)))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do armazenamento.
+
+        Returns:
+            Dicionário com imagens gravadas, duplicatas e quase duplicatas
+        """
+        return {
+            "stored": self.stored,
+            "duplicates": self.duplicates,
+            "near_duplicates": self.near_duplicates,
+        }
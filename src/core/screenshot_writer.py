@@ -0,0 +1,107 @@
+"""
+Gravação de screenshots em segundo plano.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from src.models.test_script import ScreenshotEncoding
+from src.core.screenshot_encoding import encode_image
+from src.utils.tracer import span
+from src.utils.metrics import get_metrics
+
+
+class ScreenshotWriter:
+    """
+    Codifica e grava imagens em um pool de threads limitado.
+
+    submit() retorna imediatamente enquanto houver vaga na fila; com a fila
+    cheia, bloqueia até uma gravação terminar (backpressure), limitando a
+    memória ocupada por imagens pendentes.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8):
+        """
+        Inicializa o gravador.
+
+        Args:
+            max_workers: Threads de codificação/gravação
+            max_pending: Máximo de imagens aguardando gravação
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="screenshot-writer"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._failures: List[Dict[str, str]] = []
+
+    def submit(self, image, path: Path, encoding: Optional[ScreenshotEncoding] = None,
+               on_done: Optional[Callable[[bool], None]] = None):
+        """
+        Agenda a gravação de uma imagem.
+
+        Args:
+            image: Imagem PIL
+            path: Caminho final do arquivo
+            encoding: Perfil de codificação (None = PNG padrão)
+            on_done: Função chamada na thread de gravação com True (gravado) ou False (falha)
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._write, image, path, encoding, on_done)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+
+    def flush(self, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+        """
+        Aguarda as gravações pendentes.
+
+        Args:
+            timeout: Tempo máximo de espera (None = sem limite)
+
+        Returns:
+            Falhas de gravação ocorridas desde o último flush
+        """
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+        with self._lock:
+            failures, self._failures = self._failures, []
+        return failures
+
+    def close(self):
+        """Aguarda as gravações pendentes e encerra as threads."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _write(self, image, path: Path, encoding: Optional[ScreenshotEncoding],
+               on_done: Optional[Callable[[bool], None]]):
+        """Codifica e grava a imagem, registrando a falha em vez de propagá-la."""
+        try:
+            with span("screenshot.encode", "writer"):
+                encode_image(image, path, encoding)
+            metrics = get_metrics()
+            if metrics is not None:
+                metrics.screenshot_bytes.inc(Path(path).stat().st_size)
+        except Exception as e:
+            with self._lock:
+                self._failures.append({"path": str(path), "error": str(e)})
+            success = False
+        else:
+            success = True
+        if on_done is not None:
+            on_done(success)
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
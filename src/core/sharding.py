@@ -0,0 +1,181 @@
+"""
+Divisão dos testes entre máquinas (shards).
+"""
+import hashlib
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from src.core.history_store import TestHistory
+from src.core.report_merge import load_report
+from src.core.test_ordering import estimate_durations, history_key
+from src.core.worker_pool import ScheduledTest
+
+STRATEGY_DURATION = "duration"
+STRATEGY_HASH = "hash"
+
+
+@dataclass
+class ShardSelection:
+    """Testes de um shard (suíte/test_id) e a identificação da divisão usada."""
+    index: int
+    count: int
+    strategy: str
+    fingerprint: str
+    tests: List[str]
+    test_order: List[str]
+
+    @property
+    def suffix(self) -> str:
+        """Sufixo dos arquivos gerados pelo shard (ex.: _shard1of3)."""
+        return f"_shard{self.index}of{self.count}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionário (gravado no relatório e no checkpoint do shard)."""
+        return {
+            "index": self.index,
+            "count": self.count,
+            "strategy": self.strategy,
+            "fingerprint": self.fingerprint,
+            "tests": self.tests,
+            "test_order": self.test_order,
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ShardSelection':
+        """Cria uma instância a partir de um dicionário."""
+        return ShardSelection(
+            index=data["index"],
+            count=data["count"],
+            strategy=data["strategy"],
+            fingerprint=data["fingerprint"],
+            tests=data.get("tests", []),
+            test_order=data.get("test_order", [])
+        )
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Interpreta a especificação "i/N" (shard i de N, a partir de 1).
+
+    Args:
+        value: Texto no formato i/N
+
+    Returns:
+        Tupla (i, N)
+
+    Raises:
+        ValueError: Se o formato ou os valores forem inválidos
+    """
+    try:
+        index_text, count_text = value.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise ValueError(f"Shard inválido: '{value}' (use i/N, ex.: 1/3)")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard inválido: '{value}' (i deve estar entre 1 e N)")
+    return index, count
+
+
+def qualified_name(scheduled: ScheduledTest) -> str:
+    """Identificação estável de um teste: suíte/test_id."""
+    suite_name, test_id = history_key(scheduled)
+    return f"{suite_name}/{test_id}"
+
+
+def load_shard_durations(path: str) -> Dict[Tuple[str, str], TestHistory]:
+    """
+    Lê as durações dos testes de um relatório (ex.: o relatório combinado da
+    execução anterior), usadas na divisão por duração.
+
+    Todas as máquinas devem receber o mesmo arquivo: a divisão depende apenas
+    dele, e não do histórico local de cada uma.
+
+    Args:
+        path: Relatório (.json ou .jsonl)
+
+    Returns:
+        Estatísticas por (suíte, test_id)
+
+    Raises:
+        ValueError: Se o relatório não tiver nenhum teste
+    """
+    result = load_report(path)
+    durations = {
+        (suite_result.suite_name, test_result.test_id): TestHistory(
+            runs=1,
+            average_duration=test_result.duration,
+            last_status=test_result.status.value
+        )
+        for suite_result in result.suite_results
+        for test_result in suite_result.test_results
+    }
+    if not durations:
+        raise ValueError(f"Relatório sem testes para a divisão em shards: {path}")
+    return durations
+
+
+def partition(plan: List[ScheduledTest], count: int,
+              history: Dict[Tuple[str, str], TestHistory]) -> Tuple[str, List[int]]:
+    """
+    Atribui cada teste a um shard.
+
+    Com durações, usa o algoritmo guloso LPT: do teste mais longo ao mais
+    curto, cada um vai para o shard com menor carga acumulada. Sem durações,
+    usa o CRC32 de suíte/test_id, estável entre execuções e máquinas.
+
+    Args:
+        plan: Testes habilitados, na ordem do script
+        count: Quantidade de shards
+        history: Durações por (suíte, test_id), iguais em todas as máquinas
+
+    Returns:
+        Tupla (estratégia, shard de cada teste na ordem do plano, a partir de 0)
+    """
+    if not any(history_key(scheduled) in history for scheduled in plan):
+        return STRATEGY_HASH, [
+            zlib.crc32(qualified_name(scheduled).encode("utf-8")) % count for scheduled in plan
+        ]
+
+    durations = estimate_durations(plan, history)
+    # Desempate pela posição no script, para a divisão ser determinística
+    order = sorted(range(len(plan)), key=lambda i: (-durations[i], i))
+    loads = [0.0] * count
+    assignment = [0] * len(plan)
+    for i in order:
+        shard = min(range(count), key=lambda s: (loads[s], s))
+        assignment[i] = shard
+        loads[shard] += durations[i]
+    return STRATEGY_DURATION, assignment
+
+
+def select_shard(plan: List[ScheduledTest], index: int, count: int,
+                 history: Dict[Tuple[str, str], TestHistory]) -> ShardSelection:
+    """
+    Seleciona os testes de um shard.
+
+    Args:
+        plan: Testes habilitados, na ordem do script
+        index: Shard desejado (a partir de 1)
+        count: Quantidade de shards
+        history: Durações por (suíte, test_id), iguais em todas as máquinas
+
+    Returns:
+        Seleção com os nomes dos testes do shard (na ordem do script)
+    """
+    strategy, assignment = partition(plan, count, history)
+    names = [qualified_name(scheduled) for scheduled in plan]
+
+    # Todos os shards de uma mesma divisão têm a mesma impressão digital
+    hasher = hashlib.sha1()
+    for name, shard in zip(names, assignment):
+        hasher.update(f"{name}={shard};".encode("utf-8"))
+
+    return ShardSelection(
+        index=index,
+        count=count,
+        strategy=strategy,
+        fingerprint=hasher.hexdigest()[:16],
+        tests=[name for name, shard in zip(names, assignment) if shard == index - 1],
+        test_order=names
+    )
@@ -2,36 +2,76 @@
 Executor de testes automatizados.
 """
 import json
+import threading
 import time
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from src.models.test_script import TestScript, TestCase
 from src.models.test_result import (
     TestExecutionResult, TestSuiteResult, TestCaseResult,
-    TestStatus
+    ActionResult, StatusCounts, TestStatus
 )
+from src.models.execution_options import ExecutionOptions
+from src.models.compact import TimingColumns, monotonic_ns
 from src.core.app_manager import AppManager
 from src.core.screenshot_manager import ScreenshotManager
+from src.core.report_stream import ReportStreamWriter
+from src.core.checkpoint import CheckpointState, CheckpointWriter
+from src.core.history_store import HistoryStore, TestHistory
+from src.core.test_ordering import ORDER_SCRIPT, order_plan
+from src.core.sharding import (
+    ShardSelection, load_shard_durations, qualified_name, select_shard
+)
+from src.core.worker_pool import ScheduledTest, TestScheduler, WorkerContext, WorkerPool
 from src.actions import ActionFactory
 from src.utils.logger import TestLogger
+from src.utils.log_capture import (
+    CAPTURE_OFF, TestContextFilter, TestLogCapture, set_action_index, test_log_context
+)
+from src.utils.tracer import Tracer, set_tracer, span
+from src.utils.profiler import RunProfiler
+from src.utils.metrics import ExecutionMetrics, MetricsPublisher, get_metrics, set_metrics
 
 
 class TestExecutor:
     """Executor de testes automatizados."""
     
-    def __init__(self, logger: TestLogger):
+    def __init__(self, logger: TestLogger, options: Optional[ExecutionOptions] = None,
+                 app_manager_factory: Optional[Callable[..., AppManager]] = None):
         """
         Inicializa o executor.
         
         Args:
             logger: Logger para registro de eventos
+            options: Opções de execução (workers, etc.)
+            app_manager_factory: Fábrica de AppManager (permite substituir o pywinauto em testes)
         """
         self.logger = logger
+        self.options = options or ExecutionOptions()
+        self.app_manager_factory = app_manager_factory or AppManager
         self.app_manager: Optional[AppManager] = None
         self.screenshot_manager = ScreenshotManager()
         self.action_factory = ActionFactory()
+        self._results_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._startup_latency: Optional[float] = None
+        self._locator_stats: Dict[str, int] = {}
+        self._test_results: Dict[int, List[Tuple[int, TestCaseResult]]] = {}
+        self._report_stream: Optional[ReportStreamWriter] = None
+        self._checkpoint: Optional[CheckpointWriter] = None
+        self._progress = StatusCounts()
+        self._planned_tests = 0
+        self._action_timings = TimingColumns()
+        self._history: Optional[HistoryStore] = None
+        self._shard: Optional[ShardSelection] = None
+        self._log_capture: Optional[TestLogCapture] = None
+        self._log_filter = TestContextFilter()
+        self._tracer: Optional[Tracer] = None
+        self._profiler: Optional[RunProfiler] = None
+        self._metrics_publisher: Optional[MetricsPublisher] = None
     
     def execute_script(self, test_script: TestScript) -> TestExecutionResult:
         """
@@ -44,135 +84,829 @@ class TestExecutor:
             Resultado da execução
         """
         start_time = datetime.now()
+        resume_state = None
+        if self.options.resume_from:
+            resume_state = CheckpointState.load(self.options.resume_from)
+            start_time = resume_state.start_time
+        # Antes de abrir qualquer recurso: uma divisão inválida encerra a execução
+        self._shard = self._select_shard(test_script, resume_state)
+        
         self.logger.info("="*80)
         self.logger.info(f"Iniciando execução de testes - {test_script.application.name}")
         self.logger.info(f"Versão do script: {test_script.version}")
         self.logger.info("="*80)
         
-        # Criar gerenciador de aplicação
-        self.app_manager = AppManager(
+        self._test_results = {}
+        self._stop_event = threading.Event()
+        self._progress = StatusCounts()
+        self._action_timings = TimingColumns()
+        self._tracer = None
+        if self.options.trace_path:
+            self._tracer = Tracer()
+            set_tracer(self._tracer)
+        self._profiler = RunProfiler() if self.options.profile else None
+        self._start_metrics()
+        history = self._open_history(test_script, start_time)
+        self._open_log_capture()
+        if self.options.report_format == "jsonl":
+            self._open_report_stream(test_script, start_time)
+        self._open_checkpoint(test_script, start_time, resume_state)
+        self.screenshot_manager.configure(test_script.screenshots)
+        if self.screenshot_manager.retention is not None:
+            # Limpeza de execuções anteriores em paralelo aos testes
+            self.screenshot_manager.retention.start()
+        self._startup_latency = None
+        self._locator_stats = {}
+        plan = self._build_plan(test_script, resume_state)
+        plan = self._order_plan(plan, history)
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.tests_planned.set(self._planned_tests)
+        
+        interrupted = False
+        started = False
+        finished = False
+        try:
+            try:
+                if self.options.workers > 1:
+                    started = self._execute_parallel(test_script, plan)
+                else:
+                    started = self._execute_serial(test_script, plan)
+            except KeyboardInterrupt:
+                # Ctrl+C: encerrar com relatório parcial em vez de perder a execução
+                self.logger.warning("Execução interrompida pelo usuário - gerando relatório parcial")
+                interrupted = True
+                started = True
+            finished = True
+        finally:
+            # Também em erros inesperados: nada pode continuar rodando ou aberto
+            self._stop_retention()
+            self._close_log_capture()
+            if self._history is not None:
+                self._history.close()
+                self._history = None
+            self._close_checkpoint(completed=finished and started and not interrupted)
+            if not finished:
+                self._finish_trace()
+                self._stop_metrics()
+                self._close_report_stream()
+        
+        if not started:
+            self._finish_trace()
+            self._stop_metrics()
+            return self._create_error_result(test_script, start_time, "Falha ao iniciar aplicação")
+        
+        # Aguardar a gravação dos screenshots em segundo plano
+        screenshot_failures = self._flush_screenshots()
+        self._finish_trace()
+        
+        end_time = datetime.now()
+        duration = (end_time - start_time).total_seconds()
+        
+        result = TestExecutionResult(
+            application_name=test_script.application.name,
+            start_time=start_time,
+            end_time=end_time,
+            duration=duration,
+            suite_results=self._build_suite_results(test_script),
+            startup_latency=self._startup_latency,
+            locator_cache=self._locator_stats or None,
+            screenshot_failures=screenshot_failures,
+            interrupted=interrupted,
+            resumed_from=str(resume_state.path) if resume_state else None,
+            shard=self._shard.to_dict() if self._shard else None
+        )
+        
+        self._print_summary(result)
+        self._stop_metrics()
+        
+        return result
+    
+    def _open_report_stream(self, test_script: TestScript, start_time: datetime):
+        """
+        Abre o relatório em streaming, gravado à medida que os testes terminam.
+        
+        Args:
+            test_script: Script de teste
+            start_time: Horário de início da execução
+        """
+        # Ao retomar, start_time é o da execução original; o arquivo é novo
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        report_file = Path(self.options.report_dir) / f"report_{timestamp}{self._file_suffix()}.jsonl"
+        self._report_stream = ReportStreamWriter(report_file)
+        self._report_stream.write_run(
+            test_script.application.name, start_time, test_script.version
+        )
+        self.logger.info(f"Relatório em streaming: {report_file}")
+    
+    def _close_report_stream(self):
+        """Fecha o relatório em streaming sem o sumário (execução abortada por erro)."""
+        if self._report_stream is None:
+            return
+        self._report_stream.close()
+        self._report_stream = None
+    
+    def _open_log_capture(self):
+        """Começa a guardar os logs de cada teste (JSON Lines no diretório de logs)."""
+        self._log_capture = None
+        if self.options.log_capture == CAPTURE_OFF:
+            return
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        log_file = self.logger.log_dir / f"test_logs_{timestamp}{self._file_suffix()}.jsonl"
+        self._log_capture = TestLogCapture(log_file, self.options.log_capture)
+        self.logger.logger.addFilter(self._log_filter)
+        self.logger.logger.addHandler(self._log_capture)
+    
+    def _close_log_capture(self):
+        """Para de guardar os logs dos testes e fecha o arquivo."""
+        if self._log_capture is None:
+            return
+        self.logger.logger.removeHandler(self._log_capture)
+        self.logger.logger.removeFilter(self._log_filter)
+        self._log_capture.close()
+        self._log_capture = None
+    
+    def _open_checkpoint(self, test_script: TestScript, start_time: datetime,
+                         resume_state: Optional[CheckpointState]):
+        """
+        Abre o checkpoint da execução (o mesmo arquivo ao retomar).
+        
+        Args:
+            test_script: Script de teste
+            start_time: Horário de início da execução
+            resume_state: Checkpoint sendo retomado (opcional)
+        """
+        self._checkpoint = None
+        if resume_state is not None:
+            self._checkpoint = CheckpointWriter(resume_state.path)
+            return
+        if not self.options.checkpoint_dir:
+            return
+        
+        timestamp = start_time.strftime('%Y%m%d_%H%M%S')
+        checkpoint_file = (
+            Path(self.options.checkpoint_dir) / f"checkpoint_{timestamp}{self._file_suffix()}.jsonl"
+        )
+        self._checkpoint = CheckpointWriter(checkpoint_file)
+        self._checkpoint.write_header(
+            self.options.script_path, test_script.version,
+            test_script.application.name, start_time,
+            shard=self._shard.to_dict() if self._shard else None
+        )
+    
+    def _close_checkpoint(self, completed: bool):
+        """
+        Fecha o checkpoint; só é mantido se a execução não chegou ao fim.
+        
+        Args:
+            completed: True se todos os testes planejados foram executados
+        """
+        if self._checkpoint is None:
+            return
+        if completed:
+            self._checkpoint.remove()
+        else:
+            self._checkpoint.close()
+            self.logger.warning(
+                f"Para continuar a execução: --resume {self._checkpoint.path}"
+            )
+        self._checkpoint = None
+    
+    def _build_plan(self, test_script: TestScript,
+                    resume_state: Optional[CheckpointState] = None) -> List[ScheduledTest]:
+        """
+        Monta a lista de casos de teste habilitados, na ordem do script.
+        
+        Ao retomar, os testes já concluídos no checkpoint não são agendados;
+        seus resultados entram diretamente no resultado da execução. Em um
+        shard, só entram os testes atribuídos a ele.
+        
+        Args:
+            test_script: Script de teste
+            resume_state: Checkpoint sendo retomado (opcional)
+            
+        Returns:
+            Lista de testes agendados
+        """
+        plan = []
+        restored = 0
+        shard_tests = set(self._shard.tests) if self._shard else None
+        for suite_index, suite in enumerate(test_script.test_suites):
+            for test_index, test_case in enumerate(suite.test_cases):
+                if not test_case.enabled:
+                    self.logger.info(f"Teste '{test_case.name}' desabilitado - pulando")
+                    continue
+                scheduled = ScheduledTest(suite_index, test_index, suite, test_case)
+                if shard_tests is not None and qualified_name(scheduled) not in shard_tests:
+                    continue
+                if resume_state is not None:
+                    completed = resume_state.completed.get((suite_index, test_index))
+                    if completed is not None and completed.test_id == test_case.test_id:
+                        self._restore_result(suite_index, suite.name, test_index, completed)
+                        restored += 1
+                        continue
+                plan.append(scheduled)
+        
+        if resume_state is not None:
+            self.logger.info(
+                f"Retomando execução: {restored} teste(s) já concluído(s), "
+                f"{len(plan)} pendente(s)"
+            )
+        self._planned_tests = restored + len(plan)
+        return plan
+    
+    def _open_history(self, test_script: TestScript,
+                      start_time: datetime) -> Dict[Tuple[str, str], TestHistory]:
+        """
+        Abre o histórico de execuções e lê as estatísticas das execuções anteriores.
+        
+        As estatísticas são lidas antes de registrar a execução atual e usadas
+        na ordenação.
+        
+        Args:
+            test_script: Script de teste
+            start_time: Horário de início da execução
+            
+        Returns:
+            Estatísticas por (suíte, test_id) (vazio sem histórico)
+        """
+        if not self.options.history_path:
+            if self.options.order != ORDER_SCRIPT:
+                self.logger.warning(
+                    "Ordenação por histórico requer o histórico habilitado - usando a ordem do script"
+                )
+            return {}
+        
+        try:
+            self._history = HistoryStore(self.options.history_path)
+            statistics = self._history.test_statistics()
+            self._history.start_run(test_script.application.name, start_time)
+        except Exception as e:
+            self.logger.warning(f"Histórico de execuções indisponível: {e}")
+            self._history = None
+            return {}
+        return statistics
+    
+    def _select_shard(self, test_script: TestScript,
+                      resume_state: Optional[CheckpointState]) -> Optional[ShardSelection]:
+        """
+        Seleciona os testes deste shard (--shard i/N).
+        
+        A divisão é feita sobre todos os testes habilitados, na ordem do script,
+        e depende apenas de entradas iguais em todas as máquinas: as durações
+        de --shard-durations (divisão por duração) ou, sem elas, o CRC32 dos
+        nomes. O histórico local não é usado, pois difere entre as máquinas.
+        Ao retomar, a divisão gravada no checkpoint é reaproveitada.
+        
+        Args:
+            test_script: Script de teste
+            resume_state: Checkpoint sendo retomado (opcional)
+            
+        Returns:
+            Seleção do shard, ou None quando a execução não é dividida
+            
+        Raises:
+            ValueError: Se o shard informado difere do checkpoint ou as
+                durações não puderem ser lidas
+        """
+        if resume_state is not None and resume_state.shard:
+            selection = ShardSelection.from_dict(resume_state.shard)
+            if self.options.shard_index is not None and (
+                (self.options.shard_index, self.options.shard_count)
+                != (selection.index, selection.count)
+            ):
+                raise ValueError(
+                    f"O checkpoint pertence ao shard {selection.index}/{selection.count}, "
+                    f"não ao shard {self.options.shard_index}/{self.options.shard_count}"
+                )
+        elif self.options.shard_index is None:
+            return None
+        else:
+            durations = {}
+            if self.options.shard_durations:
+                durations = load_shard_durations(self.options.shard_durations)
+            enabled = [
+                ScheduledTest(suite_index, test_index, suite, test_case)
+                for suite_index, suite in enumerate(test_script.test_suites)
+                for test_index, test_case in enumerate(suite.test_cases)
+                if test_case.enabled
+            ]
+            selection = select_shard(
+                enabled, self.options.shard_index, self.options.shard_count, durations
+            )
+        
+        self.logger.info(
+            f"Shard {selection.index}/{selection.count}: {len(selection.tests)} de "
+            f"{len(selection.test_order)} teste(s) (divisão: {selection.strategy}, "
+            f"{selection.fingerprint})"
+        )
+        return selection
+    
+    def _order_plan(self, plan: List[ScheduledTest],
+                    history: Dict[Tuple[str, str], TestHistory]) -> List[ScheduledTest]:
+        """
+        Ordena o plano conforme a estratégia escolhida.
+        
+        Args:
+            plan: Testes agendados, na ordem do script
+            history: Estatísticas por (suíte, test_id)
+            
+        Returns:
+            Testes agendados na ordem de execução
+        """
+        if self._history is None or self.options.order == ORDER_SCRIPT:
+            return plan
+        
+        ordered = order_plan(plan, self.options.order, history)
+        self.logger.info(f"Ordem de execução: {self.options.order}")
+        return ordered
+    
+    def _start_metrics(self):
+        """Ativa as métricas e as publica (endpoint HTTP e/ou arquivo), se configurado."""
+        self._metrics_publisher = None
+        if self.options.metrics_port is None and not self.options.metrics_textfile:
+            return
+        
+        metrics = ExecutionMetrics()
+        publisher = MetricsPublisher(
+            metrics, port=self.options.metrics_port, textfile=self.options.metrics_textfile
+        )
+        try:
+            publisher.start()
+        except OSError as e:
+            self.logger.warning(f"Métricas indisponíveis: {e}")
+            return
+        set_metrics(metrics)
+        self._metrics_publisher = publisher
+        if self.options.metrics_port is not None:
+            self.logger.info(f"Métricas em: http://127.0.0.1:{self.options.metrics_port}/metrics")
+        if self.options.metrics_textfile:
+            self.logger.info(f"Métricas gravadas em: {self.options.metrics_textfile}")
+    
+    def _stop_metrics(self):
+        """Publica os valores finais e desativa as métricas."""
+        if self._metrics_publisher is None:
+            return
+        set_metrics(None)
+        try:
+            self._metrics_publisher.stop()
+        except OSError as e:
+            self.logger.warning(f"Falha ao gravar métricas: {e}")
+        self._metrics_publisher = None
+    
+    def _finish_trace(self):
+        """Encerra o rastreamento e exporta os spans (Chrome trace)."""
+        if self._tracer is None:
+            return
+        set_tracer(None)
+        try:
+            self._tracer.export_chrome(self.options.trace_path)
+            self.logger.info(f"Rastreamento salvo em: {self.options.trace_path}")
+        except OSError as e:
+            self.logger.warning(f"Falha ao salvar rastreamento: {e}")
+    
+    def _file_suffix(self) -> str:
+        """Sufixo dos arquivos da execução (identifica o shard)."""
+        return self._shard.suffix if self._shard else ""
+    
+    def _restore_result(self, suite_index: int, suite_name: str, test_index: int,
+                        test_result: TestCaseResult):
+        """
+        Inclui no resultado um teste concluído antes da interrupção.
+        
+        Args:
+            suite_index: Posição da suíte no script
+            suite_name: Nome da suíte
+            test_index: Posição do teste na suíte
+            test_result: Resultado lido do checkpoint
+        """
+        stream = self._report_stream
+        if stream is not None:
+            for index, action_result in enumerate(test_result.action_results, 1):
+                stream.write_action(
+                    suite_index, suite_name, test_index, test_result.test_id, index, action_result
+                )
+            stream.write_test(suite_index, suite_name, test_index, test_result)
+            test_result.action_results = []
+        
+        with self._results_lock:
+            self._test_results.setdefault(suite_index, []).append((test_index, test_result))
+            self._progress.add(test_result.status, test_result.duration)
+    
+    def _create_worker_context(self, test_script: TestScript,
+                               worker_id: Optional[int] = None) -> WorkerContext:
+        """
+        Cria os recursos de um worker: instância da aplicação, screenshots e logger.
+        
+        Args:
+            test_script: Script de teste
+            worker_id: Identificador do worker (None na execução serial)
+            
+        Returns:
+            Contexto do worker
+        """
+        app_manager = self.app_manager_factory(
             app_path=test_script.application.path,
             arguments=test_script.application.arguments,
             backend=test_script.application.backend,
             startup_delay=test_script.application.startup_delay,
-            timeout=test_script.application.timeout
+            timeout=test_script.application.timeout,
+            ready_condition=test_script.application.ready
+        )
+        
+        if worker_id is None:
+            return WorkerContext(None, app_manager, self.screenshot_manager, self.logger)
+        
+        screenshot_manager = ScreenshotManager(
+            self.screenshot_manager.screenshot_dir,
+            worker_id=worker_id,
+            writer=self.screenshot_manager.writer
         )
+        screenshot_manager.configure(
+            test_script.screenshots,
+            store=self.screenshot_manager.store,
+            retention=self.screenshot_manager.retention
+        )
+        
+        return WorkerContext(
+            worker_id=worker_id,
+            app_manager=app_manager,
+            screenshot_manager=screenshot_manager,
+            logger=self.logger.for_worker(worker_id)
+        )
+    
+    def _execute_serial(self, test_script: TestScript, plan: List[ScheduledTest]) -> bool:
+        """
+        Executa os testes em sequência com uma única instância da aplicação.
+        
+        Args:
+            test_script: Script de teste
+            plan: Testes agendados
+            
+        Returns:
+            False se a aplicação não pôde ser iniciada
+        """
+        # Criar gerenciador de aplicação
+        context = self._create_worker_context(test_script)
+        self.app_manager = context.app_manager
         
         # Iniciar aplicação
         try:
             self.logger.info(f"Iniciando aplicação: {test_script.application.path}")
             self.app_manager.start()
-            self.logger.info("✓ Aplicação iniciada com sucesso")
+            self._startup_latency = self.app_manager.startup_latency
+            self.logger.info(f"✓ Aplicação iniciada com sucesso ({self._startup_latency:.2f}s)")
         except Exception as e:
             self.logger.critical(f"✗ Falha ao iniciar aplicação: {e}")
-            return self._create_error_result(test_script, start_time, str(e))
+            # O processo e as threads da aplicação podem ter sido iniciados
+            self._close_failed_start(context)
+            return False
         
         # Executar suítes de teste
-        suite_results = []
+        current_suite = None
         try:
-            for suite in test_script.test_suites:
-                suite_result = self._execute_suite(suite)
-                suite_results.append(suite_result)
+            for scheduled in plan:
+                if scheduled.suite is not current_suite:
+                    current_suite = scheduled.suite
+                    self._log_suite_header(current_suite)
+                self._run_scheduled_test(context, scheduled)
         finally:
             # Sempre fechar aplicação
             self.logger.info("Fechando aplicação...")
             self.app_manager.close(force=True)
             self.logger.info("✓ Aplicação fechada")
+            self._collect_locator_stats(self.app_manager)
         
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        return True
+    
+    def _execute_parallel(self, test_script: TestScript, plan: List[ScheduledTest]) -> bool:
+        """
+        Distribui os testes entre várias instâncias da aplicação.
         
-        result = TestExecutionResult(
-            application_name=test_script.application.name,
-            start_time=start_time,
-            end_time=end_time,
-            duration=duration,
-            suite_results=suite_results
+        Args:
+            test_script: Script de teste
+            plan: Testes agendados
+            
+        Returns:
+            False se nenhuma instância da aplicação pôde ser iniciada
+        """
+        contexts = []
+        try:
+            for worker_id in range(1, self.options.workers + 1):
+                context = None
+                try:
+                    context = self._create_worker_context(test_script, worker_id)
+                    context.logger.info(f"Iniciando aplicação: {test_script.application.path}")
+                    context.app_manager.start()
+                    latency = context.app_manager.startup_latency
+                    context.logger.info(f"✓ Aplicação iniciada com sucesso ({latency:.2f}s)")
+                    contexts.append(context)
+                    self._startup_latency = max(self._startup_latency or 0.0, latency)
+                except Exception as e:
+                    self.logger.error(f"✗ Falha ao iniciar aplicação do worker {worker_id}: {e}")
+                    if context is not None:
+                        self._close_failed_start(context)
+            
+            if not contexts:
+                self.logger.critical("✗ Nenhuma instância da aplicação foi iniciada")
+                return False
+            
+            self.logger.info(f"Executando {len(plan)} teste(s) em {len(contexts)} worker(s)")
+            pool = WorkerPool(
+                contexts, TestScheduler(plan), self._run_scheduled_test, self.logger,
+                on_error=self._record_worker_error, stop_event=self._stop_event
+            )
+            pool.run()
+        finally:
+            for context in contexts:
+                context.logger.info("Fechando aplicação...")
+                context.app_manager.close(force=True)
+                context.logger.info("✓ Aplicação fechada")
+                self._collect_locator_stats(context.app_manager)
+        
+        return True
+    
+    def _close_failed_start(self, context: WorkerContext):
+        """
+        Fecha uma instância da aplicação que falhou ao iniciar (processo,
+        click worker e eventos de janela já iniciados).
+        
+        Args:
+            context: Contexto do worker
+        """
+        try:
+            context.app_manager.close(force=True)
+        except Exception as e:
+            context.logger.warning(f"Falha ao fechar a aplicação que não iniciou: {e}")
+    
+    def _run_scheduled_test(self, context: WorkerContext, scheduled: ScheduledTest):
+        """
+        Executa um teste agendado e guarda o resultado.
+        
+        Args:
+            context: Contexto do worker
+            scheduled: Teste agendado
+        """
+        stream = self._report_stream
+        on_action = None
+        if stream is not None:
+            def on_action(index: int, action_result: ActionResult):
+                stream.write_action(
+                    scheduled.suite_index, scheduled.suite.name, scheduled.test_index,
+                    scheduled.test_case.test_id, index, action_result
+                )
+        
+        capture = self._log_capture
+        profile = self._profiler.start() if self._profiler is not None else None
+        try:
+            with span(
+                "test", "test", suite=scheduled.suite.name, test_id=scheduled.test_case.test_id
+            ):
+                if capture is None:
+                    test_result = self._execute_test_case(
+                        scheduled.suite.name, scheduled.test_case, context, on_action
+                    )
+                else:
+                    with test_log_context(
+                        scheduled.suite.name, scheduled.test_case.test_id,
+                        self.options.log_buffer_size
+                    ) as log_context:
+                        test_result = self._execute_test_case(
+                            scheduled.suite.name, scheduled.test_case, context, on_action
+                        )
+                    failed = test_result.status in (TestStatus.FAILED, TestStatus.ERROR)
+                    test_result.log_ref = capture.finish(log_context, failed=failed)
+        finally:
+            # Mesmo com exceção: um perfil que fica ativo impede os dos testes seguintes
+            if profile is not None:
+                test_dir = context.screenshot_manager.current_test_dir
+                profile_path = self._profiler.stop(
+                    profile, test_dir / "profile.prof" if test_dir else None
+                )
+                if profile_path is not None:
+                    context.logger.debug("Perfil do teste: %s", profile_path)
+        
+        self._record_test_result(context, scheduled, test_result)
+    
+    def _record_worker_error(self, context: WorkerContext, scheduled: ScheduledTest,
+                             error: Exception):
+        """
+        Registra com erro um teste cuja execução levantou uma exceção no worker.
+        
+        Args:
+            context: Contexto do worker
+            scheduled: Teste agendado
+            error: Exceção levantada
+        """
+        now_ns = monotonic_ns()
+        test_result = TestCaseResult(
+            test_id=scheduled.test_case.test_id,
+            test_name=scheduled.test_case.name,
+            status=TestStatus.ERROR,
+            start_ns=now_ns,
+            end_ns=now_ns,
+            error_message=f"Erro inesperado: {str(error)}"
         )
+        self._record_test_result(context, scheduled, test_result)
+    
+    def _record_test_result(self, context: WorkerContext, scheduled: ScheduledTest,
+                            test_result: TestCaseResult):
+        """
+        Guarda o resultado de um teste: histórico, checkpoint, relatório e progresso.
         
-        self._print_summary(result)
+        Args:
+            context: Contexto do worker
+            scheduled: Teste agendado
+            test_result: Resultado do teste
+        """
+        if self._stop_event.is_set():
+            # Interrompido (Ctrl+C): o resultado de um teste cortado não vai ao
+            # checkpoint, para que --resume o execute novamente
+            context.logger.warning(
+                f"Resultado de '{test_result.test_id}' descartado: execução interrompida"
+            )
+            return
         
-        return result
+        stream = self._report_stream
+        with self._results_lock:
+            for action_result in test_result.action_results:
+                self._action_timings.append(
+                    action_result.start_ns, action_result.end_ns, action_result.status.value
+                )
+        
+        if self._history is not None:
+            try:
+                self._history.record_test(scheduled.suite.name, test_result)
+            except Exception as e:
+                context.logger.warning(f"Falha ao gravar histórico: {e}")
+        
+        checkpoint = self._checkpoint
+        if checkpoint is not None:
+            checkpoint.write_test(scheduled.suite_index, scheduled.test_index, test_result)
+        
+        if stream is not None:
+            stream.write_test(
+                scheduled.suite_index, scheduled.suite.name, scheduled.test_index, test_result
+            )
+            # As ações já estão no arquivo; manter só o resumo do teste em memória
+            test_result.action_results = []
+        
+        with self._results_lock:
+            self._test_results.setdefault(scheduled.suite_index, []).append(
+                (scheduled.test_index, test_result)
+            )
+            self._progress.add(test_result.status, test_result.duration)
+            progress = replace(self._progress)
+        
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.tests.inc(status=test_result.status.value)
+        
+        context.logger.info(
+            f"Progresso: {progress.total}/{self._planned_tests} teste(s) - "
+            f"{progress.passed} aprovado(s), {progress.failed} reprovado(s), "
+            f"{progress.error} erro(s)"
+        )
     
-    def _execute_suite(self, suite) -> TestSuiteResult:
+    def _build_suite_results(self, test_script: TestScript) -> List[TestSuiteResult]:
         """
-        Executa uma suíte de testes.
+        Agrupa os resultados dos testes por suíte, na ordem do script.
         
         Args:
-            suite: Suíte a ser executada
+            test_script: Script de teste
             
         Returns:
-            Resultado da suíte
+            Resultados das suítes
+        """
+        suite_results = []
+        for suite_index, suite in enumerate(test_script.test_suites):
+            entries = sorted(self._test_results.get(suite_index, []), key=lambda e: e[0])
+            test_results = [test_result for _, test_result in entries]
+            
+            if test_results:
+                start_time = min(tr.start_time for tr in test_results)
+                end_time = max(tr.end_time for tr in test_results)
+            else:
+                start_time = end_time = datetime.now()
+            
+            suite_result = TestSuiteResult(
+                suite_name=suite.name,
+                start_time=start_time,
+                end_time=end_time,
+                duration=(end_time - start_time).total_seconds()
+            )
+            for test_result in test_results:
+                suite_result.add_test_result(test_result)
+            suite_results.append(suite_result)
+        return suite_results
+    
+    def _flush_screenshots(self) -> List[Dict[str, str]]:
+        """
+        Aguarda a gravação dos screenshots pendentes e registra as falhas.
+        
+        Returns:
+            Falhas de gravação
+        """
+        failures = self.screenshot_manager.flush()
+        for failure in failures:
+            self.logger.warning(f"Falha ao gravar screenshot {failure['path']}: {failure['error']}")
+        return failures
+    
+    def _stop_retention(self):
+        """Interrompe a retenção de screenshots e registra o que foi removido."""
+        retention = self.screenshot_manager.retention
+        if retention is None:
+            return
+        retention.stop()
+        stats = retention.stats()
+        if stats["evicted"] or stats["evicted_objects"]:
+            self.logger.info(
+                f"Retenção de screenshots: {stats['evicted']} diretório(s) e "
+                f"{stats['evicted_objects']} objeto(s) removido(s), "
+                f"{stats['freed_bytes'] / (1024 * 1024):.1f} MB liberados"
+            )
+    
+    def _collect_locator_stats(self, app_manager: AppManager):
+        """
+        Soma os contadores do cache de localização de uma instância da aplicação.
+        
+        Args:
+            app_manager: Gerenciador da instância
+        """
+        locator_cache = getattr(app_manager, "locator_cache", None)
+        if locator_cache is None:
+            return
+        for name, value in locator_cache.stats().items():
+            self._locator_stats[name] = self._locator_stats.get(name, 0) + value
+    
+    def _log_suite_header(self, suite):
+        """
+        Registra o cabeçalho de uma suíte de testes.
+        
+        Args:
+            suite: Suíte a ser executada
         """
-        start_time = datetime.now()
         self.logger.info("")
         self.logger.info("="*80)
         self.logger.info(f"Suíte: {suite.name}")
         self.logger.info(f"Descrição: {suite.description}")
         self.logger.info("="*80)
-        
-        test_results = []
-        
-        for test_case in suite.test_cases:
-            if not test_case.enabled:
-                self.logger.info(f"Teste '{test_case.name}' desabilitado - pulando")
-                continue
-            
-            test_result = self._execute_test_case(suite.name, test_case)
-            test_results.append(test_result)
-        
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
-        
-        return TestSuiteResult(
-            suite_name=suite.name,
-            start_time=start_time,
-            end_time=end_time,
-            duration=duration,
-            test_results=test_results
-        )
     
-    def _execute_test_case(self, suite_name: str, test_case: TestCase) -> TestCaseResult:
+    def _execute_test_case(self, suite_name: str, test_case: TestCase,
+                           context: WorkerContext,
+                           on_action: Optional[Callable[[int, ActionResult], None]] = None
+                           ) -> TestCaseResult:
         """
         Executa um caso de teste.
         
         Args:
             suite_name: Nome da suíte
             test_case: Caso de teste a ser executado
+            context: Contexto do worker que executa o teste
+            on_action: Função chamada com (posição, resultado) ao final de cada ação (opcional)
             
         Returns:
             Resultado do teste
         """
-        start_time = datetime.now()
-        self.logger.info("")
-        self.logger.info("-"*80)
-        self.logger.info(f"Teste: {test_case.name} (ID: {test_case.test_id})")
-        self.logger.info(f"Descrição: {test_case.description}")
+        logger = context.logger
+        screenshot_manager = context.screenshot_manager
+        foreground_tracker = context.app_manager.foreground_tracker
+        focus_time_before = foreground_tracker.elapsed
+        start_ns = monotonic_ns()
+        logger.info("")
+        logger.info("-"*80)
+        logger.info(f"Teste: {test_case.name} (ID: {test_case.test_id})")
+        logger.info(f"Descrição: {test_case.description}")
         if test_case.tags:
-            self.logger.info(f"Tags: {', '.join(test_case.tags)}")
-        self.logger.info("-"*80)
+            logger.info(f"Tags: {', '.join(test_case.tags)}")
+        logger.info("-"*80)
         
         # Preparar diretório de screenshots
-        self.screenshot_manager.prepare_test_directory(suite_name, test_case.test_id)
+        screenshot_manager.prepare_test_directory(suite_name, test_case.test_id)
         
         action_results = []
         test_status = TestStatus.PASSED
         error_message = None
+        error_screenshots = []
         
         try:
             for i, action in enumerate(test_case.actions, 1):
-                self.logger.info(f"[{i}/{len(test_case.actions)}] {action.description}")
+                set_action_index(i)
+                logger.info(f"[{i}/{len(test_case.actions)}] {action.description}")
                 
                 # Criar e executar ação
                 action_executor = self.action_factory.create_action(
                     action.action_type,
-                    self.app_manager,
-                    self.screenshot_manager,
-                    self.logger
+                    context.app_manager,
+                    screenshot_manager,
+                    logger
                 )
                 
                 action_result = action_executor.execute(action)
                 action_results.append(action_result)
+                if on_action is not None:
+                    on_action(i, action_result)
                 
                 # Verificar falha
                 if action_result.status == TestStatus.FAILED:
@@ -181,39 +915,52 @@ class TestExecutor:
                         error_message = f"Ação falhou: {action.description}"
                         break
                     else:
-                        self.logger.warning("Continuando apesar da falha (continue_on_failure=true)")
+                        logger.warning("Continuando apesar da falha (continue_on_failure=true)")
                 
         except Exception as e:
             test_status = TestStatus.ERROR
             error_message = f"Erro inesperado: {str(e)}"
-            self.logger.error(error_message)
+            logger.error(error_message)
             
-            # Capturar screenshot do erro
+            # Capturar screenshot do erro (e os quadros que o antecederam)
             try:
-                self.screenshot_manager.capture_full_screen(prefix="error")
+                for path in screenshot_manager.dump_ring_buffer():
+                    logger.info(f"Screenshot anterior ao erro: {path}")
+                    error_screenshots.append(path)
+                try:
+                    window = context.app_manager.get_window()
+                except Exception:
+                    window = None
+                if window is not None:
+                    error_screenshots.append(screenshot_manager.capture_window(window, prefix="error"))
+                else:
+                    error_screenshots.append(screenshot_manager.capture_full_screen(prefix="error"))
             except Exception:
                 pass
         
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        set_action_index(None)
+        end_ns = monotonic_ns()
+        duration = (end_ns - start_ns) / 1e9
+        focus_time = foreground_tracker.elapsed - focus_time_before
         
         # Log resultado
         if test_status == TestStatus.PASSED:
-            self.logger.info(f"✓ Teste APROVADO (duração: {duration:.2f}s)")
+            logger.info(f"✓ Teste APROVADO (duração: {duration:.2f}s, foco: {focus_time:.2f}s)")
         else:
-            self.logger.error(f"✗ Teste REPROVADO (duração: {duration:.2f}s)")
+            logger.error(f"✗ Teste REPROVADO (duração: {duration:.2f}s, foco: {focus_time:.2f}s)")
             if error_message:
-                self.logger.error(f"  Motivo: {error_message}")
+                logger.error(f"  Motivo: {error_message}")
         
         return TestCaseResult(
             test_id=test_case.test_id,
             test_name=test_case.name,
             status=test_status,
-            start_time=start_time,
-            end_time=end_time,
-            duration=duration,
+            start_ns=start_ns,
+            end_ns=end_ns,
             action_results=action_results,
-            error_message=error_message
+            error_message=error_message,
+            focus_time=focus_time,
+            error_screenshots=tuple(error_screenshots)
         )
     
     def _create_error_result(self, test_script: TestScript, start_time: datetime, 
@@ -253,6 +1000,32 @@ class TestExecutor:
         self.logger.info("="*80)
         self.logger.info(f"Aplicação: {result.application_name}")
         self.logger.info(f"Duração total: {result.duration:.2f}s")
+        if result.startup_latency is not None:
+            self.logger.info(f"Inicialização da aplicação: {result.startup_latency:.2f}s")
+        if self.screenshot_manager.store is not None:
+            store_stats = self.screenshot_manager.store.stats()
+            self.logger.info(
+                f"Screenshots: {store_stats['stored']} gravado(s), "
+                f"{store_stats['duplicates']} duplicado(s), "
+                f"{store_stats['near_duplicates']} quase duplicado(s)"
+            )
+        if result.locator_cache:
+            self.logger.info(
+                f"Cache de controles: {result.locator_cache['hits']} acerto(s), "
+                f"{result.locator_cache['misses']} busca(s) completa(s), "
+                f"{result.locator_cache['stale']} obsoleto(s)"
+            )
+        if self._action_timings:
+            timings = self._action_timings
+            self.logger.info(
+                f"Ações: {len(timings)} executada(s), "
+                f"média {timings.total_duration() / len(timings) * 1000:.0f}ms, "
+                f"máxima {timings.max_duration() * 1000:.0f}ms"
+            )
+        if self._tracer is not None:
+            self._print_phase_breakdown(self._tracer)
+        if self._profiler is not None:
+            self._print_hot_functions(self._profiler)
         self.logger.info(f"Total de testes: {result.total_tests}")
         self.logger.info(f"✓ Aprovados: {result.passed_tests}")
         self.logger.info(f"✗ Reprovados: {result.failed_tests}")
@@ -260,19 +1033,71 @@ class TestExecutor:
         self.logger.info(f"Taxa de sucesso: {result.success_rate:.2f}%")
         self.logger.info("="*80)
     
+    def _print_phase_breakdown(self, tracer: Tracer, limit: int = 12):
+        """
+        Imprime o tempo próprio de cada fase (sem as fases internas), da maior para a menor.
+        
+        Args:
+            tracer: Tracer da execução
+            limit: Quantidade máxima de fases listadas
+        """
+        phases = tracer.phase_stats()
+        total_self = sum(stats.self_ns for stats in phases.values()) or 1
+        self.logger.info("Fases (tempo próprio, soma de todas as threads):")
+        for name, stats in list(phases.items())[:limit]:
+            self.logger.info(
+                f"  {name:<24} {stats.self_ns / 1e9:>8.2f}s "
+                f"{stats.self_ns / total_self * 100:>5.1f}%  "
+                f"({stats.count}x, total {stats.total_ns / 1e9:.2f}s)"
+            )
+    
+    def _print_hot_functions(self, profiler: RunProfiler):
+        """
+        Imprime as funções Python com maior tempo próprio somado em todos os testes.
+        
+        Args:
+            profiler: Perfis da execução
+        """
+        self.logger.info(
+            f"Funções mais custosas ({profiler.profiled} teste(s) medido(s), "
+            f"perfil em profile.prof no diretório de screenshots de cada teste):"
+        )
+        if profiler.skipped:
+            self.logger.info(
+                f"  {profiler.skipped} teste(s) sem perfil (outro perfil ativo em paralelo)"
+            )
+        for hot in profiler.hottest(self.options.profile_top):
+            self.logger.info(
+                f"  {hot.own_time:>8.3f}s próprio {hot.cumulative_time:>8.3f}s acumulado "
+                f"{hot.calls:>8}x  {hot.function}"
+            )
+    
     def save_report(self, result: TestExecutionResult, output_dir: str = "reports"):
         """
         Salva relatório de execução.
         
+        No formato jsonl, os testes já foram gravados durante a execução e
+        apenas os registros de suíte e o sumário são acrescentados.
+        
         Args:
             result: Resultado da execução
-            output_dir: Diretório de saída
+            output_dir: Diretório de saída (formato json)
         """
+        # Garantir que todos os screenshots referenciados foram gravados
+        result.screenshot_failures.extend(self._flush_screenshots())
+        
+        if self._report_stream is not None:
+            self._report_stream.write_summary(result)
+            self._report_stream.close()
+            self.logger.info(f"Relatório salvo em: {self._report_stream.path}")
+            self._report_stream = None
+            return
+        
         report_dir = Path(output_dir)
         report_dir.mkdir(exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        report_file = report_dir / f"report_{timestamp}.json"
+        report_file = report_dir / f"report_{timestamp}{self._file_suffix()}.json"
         
         with open(report_file, 'w', encoding='utf-8') as f:
             json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
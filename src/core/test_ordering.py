@@ -0,0 +1,80 @@
+"""
+Estratégias de ordenação dos testes com base no histórico de execuções.
+"""
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from src.core.history_store import TestHistory
+from src.core.worker_pool import ScheduledTest
+
+ORDER_SCRIPT = "script"
+ORDER_LONGEST_FIRST = "longest-first"
+ORDER_FAILED_FIRST = "failed-first"
+ORDER_STRATEGIES = (ORDER_SCRIPT, ORDER_LONGEST_FIRST, ORDER_FAILED_FIRST)
+
+
+def history_key(scheduled: ScheduledTest) -> Tuple[str, str]:
+    """Chave do teste no histórico: (suíte, test_id)."""
+    return scheduled.suite.name, scheduled.test_case.test_id
+
+
+def estimate_durations(plan: List[ScheduledTest],
+                       history: Dict[Tuple[str, str], TestHistory]) -> List[float]:
+    """
+    Estima a duração de cada teste pela média das últimas execuções.
+
+    Testes sem histórico recebem a média dos demais (ou 0 sem nenhum histórico).
+
+    Args:
+        plan: Testes agendados
+        history: Estatísticas por (suíte, test_id)
+
+    Returns:
+        Durações estimadas, na ordem do plano
+    """
+    known = [history[history_key(s)].average_duration for s in plan if history_key(s) in history]
+    default = sum(known) / len(known) if known else 0.0
+    return [
+        history[history_key(s)].average_duration if history_key(s) in history else default
+        for s in plan
+    ]
+
+
+def order_plan(plan: List[ScheduledTest], strategy: str,
+               history: Dict[Tuple[str, str], TestHistory]) -> List[ScheduledTest]:
+    """
+    Reordena os testes agendados.
+
+    - script: ordem do script
+    - longest-first: maior duração média primeiro (equilibra os workers)
+    - failed-first: testes que falharam na execução mais recente primeiro,
+      depois os que falharam nas últimas execuções, depois os demais
+
+    Args:
+        plan: Testes agendados, na ordem do script
+        strategy: Estratégia de ordenação
+        history: Estatísticas por (suíte, test_id)
+
+    Returns:
+        Nova lista de testes agendados
+    """
+    if strategy == ORDER_SCRIPT or not history:
+        return list(plan)
+
+    if strategy == ORDER_LONGEST_FIRST:
+        durations = estimate_durations(plan, history)
+        order = sorted(range(len(plan)), key=lambda i: -durations[i])
+        return [plan[i] for i in order]
+
+    if strategy == ORDER_FAILED_FIRST:
+        def _priority(scheduled: ScheduledTest):
+            stats = history.get(history_key(scheduled))
+            if stats is None or stats.last_failure is None:
+                return (2, 0.0)
+            # Falhas mais recentes primeiro
+            last_failure = datetime.fromisoformat(stats.last_failure).timestamp()
+            return (0 if stats.last_failed else 1, -last_failure)
+        return sorted(plan, key=_priority)
+
+    raise ValueError(f"Estratégia de ordenação desconhecida: '{strategy}'")
+
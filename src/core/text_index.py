@@ -0,0 +1,173 @@
+"""
+Índice de textos dos controles de uma janela.
+"""
+from typing import Dict, List, Optional, Tuple
+from pywinauto import backend as pywinauto_backend
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Normaliza um texto para comparação (sem diferenciar maiúsculas e espaços).
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Texto normalizado
+    """
+    if not text:
+        return ""
+    return " ".join(text.casefold().split())
+
+
+class WindowTextIndex:
+    """
+    Textos de todos os descendentes de uma janela, lidos em uma única varredura.
+
+    As buscas (exata e por substring) são feitas em memória, sem novas
+    chamadas à árvore de automação da aplicação.
+    """
+
+    def __init__(self, window_key, entries: List[Tuple[str, object]], wrap):
+        """
+        Inicializa o índice.
+
+        Args:
+            window_key: Handle da janela indexada
+            entries: Pares (texto normalizado, element_info)
+            wrap: Função que cria o wrapper do pywinauto para um element_info
+        """
+        self.window_key = window_key
+        self._entries = entries
+        self._wrap = wrap
+        self._exact: Dict[str, List[object]] = {}
+        for text, element_info in entries:
+            self._exact.setdefault(text, []).append(element_info)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find_exact(self, text: str) -> list:
+        """
+        Controles cujo texto é igual ao informado.
+
+        Args:
+            text: Texto procurado
+
+        Returns:
+            Lista de wrappers
+        """
+        return [self._wrap(ei) for ei in self._exact.get(normalize_text(text), [])]
+
+    def find_containing(self, text: str) -> list:
+        """
+        Controles cujo texto contém o informado.
+
+        Args:
+            text: Texto procurado
+
+        Returns:
+            Lista de wrappers, na ordem da árvore
+        """
+        needle = normalize_text(text)
+        return [self._wrap(ei) for entry_text, ei in self._entries if needle in entry_text]
+
+    def find(self, text: str) -> List[Tuple[object, bool]]:
+        """
+        Busca exata e, se não houver resultado, por substring.
+
+        Args:
+            text: Texto procurado
+
+        Returns:
+            Lista de pares (wrapper candidato, se a correspondência é exata)
+        """
+        exact = self.find_exact(text)
+        if exact:
+            return [(control, True) for control in exact]
+        return [(control, False) for control in self.find_containing(text)]
+
+    @staticmethod
+    def still_matches(control, text: str, exact: bool) -> bool:
+        """
+        Relê o texto atual do controle e confere se ainda corresponde ao procurado.
+
+        O índice é reaproveitado enquanto a janela for a mesma, mas o texto de
+        um controle pode mudar dentro dela (abas, botões renomeados).
+
+        Args:
+            control: Wrapper obtido do índice
+            text: Texto procurado
+            exact: Se a correspondência no índice foi exata
+
+        Returns:
+            True se o texto atual ainda corresponde
+        """
+        try:
+            current = normalize_text(control.element_info.name)
+        except Exception:
+            return False
+        needle = normalize_text(text)
+        return current == needle if exact else needle in current
+
+
+class TextIndexCache:
+    """Mantém o índice da última janela consultada, reconstruindo quando ela muda."""
+
+    def __init__(self, backend: str = "uia"):
+        self.backend = backend
+        self._index: Optional[WindowTextIndex] = None
+
+    def get(self, window) -> WindowTextIndex:
+        """
+        Obtém o índice da janela, reaproveitando o anterior se for a mesma janela.
+
+        Args:
+            window: Janela do pywinauto
+
+        Returns:
+            Índice de textos
+        """
+        window_key = self._window_key(window)
+        if self._index is None or window_key is None or self._index.window_key != window_key:
+            self._index = self.build(window)
+        return self._index
+
+    def build(self, window) -> WindowTextIndex:
+        """
+        Lê os textos de todos os descendentes da janela e cria um novo índice.
+
+        Args:
+            window: Janela do pywinauto
+
+        Returns:
+            Índice de textos
+        """
+        wrapper = window.wrapper_object() if hasattr(window, "wrapper_object") else window
+        entries = []
+        for element_info in wrapper.element_info.descendants():
+            try:
+                text = normalize_text(element_info.name)
+            except Exception:
+                continue
+            if text:
+                entries.append((text, element_info))
+
+        self._index = WindowTextIndex(self._window_key(window), entries, self._wrapper_factory())
+        return self._index
+
+    def invalidate(self):
+        """Descarta o índice atual."""
+        self._index = None
+
+    def _wrapper_factory(self):
+        """Cria wrappers do backend configurado (o pywinauto escolhe a classe específica)."""
+        return pywinauto_backend.registry.backends[self.backend].generic_wrapper_class
+
+    @staticmethod
+    def _window_key(window) -> Optional[int]:
+        """Handle da janela, ou None se não puder ser obtido."""
+        try:
+            return window.handle
+        except Exception:
+            return None
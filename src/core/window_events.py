@@ -0,0 +1,274 @@
+"""
+Notificações de criação e ativação de janelas.
+"""
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+# Tipos de evento
+WINDOW_CREATED = "created"
+WINDOW_SHOWN = "shown"
+WINDOW_DESTROYED = "destroyed"
+WINDOW_RENAMED = "renamed"
+WINDOW_FOREGROUND = "foreground"
+
+
+@dataclass
+class WindowEvent:
+    """Evento de janela recebido de uma fonte de eventos."""
+    kind: str
+    handle: int
+
+
+class WindowEventSource(ABC):
+    """Interface das fontes de eventos de janela."""
+
+    def __init__(self):
+        self._callbacks: List[Callable[[WindowEvent], None]] = []
+        self.active = False
+
+    def subscribe(self, callback: Callable[[WindowEvent], None]):
+        """
+        Registra uma função chamada a cada evento.
+
+        Args:
+            callback: Função que recebe o WindowEvent
+        """
+        self._callbacks.append(callback)
+
+    @abstractmethod
+    def start(self, process_id: int):
+        """
+        Começa a receber eventos das janelas de um processo.
+
+        Args:
+            process_id: PID da aplicação
+        """
+        pass
+
+    @abstractmethod
+    def stop(self):
+        """Para de receber eventos."""
+        pass
+
+    def _notify(self, event: WindowEvent):
+        """Repassa um evento aos inscritos."""
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+
+class FakeWindowEventSource(WindowEventSource):
+    """Fonte de eventos controlada manualmente (para testes sem Windows)."""
+
+    def start(self, process_id: int):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def emit(self, kind: str, handle: int = 0):
+        """
+        Dispara um evento para os inscritos.
+
+        Args:
+            kind: Tipo do evento
+            handle: Handle da janela
+        """
+        self._notify(WindowEvent(kind, handle))
+
+
+class WinEventHookSource(WindowEventSource):
+    """
+    Eventos de janela via SetWinEventHook (fora de processo).
+
+    O hook é instalado em uma thread própria, que mantém o laço de mensagens
+    exigido pelo Windows para entregar as notificações.
+    """
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    OBJID_WINDOW = 0
+    GA_ROOT = 2
+    WM_QUIT = 0x0012
+
+    _EVENT_KINDS = {
+        EVENT_SYSTEM_FOREGROUND: WINDOW_FOREGROUND,
+        EVENT_OBJECT_CREATE: WINDOW_CREATED,
+        EVENT_OBJECT_DESTROY: WINDOW_DESTROYED,
+        EVENT_OBJECT_SHOW: WINDOW_SHOWN,
+        EVENT_OBJECT_NAMECHANGE: WINDOW_RENAMED,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: Optional[int] = None
+        self._ready = threading.Event()
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Indica se a plataforma suporta WinEventHook."""
+        return sys.platform == "win32"
+
+    def start(self, process_id: int):
+        if self.active:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(process_id,), name="win-event-hook", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait(timeout=2)
+
+    def stop(self):
+        if self._thread_id is not None:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._thread_id = None
+        self.active = False
+
+    def _run(self, process_id: int):
+        """Instala os hooks e processa mensagens até receber WM_QUIT."""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+        ]
+        user32.GetAncestor.restype = wintypes.HWND
+        user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+
+        def _callback(hook, event, hwnd, id_object, id_child, thread, timestamp):
+            # Apenas as próprias janelas de nível superior
+            if not hwnd or id_object != self.OBJID_WINDOW or id_child != 0:
+                return
+            if event != self.EVENT_OBJECT_DESTROY and user32.GetAncestor(hwnd, self.GA_ROOT) != hwnd:
+                return
+            self._notify(WindowEvent(self._EVENT_KINDS.get(event, ""), hwnd))
+
+        # Manter referência ao callback enquanto o hook existir
+        proc = WinEventProc(_callback)
+        hooks = [
+            user32.SetWinEventHook(
+                self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND, None, proc,
+                process_id, 0, self.WINEVENT_OUTOFCONTEXT
+            ),
+            user32.SetWinEventHook(
+                self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_NAMECHANGE, None, proc,
+                process_id, 0, self.WINEVENT_OUTOFCONTEXT
+            ),
+        ]
+
+        self._thread_id = kernel32.GetCurrentThreadId()
+        self.active = all(hooks)
+        self._ready.set()
+
+        try:
+            if self.active:
+                msg = wintypes.MSG()
+                while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                    user32.TranslateMessage(ctypes.byref(msg))
+                    user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+            self.active = False
+
+
+def create_default_event_source() -> Optional[WindowEventSource]:
+    """
+    Cria a fonte de eventos da plataforma.
+
+    Returns:
+        Fonte de eventos ou None se não houver suporte (usa polling)
+    """
+    if WinEventHookSource.is_supported():
+        return WinEventHookSource()
+    return None
+
+
+class WindowWaiter:
+    """
+    Aguarda condições sobre as janelas, acordando a cada evento de janela.
+
+    Sem fonte de eventos ativa, a condição é verificada por polling. Com uma
+    fonte ativa, o polling continua apenas como salvaguarda, em intervalo longo.
+    """
+
+    def __init__(self, source: Optional[WindowEventSource] = None,
+                 poll_interval: float = 0.5, fallback_interval: float = 2.0):
+        """
+        Inicializa o aguardador.
+
+        Args:
+            source: Fonte de eventos de janela (opcional)
+            poll_interval: Intervalo de polling sem fonte de eventos
+            fallback_interval: Intervalo de verificação com fonte de eventos ativa
+        """
+        self.source = source
+        self.poll_interval = poll_interval
+        self.fallback_interval = fallback_interval
+        self._condition = threading.Condition()
+        self._generation = 0
+        if source is not None:
+            source.subscribe(self._on_event)
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        """
+        Aguarda a condição ser satisfeita.
+
+        Args:
+            predicate: Função verificada a cada evento (ou intervalo de polling)
+            timeout: Tempo máximo em segundos
+
+        Returns:
+            True se a condição foi satisfeita dentro do prazo
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                generation = self._generation
+
+            if predicate():
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            interval = self.fallback_interval if self._events_active() else self.poll_interval
+            with self._condition:
+                # Não dormir se chegou um evento durante a verificação
+                if self._generation == generation:
+                    self._condition.wait(min(interval, remaining))
+
+    def _events_active(self) -> bool:
+        return self.source is not None and self.source.active
+
+    def _on_event(self, event: WindowEvent):
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
@@ -0,0 +1,128 @@
+"""
+Registro das janelas de nível superior da aplicação.
+"""
+import re
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import win32gui
+    HAS_WIN32 = True
+except ImportError:
+    HAS_WIN32 = False
+
+
+class WindowRegistry:
+    """
+    Mantém as janelas de nível superior da aplicação indexadas por handle e título.
+
+    A enumeração (EnumWindows, barata) só é refeita quando um título não é
+    encontrado ou a entrada em cache deixou de ser válida.
+    """
+
+    def __init__(self, enumerate_windows: Callable[[], Iterable[Tuple[int, str]]]):
+        """
+        Inicializa o registro.
+
+        Args:
+            enumerate_windows: Função que lista (handle, título) das janelas da aplicação
+        """
+        self._enumerate_windows = enumerate_windows
+        self._titles: Dict[int, str] = {}
+        self._handles: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.refreshes = 0
+
+    def refresh(self):
+        """Atualiza o registro, adicionando, renomeando e removendo janelas."""
+        current = dict(self._enumerate_windows())
+        with self._lock:
+            self.refreshes += 1
+            for handle in list(self._titles):
+                if handle not in current:
+                    self._forget(handle)
+            for handle, title in current.items():
+                if self._titles.get(handle) != title:
+                    self._forget(handle)
+                    self._titles[handle] = title
+                    self._handles.setdefault(title, handle)
+
+    def find(self, title: str, refresh: bool = True) -> Optional[int]:
+        """
+        Localiza uma janela pelo título.
+
+        O título exato é resolvido diretamente no cache; caso contrário o título
+        é tratado como expressão regular buscada nos títulos conhecidos.
+
+        Args:
+            title: Título (ou expressão regular) da janela
+            refresh: Se True, reenumera as janelas quando não encontrar no cache
+
+        Returns:
+            Handle da janela ou None
+        """
+        handle = self._lookup(title)
+        if handle is not None and self._is_valid(handle):
+            return handle
+
+        if not refresh:
+            return None
+
+        self.refresh()
+        return self._lookup(title)
+
+    def clear(self):
+        """Descarta todas as janelas registradas."""
+        with self._lock:
+            self._titles.clear()
+            self._handles.clear()
+
+    @property
+    def windows(self) -> Dict[int, str]:
+        """Cópia do mapa handle -> título."""
+        with self._lock:
+            return dict(self._titles)
+
+    def _lookup(self, title: str) -> Optional[int]:
+        """
+        Busca no cache: exato e, em seguida, por expressão regular.
+
+        A expressão é ancorada no início do título (re.match), como o title_re do pywinauto.
+        """
+        with self._lock:
+            handle = self._handles.get(title)
+            if handle is not None:
+                return handle
+
+            try:
+                pattern = re.compile(title)
+            except re.error:
+                pattern = re.compile(re.escape(title))
+            for handle, window_title in self._titles.items():
+                if pattern.match(window_title):
+                    return handle
+        return None
+
+    def _forget(self, handle: int):
+        """Remove uma janela dos índices (chamar com o lock adquirido)."""
+        title = self._titles.pop(handle, None)
+        if title is not None and self._handles.get(title) == handle:
+            del self._handles[title]
+            # Outra janela com o mesmo título passa a ser a referência
+            for other, other_title in self._titles.items():
+                if other_title == title:
+                    self._handles[title] = other
+                    break
+
+    def _is_valid(self, handle: int) -> bool:
+        """Confirma que o handle em cache ainda existe e não foi renomeado."""
+        if not HAS_WIN32:
+            return True
+        try:
+            if not win32gui.IsWindow(handle):
+                return False
+            with self._lock:
+                cached_title = self._titles.get(handle)
+            return win32gui.GetWindowText(handle) == cached_title
+        except Exception:
+            return False
@@ -0,0 +1,169 @@
+"""
+Pool de workers para execução paralela de casos de teste.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from src.models.test_script import TestCase, TestSuite
+from src.core.app_manager import AppManager
+from src.core.screenshot_manager import ScreenshotManager
+from src.utils.logger import TestLogger
+
+try:
+    import pythoncom
+    HAS_PYTHONCOM = True
+except ImportError:
+    HAS_PYTHONCOM = False
+
+# Espera máxima pelos workers após Ctrl+C (o teste em andamento termina antes de parar)
+STOP_TIMEOUT = 30.0
+
+
+@dataclass
+class ScheduledTest:
+    """Caso de teste agendado para execução."""
+    suite_index: int
+    test_index: int
+    suite: TestSuite
+    test_case: TestCase
+
+
+@dataclass
+class WorkerContext:
+    """Recursos exclusivos de um worker (instância da aplicação, screenshots e logger)."""
+    worker_id: Optional[int]
+    app_manager: AppManager
+    screenshot_manager: ScreenshotManager
+    logger: TestLogger
+
+
+class TestScheduler:
+    """Distribui os casos de teste agendados entre os workers."""
+
+    def __init__(self, tests: List[ScheduledTest]):
+        """
+        Inicializa o agendador.
+
+        Args:
+            tests: Casos de teste na ordem em que devem ser distribuídos
+        """
+        self._queue: "queue.Queue[ScheduledTest]" = queue.Queue()
+        for test in tests:
+            self._queue.put(test)
+
+    def next_test(self) -> Optional[ScheduledTest]:
+        """
+        Retira o próximo caso de teste pendente.
+
+        Returns:
+            Próximo teste ou None se não houver mais testes
+        """
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    @property
+    def pending(self) -> int:
+        """Quantidade de testes ainda não distribuídos."""
+        return self._queue.qsize()
+
+
+class WorkerPool:
+    """Executa os testes do agendador em uma thread por worker."""
+
+    def __init__(self, contexts: List[WorkerContext], scheduler: TestScheduler,
+                 run_test: Callable[[WorkerContext, ScheduledTest], None],
+                 logger: TestLogger,
+                 on_error: Optional[Callable[[WorkerContext, ScheduledTest, Exception], None]] = None,
+                 stop_event: Optional[threading.Event] = None):
+        """
+        Inicializa o pool.
+
+        Args:
+            contexts: Contextos dos workers (um por instância da aplicação)
+            scheduler: Agendador com os testes a executar
+            run_test: Função que executa um teste no contexto de um worker
+            logger: Logger
+            on_error: Função chamada quando run_test levanta uma exceção, para que
+                o teste seja registrado com erro em vez de sumir do resultado (opcional)
+            stop_event: Evento que interrompe os workers, compartilhado com quem
+                registra os resultados (opcional)
+        """
+        self.contexts = contexts
+        self.scheduler = scheduler
+        self.run_test = run_test
+        self.logger = logger
+        self.on_error = on_error
+        self.stop_event = stop_event or threading.Event()
+
+    def run(self):
+        """
+        Executa todos os testes agendados e aguarda o término dos workers.
+
+        Com Ctrl+C, os workers param de pegar novos testes e o pool aguarda
+        (até STOP_TIMEOUT) os testes em andamento antes de repassar a
+        interrupção, para que as aplicações não sejam fechadas no meio deles.
+        """
+        threads = [
+            threading.Thread(
+                target=self._worker_loop,
+                args=(context,),
+                name=f"worker-{context.worker_id}",
+                daemon=True
+            )
+            for context in self.contexts
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                # join com timeout para que Ctrl+C seja atendido
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            # Os workers param de pegar novos testes
+            self.stop_event.set()
+            self.logger.warning("Aguardando os testes em andamento terminarem...")
+            deadline = time.monotonic() + STOP_TIMEOUT
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            raise
+
+    def _worker_loop(self, context: WorkerContext):
+        """
+        Laço de um worker: consome testes do agendador até esvaziar a fila.
+
+        Args:
+            context: Contexto do worker
+        """
+        # Cada thread precisa inicializar o COM para usar o backend UIA
+        if HAS_PYTHONCOM:
+            pythoncom.CoInitialize()
+        try:
+            while not self.stop_event.is_set():
+                scheduled = self.scheduler.next_test()
+                if scheduled is None:
+                    break
+                try:
+                    self.run_test(context, scheduled)
+                except Exception as e:
+                    context.logger.error(
+                        f"Erro inesperado no worker ao executar "
+                        f"'{scheduled.test_case.test_id}': {e}"
+                    )
+                    if self.on_error is not None:
+                        try:
+                            self.on_error(context, scheduled, e)
+                        except Exception as record_error:
+                            context.logger.error(
+                                f"Falha ao registrar o erro de '{scheduled.test_case.test_id}': "
+                                f"{record_error}"
+                            )
+        finally:
+            if HAS_PYTHONCOM:
+                pythoncom.CoUninitialize()
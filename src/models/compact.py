@@ -0,0 +1,124 @@
+"""
+Utilitários para modelos compactos (execuções com muitos resultados).
+"""
+import sys
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# __slots__ nas dataclasses (disponível a partir do Python 3.10)
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Âncora para converter o relógio monotônico em data/hora local
+_WALL_ANCHOR_NS = time.time_ns()
+_MONOTONIC_ANCHOR_NS = time.monotonic_ns()
+
+
+def monotonic_ns() -> int:
+    """Instante atual no relógio monotônico, em nanossegundos."""
+    return time.monotonic_ns()
+
+
+def ns_to_datetime(value: int) -> datetime:
+    """
+    Converte um instante monotônico (ns) em data/hora local.
+
+    Args:
+        value: Instante retornado por monotonic_ns()
+
+    Returns:
+        Data/hora correspondente
+    """
+    return datetime.fromtimestamp((_WALL_ANCHOR_NS + value - _MONOTONIC_ANCHOR_NS) / 1e9)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """
+    Converte uma data/hora no instante monotônico equivalente (ns).
+
+    Args:
+        value: Data/hora
+
+    Returns:
+        Instante no relógio monotônico desta execução
+    """
+    return _MONOTONIC_ANCHOR_NS + int(value.timestamp() * 1e9) - _WALL_ANCHOR_NS
+
+
+def intern_text(value: Optional[str]) -> Optional[str]:
+    """
+    Reaproveita uma única cópia de textos repetidos (tipos de ação, descrições).
+
+    Args:
+        value: Texto (ou None)
+
+    Returns:
+        Texto internado
+    """
+    if value is None:
+        return None
+    return sys.intern(value)
+
+
+class TimingColumns:
+    """
+    Tempos de execução armazenados em colunas (array), sem um objeto por registro.
+
+    Cada registro ocupa 17 bytes (início e fim em ns e o código do status),
+    em vez das centenas de bytes de um ActionResult.
+    """
+
+    def __init__(self):
+        self.start_ns = array('q')
+        self.end_ns = array('q')
+        self.status_codes = array('b')
+        self._statuses: List[str] = []
+        self._status_index: Dict[str, int] = {}
+
+    def append(self, start_ns: int, end_ns: int, status: str):
+        """
+        Acrescenta um registro.
+
+        Args:
+            start_ns: Início (monotonic_ns)
+            end_ns: Fim (monotonic_ns)
+            status: Status do resultado
+        """
+        code = self._status_index.get(status)
+        if code is None:
+            code = len(self._statuses)
+            self._statuses.append(status)
+            self._status_index[status] = code
+        self.start_ns.append(start_ns)
+        self.end_ns.append(end_ns)
+        self.status_codes.append(code)
+
+    def duration(self, index: int) -> float:
+        """Duração do registro, em segundos."""
+        return (self.end_ns[index] - self.start_ns[index]) / 1e9
+
+    def status(self, index: int) -> str:
+        """Status do registro."""
+        return self._statuses[self.status_codes[index]]
+
+    def total_duration(self) -> float:
+        """Soma das durações, em segundos."""
+        return (sum(self.end_ns) - sum(self.start_ns)) / 1e9
+
+    def max_duration(self) -> float:
+        """Maior duração, em segundos."""
+        if not self.start_ns:
+            return 0.0
+        return max(end - start for start, end in zip(self.start_ns, self.end_ns)) / 1e9
+
+    @property
+    def memory_used(self) -> int:
+        """Bytes ocupados pelas colunas."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.start_ns, self.end_ns, self.status_codes)
+        )
+
+    def __len__(self) -> int:
+        return len(self.start_ns)
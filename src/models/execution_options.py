@@ -0,0 +1,46 @@
+"""
+Opções de execução informadas na linha de comando.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+# Formatos de relatório
+REPORT_FORMATS = ("json", "jsonl")
+
+# Captura dos logs por teste
+LOG_CAPTURE_MODES = ("off", "failures", "all")
+
+
+@dataclass
+class ExecutionOptions:
+    """Configuração de uma execução do executor de testes."""
+    workers: int = 1
+    report_format: str = "json"
+    report_dir: str = "reports"
+    script_path: Optional[str] = None
+    checkpoint_dir: Optional[str] = "checkpoints"
+    resume_from: Optional[str] = None
+    order: str = "script"
+    history_path: Optional[str] = "history/history.db"
+    shard_index: Optional[int] = None
+    shard_count: int = 1
+    shard_durations: Optional[str] = None
+    log_capture: str = "failures"
+    log_buffer_size: int = 2000
+    trace_path: Optional[str] = None
+    profile: bool = False
+    profile_top: int = 15
+    metrics_port: Optional[int] = None
+    metrics_textfile: Optional[str] = None
+
+    def __post_init__(self):
+        if self.workers < 1:
+            raise ValueError("O número de workers deve ser maior ou igual a 1")
+        if self.report_format not in REPORT_FORMATS:
+            raise ValueError(f"Formato de relatório não suportado: '{self.report_format}'")
+        if self.log_capture not in LOG_CAPTURE_MODES:
+            raise ValueError(f"Modo de captura de logs não suportado: '{self.log_capture}'")
+        if self.shard_index is not None and not 1 <= self.shard_index <= self.shard_count:
+            raise ValueError("O shard deve estar entre 1 e a quantidade de shards")
+        if self.shard_durations and self.shard_index is None:
+            raise ValueError("--shard-durations requer --shard")
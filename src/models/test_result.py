@@ -3,9 +3,11 @@ Modelos para resultados de testes.
 """
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
 
+from src.models.compact import SLOTS, datetime_to_ns, intern_text, ns_to_datetime
+
 
 class TestStatus(Enum):
     """Status possíveis de um teste."""
@@ -17,18 +19,40 @@ class TestStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(**SLOTS)
 class ActionResult:
-    """Resultado da execução de uma ação."""
+    """
+    Resultado da execução de uma ação.
+    
+    Os instantes são guardados em nanossegundos do relógio monotônico
+    (compactos e imunes a ajustes do relógio); start_time, end_time e
+    duration são derivados deles.
+    """
     action_type: str
     description: str
     status: TestStatus
-    start_time: datetime
-    end_time: datetime
-    duration: float
+    start_ns: int
+    end_ns: int
     error_message: Optional[str] = None
     screenshot_path: Optional[str] = None
     read_value: Optional[str] = None
+    context_screenshots: Tuple[str, ...] = ()
+    capture_area: Optional[Dict[str, Any]] = None
+    
+    @property
+    def start_time(self) -> datetime:
+        """Horário de início."""
+        return ns_to_datetime(self.start_ns)
+    
+    @property
+    def end_time(self) -> datetime:
+        """Horário de término."""
+        return ns_to_datetime(self.end_ns)
+    
+    @property
+    def duration(self) -> float:
+        """Duração em segundos."""
+        return (self.end_ns - self.start_ns) / 1e9
     
     def to_dict(self) -> dict:
         """Converte para dicionário."""
@@ -41,21 +65,56 @@ class ActionResult:
             "duration": self.duration,
             "error_message": self.error_message,
             "screenshot_path": self.screenshot_path,
+            "context_screenshots": list(self.context_screenshots),
+            "capture_area": self.capture_area,
             "read_value": self.read_value
         }
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ActionResult':
+        """Cria uma instância a partir de um dicionário (inverso de to_dict)."""
+        return ActionResult(
+            action_type=intern_text(data["action_type"]),
+            description=intern_text(data["description"]),
+            status=TestStatus(data["status"]),
+            start_ns=datetime_to_ns(datetime.fromisoformat(data["start_time"])),
+            end_ns=datetime_to_ns(datetime.fromisoformat(data["end_time"])),
+            error_message=data.get("error_message"),
+            screenshot_path=data.get("screenshot_path"),
+            read_value=data.get("read_value"),
+            context_screenshots=tuple(data.get("context_screenshots", ())),
+            capture_area=data.get("capture_area")
+        )
 
 
-@dataclass
+@dataclass(**SLOTS)
 class TestCaseResult:
-    """Resultado da execução de um caso de teste."""
+    """Resultado da execução de um caso de teste (instantes em ns, como ActionResult)."""
     test_id: str
     test_name: str
     status: TestStatus
-    start_time: datetime
-    end_time: datetime
-    duration: float
+    start_ns: int
+    end_ns: int
     action_results: List[ActionResult] = field(default_factory=list)
     error_message: Optional[str] = None
+    focus_time: float = 0.0
+    log_ref: Optional[Dict[str, Any]] = None
+    error_screenshots: Tuple[str, ...] = ()
+    
+    @property
+    def start_time(self) -> datetime:
+        """Horário de início."""
+        return ns_to_datetime(self.start_ns)
+    
+    @property
+    def end_time(self) -> datetime:
+        """Horário de término."""
+        return ns_to_datetime(self.end_ns)
+    
+    @property
+    def duration(self) -> float:
+        """Duração em segundos."""
+        return (self.end_ns - self.start_ns) / 1e9
     
     def to_dict(self) -> dict:
         """Converte para dicionário."""
@@ -66,9 +125,72 @@ class TestCaseResult:
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat(),
             "duration": self.duration,
+            "focus_time": self.focus_time,
             "action_results": [ar.to_dict() for ar in self.action_results],
-            "error_message": self.error_message
+            "error_message": self.error_message,
+            "error_screenshots": list(self.error_screenshots),
+            "log_ref": self.log_ref
         }
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'TestCaseResult':
+        """Cria uma instância a partir de um dicionário (inverso de to_dict)."""
+        return TestCaseResult(
+            test_id=intern_text(data["test_id"]),
+            test_name=intern_text(data["test_name"]),
+            status=TestStatus(data["status"]),
+            start_ns=datetime_to_ns(datetime.fromisoformat(data["start_time"])),
+            end_ns=datetime_to_ns(datetime.fromisoformat(data["end_time"])),
+            action_results=[ActionResult.from_dict(ar) for ar in data.get("action_results", [])],
+            error_message=data.get("error_message"),
+            focus_time=data.get("focus_time", 0.0),
+            log_ref=data.get("log_ref"),
+            error_screenshots=tuple(data.get("error_screenshots", ()))
+        )
+
+
+@dataclass
+class StatusCounts:
+    """Contadores de testes por status, atualizados a cada resultado adicionado."""
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    error: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+    
+    def add(self, status: TestStatus, duration: float = 0.0):
+        """
+        Contabiliza um resultado.
+        
+        Args:
+            status: Status do teste
+            duration: Duração do teste em segundos
+        """
+        self.total += 1
+        self.duration += duration or 0.0
+        if status == TestStatus.PASSED:
+            self.passed += 1
+        elif status == TestStatus.FAILED:
+            self.failed += 1
+        elif status == TestStatus.ERROR:
+            self.error += 1
+        elif status == TestStatus.SKIPPED:
+            self.skipped += 1
+    
+    def merge(self, other: 'StatusCounts'):
+        """
+        Soma os contadores de outro agregado.
+        
+        Args:
+            other: Contadores a somar
+        """
+        self.total += other.total
+        self.passed += other.passed
+        self.failed += other.failed
+        self.error += other.error
+        self.skipped += other.skipped
+        self.duration += other.duration
 
 
 @dataclass
@@ -79,26 +201,41 @@ class TestSuiteResult:
     end_time: datetime
     duration: float
     test_results: List[TestCaseResult] = field(default_factory=list)
+    counts: StatusCounts = field(default_factory=StatusCounts, init=False, repr=False)
+    
+    def __post_init__(self):
+        for test_result in self.test_results:
+            self.counts.add(test_result.status, test_result.duration)
+    
+    def add_test_result(self, test_result: TestCaseResult):
+        """
+        Adiciona o resultado de um teste, atualizando os contadores.
+        
+        Args:
+            test_result: Resultado do teste
+        """
+        self.test_results.append(test_result)
+        self.counts.add(test_result.status, test_result.duration)
     
     @property
     def total_tests(self) -> int:
         """Total de testes executados."""
-        return len(self.test_results)
+        return self.counts.total
     
     @property
     def passed_tests(self) -> int:
         """Total de testes aprovados."""
-        return sum(1 for tr in self.test_results if tr.status == TestStatus.PASSED)
+        return self.counts.passed
     
     @property
     def failed_tests(self) -> int:
         """Total de testes reprovados."""
-        return sum(1 for tr in self.test_results if tr.status == TestStatus.FAILED)
+        return self.counts.failed
     
     @property
     def error_tests(self) -> int:
         """Total de testes com erro."""
-        return sum(1 for tr in self.test_results if tr.status == TestStatus.ERROR)
+        return self.counts.error
     
     def to_dict(self) -> dict:
         """Converte para dicionário."""
@@ -113,6 +250,17 @@ class TestSuiteResult:
             "error_tests": self.error_tests,
             "test_results": [tr.to_dict() for tr in self.test_results]
         }
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'TestSuiteResult':
+        """Cria uma instância a partir de um dicionário (inverso de to_dict)."""
+        return TestSuiteResult(
+            suite_name=data["suite_name"],
+            start_time=datetime.fromisoformat(data["start_time"]),
+            end_time=datetime.fromisoformat(data["end_time"]),
+            duration=data["duration"],
+            test_results=[TestCaseResult.from_dict(tr) for tr in data.get("test_results", [])]
+        )
 
 
 @dataclass
@@ -123,26 +271,47 @@ class TestExecutionResult:
     end_time: datetime
     duration: float
     suite_results: List[TestSuiteResult] = field(default_factory=list)
+    startup_latency: Optional[float] = None
+    locator_cache: Optional[Dict[str, int]] = None
+    screenshot_failures: List[Dict[str, str]] = field(default_factory=list)
+    interrupted: bool = False
+    resumed_from: Optional[str] = None
+    shard: Optional[Dict[str, Any]] = None
+    counts: StatusCounts = field(default_factory=StatusCounts, init=False, repr=False)
+    
+    def __post_init__(self):
+        for suite_result in self.suite_results:
+            self.counts.merge(suite_result.counts)
+    
+    def add_suite_result(self, suite_result: TestSuiteResult):
+        """
+        Adiciona o resultado (completo) de uma suíte, atualizando os contadores.
+        
+        Args:
+            suite_result: Resultado da suíte
+        """
+        self.suite_results.append(suite_result)
+        self.counts.merge(suite_result.counts)
     
     @property
     def total_tests(self) -> int:
         """Total de testes executados."""
-        return sum(suite.total_tests for suite in self.suite_results)
+        return self.counts.total
     
     @property
     def passed_tests(self) -> int:
         """Total de testes aprovados."""
-        return sum(suite.passed_tests for suite in self.suite_results)
+        return self.counts.passed
     
     @property
     def failed_tests(self) -> int:
         """Total de testes reprovados."""
-        return sum(suite.failed_tests for suite in self.suite_results)
+        return self.counts.failed
     
     @property
     def error_tests(self) -> int:
         """Total de testes com erro."""
-        return sum(suite.error_tests for suite in self.suite_results)
+        return self.counts.error
     
     @property
     def success_rate(self) -> float:
@@ -163,5 +332,28 @@ class TestExecutionResult:
             "failed_tests": self.failed_tests,
             "error_tests": self.error_tests,
             "success_rate": self.success_rate,
+            "startup_latency": self.startup_latency,
+            "locator_cache": self.locator_cache,
+            "screenshot_failures": self.screenshot_failures,
+            "interrupted": self.interrupted,
+            "resumed_from": self.resumed_from,
+            "shard": self.shard,
             "suite_results": [sr.to_dict() for sr in self.suite_results]
         }
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'TestExecutionResult':
+        """Cria uma instância a partir de um dicionário (inverso de to_dict)."""
+        return TestExecutionResult(
+            application_name=data["application_name"],
+            start_time=datetime.fromisoformat(data["start_time"]),
+            end_time=datetime.fromisoformat(data["end_time"]),
+            duration=data["duration"],
+            suite_results=[TestSuiteResult.from_dict(sr) for sr in data.get("suite_results", [])],
+            startup_latency=data.get("startup_latency"),
+            locator_cache=data.get("locator_cache"),
+            screenshot_failures=data.get("screenshot_failures", []),
+            interrupted=data.get("interrupted", False),
+            resumed_from=data.get("resumed_from"),
+            shard=data.get("shard")
+        )
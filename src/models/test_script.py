@@ -1,9 +1,34 @@
 """
 Modelos para scripts de teste.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Any, Dict
 
+from src.models.compact import SLOTS, intern_text
+
+
+@dataclass
+class ReadyCondition:
+    """Condição que indica que a aplicação terminou de iniciar."""
+    window_title: Optional[str] = None
+    control: Optional[str] = None
+    enabled: bool = False
+    timeout: float = 30
+    poll_interval: float = 0.1
+    max_poll_interval: float = 1.0
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ReadyCondition':
+        """Cria uma instância a partir de um dicionário."""
+        return ReadyCondition(
+            window_title=data.get("window_title"),
+            control=data.get("control"),
+            enabled=data.get("enabled", False),
+            timeout=data.get("timeout", 30),
+            poll_interval=data.get("poll_interval", 0.1),
+            max_poll_interval=data.get("max_poll_interval", 1.0)
+        )
+
 
 @dataclass
 class Application:
@@ -14,6 +39,7 @@ class Application:
     startup_delay: int = 3
     backend: str = "uia"
     timeout: int = 10
+    ready: Optional[ReadyCondition] = None
     
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Application':
@@ -24,11 +50,107 @@ class Application:
             arguments=data.get("arguments", ""),
             startup_delay=data.get("startup_delay", 3),
             backend=data.get("backend", "uia"),
-            timeout=data.get("timeout", 10)
+            timeout=data.get("timeout", 10),
+            ready=ReadyCondition.from_dict(data["ready"]) if data.get("ready") else None
         )
 
 
 @dataclass
+class RingBufferSettings:
+    """Buffer em memória com os últimos screenshots antes de uma falha."""
+    frames: int = 10
+    memory_mb: float = 32
+    scale: float = 0.5
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'RingBufferSettings':
+        """Cria uma instância a partir de um dicionário."""
+        return RingBufferSettings(
+            frames=data.get("frames", 10),
+            memory_mb=data.get("memory_mb", 32),
+            scale=data.get("scale", 0.5)
+        )
+
+
+@dataclass
+class ScreenshotEncoding:
+    """Formato e compressão dos arquivos de screenshot."""
+    format: str = "png"
+    compress_level: int = 6
+    quality: int = 80
+    grayscale: bool = False
+    max_dimension: Optional[int] = None
+    
+    def __post_init__(self):
+        self.format = self.format.lower()
+        if self.format == "jpg":
+            self.format = "jpeg"
+        if self.format not in ("png", "webp", "jpeg"):
+            raise ValueError(f"Formato de screenshot não suportado: '{self.format}'")
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ScreenshotEncoding':
+        """Cria uma instância a partir de um dicionário."""
+        return ScreenshotEncoding(
+            format=data.get("format", "png"),
+            compress_level=data.get("compress_level", 6),
+            quality=data.get("quality", 80),
+            grayscale=data.get("grayscale", False),
+            max_dimension=data.get("max_dimension")
+        )
+
+
+@dataclass
+class RetentionSettings:
+    """Limites de espaço ocupado pelos screenshots de execuções anteriores."""
+    max_size_mb: Optional[float] = None
+    max_age_days: Optional[float] = None
+    keep_runs: Optional[int] = None
+    protect_reports: int = 10
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'RetentionSettings':
+        """Cria uma instância a partir de um dicionário."""
+        return RetentionSettings(
+            max_size_mb=data.get("max_size_mb"),
+            max_age_days=data.get("max_age_days"),
+            keep_runs=data.get("keep_runs"),
+            protect_reports=data.get("protect_reports", 10)
+        )
+
+
+@dataclass
+class ScreenshotSettings:
+    """Configuração de screenshots da execução."""
+    ring_buffer: Optional[RingBufferSettings] = None
+    capture: str = "window"
+    capture_padding: int = 0
+    dedupe: bool = False
+    near_duplicate_threshold: Optional[int] = None
+    encoding: ScreenshotEncoding = field(default_factory=ScreenshotEncoding)
+    retention: Optional[RetentionSettings] = None
+    
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'ScreenshotSettings':
+        """Cria uma instância a partir de um dicionário."""
+        return ScreenshotSettings(
+            ring_buffer=(
+                RingBufferSettings.from_dict(data["ring_buffer"])
+                if data.get("ring_buffer") else None
+            ),
+            capture=data.get("capture", "window"),
+            capture_padding=data.get("capture_padding", 0),
+            dedupe=data.get("dedupe", False),
+            near_duplicate_threshold=data.get("near_duplicate_threshold"),
+            encoding=ScreenshotEncoding.from_dict(data.get("encoding", {})),
+            retention=(
+                RetentionSettings.from_dict(data["retention"])
+                if data.get("retention") else None
+            )
+        )
+
+
+@dataclass(**SLOTS)
 class Action:
     """Ação a ser executada no teste."""
     action_type: str
@@ -43,27 +165,36 @@ class Action:
     screenshot_on_failure: bool = True
     continue_on_failure: bool = False
     file_worker: Optional[str] = None
+    capture: Optional[str] = None
+    capture_padding: Optional[int] = None
+    screenshot_encoding: Optional[ScreenshotEncoding] = None
     
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Action':
         """Cria uma instância a partir de um dicionário."""
         return Action(
-            action_type=data["type"],
-            description=data["description"],
-            class_type=data.get("class"),
-            control=data.get("control"),
-            window_title=data.get("window_title"),
+            action_type=intern_text(data["type"]),
+            description=intern_text(data["description"]),
+            class_type=intern_text(data.get("class")),
+            control=intern_text(data.get("control")),
+            window_title=intern_text(data.get("window_title")),
             value=data.get("value"),
             duration=data.get("duration"),
             timeout=data.get("timeout"),
             screenshot_on_success=data.get("screenshot_on_success", False),
             screenshot_on_failure=data.get("screenshot_on_failure", True),
             continue_on_failure=data.get("continue_on_failure", False),
-            file_worker=data.get("file_worker")
+            file_worker=data.get("file_worker"),
+            capture=data.get("capture"),
+            capture_padding=data.get("capture_padding"),
+            screenshot_encoding=(
+                ScreenshotEncoding.from_dict(data["screenshot_encoding"])
+                if data.get("screenshot_encoding") else None
+            )
         )
 
 
-@dataclass
+@dataclass(**SLOTS)
 class TestCase:
     """Caso de teste."""
     test_id: str
@@ -82,8 +213,8 @@ class TestCase:
         """Cria uma instância a partir de um dicionário."""
         return TestCase(
             test_id=data["id"],
-            name=data["name"],
-            description=data["description"],
+            name=intern_text(data["name"]),
+            description=intern_text(data["description"]),
             actions=[Action.from_dict(a) for a in data["actions"]],
             enabled=data.get("enabled", True),
             tags=data.get("tags", [])
@@ -113,6 +244,7 @@ class TestScript:
     version: str
     application: Application
     test_suites: List[TestSuite]
+    screenshots: ScreenshotSettings = field(default_factory=ScreenshotSettings)
     
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'TestScript':
@@ -120,5 +252,6 @@ class TestScript:
         return TestScript(
             version=data["version"],
             application=Application.from_dict(data["application"]),
-            test_suites=[TestSuite.from_dict(ts) for ts in data["test_suites"]]
+            test_suites=[TestSuite.from_dict(ts) for ts in data["test_suites"]],
+            screenshots=ScreenshotSettings.from_dict(data.get("screenshots", {}))
         )
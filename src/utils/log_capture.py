@@ -0,0 +1,191 @@
+"""
+Captura estruturada (JSON Lines) dos logs de cada caso de teste.
+"""
+import contextvars
+import json
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+# Modos de captura
+CAPTURE_OFF = "off"
+CAPTURE_FAILURES = "failures"
+CAPTURE_ALL = "all"
+CAPTURE_MODES = (CAPTURE_OFF, CAPTURE_FAILURES, CAPTURE_ALL)
+
+_current: contextvars.ContextVar[Optional['TestLogContext']] = contextvars.ContextVar(
+    "test_log_context", default=None
+)
+
+
+class TestLogContext:
+    """Teste em execução na thread atual e os registros de log guardados para ele."""
+
+    __slots__ = ("suite", "test_id", "action_index", "records", "dropped")
+
+    def __init__(self, suite: str, test_id: str, max_records: int):
+        self.suite = suite
+        self.test_id = test_id
+        self.action_index: Optional[int] = None
+        self.records: Deque[logging.LogRecord] = deque(maxlen=max_records)
+        self.dropped = 0
+
+
+@contextmanager
+def test_log_context(suite: str, test_id: str, max_records: int = 2000) -> Iterator[TestLogContext]:
+    """
+    Associa os logs emitidos na thread atual a um caso de teste.
+
+    Args:
+        suite: Nome da suíte
+        test_id: ID do teste
+        max_records: Registros guardados por teste (os mais antigos são descartados)
+
+    Yields:
+        Contexto do teste
+    """
+    context = TestLogContext(suite, test_id, max_records)
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
+
+
+def set_action_index(index: Optional[int]):
+    """
+    Informa a ação em execução no teste atual (posição a partir de 1).
+
+    Args:
+        index: Posição da ação, ou None fora de uma ação
+    """
+    context = _current.get()
+    if context is not None:
+        context.action_index = index
+
+
+class TestContextFilter(logging.Filter):
+    """
+    Acrescenta suite, test_id e action_index a cada registro.
+
+    Deve ficar no logger (e não em um handler) para rodar na thread que emite
+    o log, onde o contexto do teste está definido.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _current.get()
+        record.test_context = context
+        record.suite = context.suite if context else None
+        record.test_id = context.test_id if context else None
+        record.action_index = context.action_index if context else None
+        return True
+
+
+class TestLogCapture(logging.Handler):
+    """
+    Guarda em memória os logs de cada teste e grava o trecho em um único arquivo JSON Lines.
+
+    O buffer de cada teste é limitado; ao final do teste, os registros são
+    gravados (somente em falhas, ou sempre) e o resultado do teste recebe a
+    referência {path, offset, length, records, dropped} do trecho gravado.
+    """
+
+    def __init__(self, path: Path, mode: str = CAPTURE_FAILURES):
+        """
+        Inicializa a captura.
+
+        Args:
+            path: Arquivo JSON Lines com os logs dos testes
+            mode: failures (grava só testes reprovados/com erro) ou all
+        """
+        super().__init__(logging.DEBUG)
+        self.setFormatter(logging.Formatter())
+        if mode not in (CAPTURE_FAILURES, CAPTURE_ALL):
+            raise ValueError(f"Modo de captura de logs inválido: '{mode}'")
+        self.path = Path(path)
+        self.mode = mode
+        self._file = None
+        self._write_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord):
+        # Apenas guarda o registro; a formatação só ocorre se o trecho for gravado
+        context = getattr(record, "test_context", None)
+        if context is None:
+            return
+        if len(context.records) == context.records.maxlen:
+            context.dropped += 1
+        context.records.append(record)
+
+    def finish(self, context: TestLogContext, failed: bool) -> Optional[Dict[str, Any]]:
+        """
+        Grava os logs de um teste encerrado, conforme o modo.
+
+        Args:
+            context: Contexto do teste
+            failed: True se o teste foi reprovado ou terminou com erro
+
+        Returns:
+            Referência ao trecho gravado, ou None se nada foi gravado
+        """
+        records = list(context.records)
+        context.records.clear()
+        if not records or (self.mode == CAPTURE_FAILURES and not failed):
+            return None
+
+        data = "".join(self._format_line(record) for record in records).encode("utf-8")
+        with self._write_lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "ab")
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+
+        return {
+            "path": str(self.path),
+            "offset": offset,
+            "length": len(data),
+            "records": len(records),
+            "dropped": context.dropped,
+        }
+
+    def close(self):
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        super().close()
+
+    def _format_line(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "suite": record.suite,
+            "test_id": record.test_id,
+            "action": record.action_index,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatter.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False) + "\n"
+
+
+def read_test_log(log_ref: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Lê os logs de um teste a partir da referência gravada no resultado.
+
+    Args:
+        log_ref: Referência do resultado (TestCaseResult.log_ref)
+
+    Returns:
+        Registros do teste
+    """
+    with open(log_ref["path"], "rb") as f:
+        f.seek(log_ref["offset"])
+        data = f.read(log_ref["length"])
+    return [json.loads(line) for line in data.decode("utf-8").splitlines() if line]
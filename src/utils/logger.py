@@ -1,32 +1,88 @@
 """
 Módulo responsável pela configuração e gerenciamento de logs.
 """
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
 import colorlog
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata a mensagem na thread que registra o log.
+
+    O QueueHandler padrão formata o registro antes de enfileirá-lo (para
+    permitir filas entre processos). Aqui a fila é interna ao processo, então
+    a interpolação dos argumentos e a formatação ficam para a thread do
+    listener. Os argumentos não devem ser alterados depois de registrados.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 class TestLogger:
-    """Gerenciador de logs com suporte a cores e arquivo."""
-    
-    def __init__(self, log_dir: str = "logs"):
+    """
+    Gerenciador de logs com suporte a cores e arquivo.
+
+    No modo em fila (padrão), os registros são colocados em uma fila em
+    memória e uma thread em segundo plano os escreve no console e no arquivo;
+    a thread de teste não espera pela formatação nem pela escrita em disco.
+
+    Os métodos aceitam argumentos no estilo do logging (``logger.debug("x=%s", x)``),
+    interpolados apenas se o nível estiver habilitado.
+    """
+
+    # O logger "TestAutomation" é global; o listener também
+    _listener: Optional[logging.handlers.QueueListener] = None
+
+    def __init__(self, log_dir: str = "logs", level: int = logging.DEBUG, queued: bool = True):
+        """
+        Inicializa o logger.
+
+        Args:
+            log_dir: Diretório dos arquivos de log
+            level: Nível mínimo registrado (mensagens abaixo dele são descartadas na origem)
+            queued: Escreve os logs em uma thread em segundo plano
+        """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.prefix = ""
+        self.level = level
+        self.queued = queued
         self.logger = self._setup_logger()
-    
+
+    def for_worker(self, worker_id: int) -> 'TestLogger':
+        """
+        Cria um logger que compartilha os handlers deste, mas identifica o worker.
+
+        Args:
+            worker_id: Identificador do worker
+
+        Returns:
+            Logger com prefixo do worker
+        """
+        worker_logger = copy.copy(self)
+        worker_logger.prefix = f"[W{worker_id}] "
+        return worker_logger
+
     def _setup_logger(self) -> logging.Logger:
         """Configura o logger com handlers de console e arquivo."""
         logger = logging.getLogger("TestAutomation")
-        logger.setLevel(logging.DEBUG)
-        
+        logger.setLevel(self.level)
+
         # Evitar duplicação de handlers
         if logger.handlers:
             return logger
-        
+
         # Handler de console com cores
         console_handler = colorlog.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+        console_handler.setLevel(max(logging.INFO, self.level))
         console_format = colorlog.ColoredFormatter(
             "%(log_color)s%(asctime)s - %(levelname)-8s%(reset)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
@@ -39,38 +95,85 @@ class TestLogger:
             }
         )
         console_handler.setFormatter(console_format)
-        
+
         # Handler de arquivo
         log_file = self.log_dir / f"test_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
+        file_handler.setLevel(self.level)
         file_format = logging.Formatter(
             "%(asctime)s - %(levelname)-8s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         file_handler.setFormatter(file_format)
-        
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
-        
+
+        if not self.queued:
+            logger.addHandler(console_handler)
+            logger.addHandler(file_handler)
+            return logger
+
+        # Fila sem limite: registrar um log nunca bloqueia a thread de teste
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        TestLogger._listener = listener
+        atexit.register(TestLogger.close)
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+
         return logger
-    
-    def info(self, message: str):
+
+    @staticmethod
+    def close():
+        """
+        Escreve os logs pendentes e encerra a thread de escrita (modo em fila).
+
+        Os handlers de console e arquivo passam a ser chamados diretamente, de
+        modo que logs registrados depois disso não se perdem.
+        """
+        listener = TestLogger._listener
+        if listener is None:
+            return
+        TestLogger._listener = None
+        listener.stop()
+
+        logger = logging.getLogger("TestAutomation")
+        for handler in list(logger.handlers):
+            if isinstance(handler, _DeferredQueueHandler):
+                logger.removeHandler(handler)
+        for handler in listener.handlers:
+            logger.addHandler(handler)
+
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Indica se mensagens do nível informado serão registradas.
+
+        Útil para evitar montar mensagens de debug caras quando o nível está desabilitado.
+
+        Args:
+            level: Nível do logging (ex.: logging.DEBUG)
+
+        Returns:
+            True se o nível estiver habilitado
+        """
+        return self.logger.isEnabledFor(level)
+
+    def info(self, message: str, *args):
         """Log de informação."""
-        self.logger.info(message)
-    
-    def debug(self, message: str):
+        self.logger.info(self.prefix + message, *args)
+
+    def debug(self, message: str, *args):
         """Log de debug."""
-        self.logger.debug(message)
-    
-    def warning(self, message: str):
+        self.logger.debug(self.prefix + message, *args)
+
+    def warning(self, message: str, *args):
         """Log de aviso."""
-        self.logger.warning(message)
-    
-    def error(self, message: str):
+        self.logger.warning(self.prefix + message, *args)
+
+    def error(self, message: str, *args):
         """Log de erro."""
-        self.logger.error(message)
-    
-    def critical(self, message: str):
+        self.logger.error(self.prefix + message, *args)
+
+    def critical(self, message: str, *args):
         """Log crítico."""
-        self.logger.critical(message)
+        self.logger.critical(self.prefix + message, *args)
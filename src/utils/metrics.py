@@ -0,0 +1,325 @@
+"""
+Métricas da execução no formato de texto do Prometheus.
+
+As métricas são desligadas por padrão (``get_metrics()`` retorna None) e os
+pontos instrumentados não fazem nada. Com métricas ativas (``set_metrics``),
+os valores são atualizados durante a execução e publicados por um endpoint
+HTTP (/metrics) e/ou por um arquivo para o textfile collector do node_exporter.
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Limites dos histogramas de duração (segundos)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base das métricas: nome, descrição, rótulos e trava."""
+
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> List[str]:
+        """Linhas da métrica no formato de texto do Prometheus."""
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Contador crescente, opcionalmente por rótulos."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not self.labels:
+            # Sem rótulos, a série existe (com zero) desde o início
+            self._values[()] = 0
+
+    def inc(self, amount: float = 1, **labels):
+        """
+        Incrementa o contador.
+
+        Args:
+            amount: Valor somado
+            **labels: Valores dos rótulos
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Valor que pode subir e descer."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        """
+        Define o valor.
+
+        Args:
+            value: Novo valor
+            **labels: Valores dos rótulos
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribuição de valores em faixas cumulativas (le), com soma e quantidade."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        """
+        Registra um valor.
+
+        Args:
+            value: Valor observado
+            **labels: Valores dos rótulos
+        """
+        key = self._key(labels)
+        with self._lock:
+            # [contagem por faixa..., soma, quantidade]
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _format_labels(self.labels, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labels, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class ExecutionMetrics:
+    """Métricas publicadas durante uma execução de testes."""
+
+    def __init__(self):
+        self.tests = Counter(
+            "test_automation_tests_total", "Casos de teste concluídos por status", ("status",)
+        )
+        self.tests_planned = Gauge(
+            "test_automation_tests_planned", "Casos de teste planejados na execução"
+        )
+        self.actions = Counter(
+            "test_automation_actions_total", "Ações executadas por tipo e status",
+            ("action_type", "status")
+        )
+        self.action_duration = Histogram(
+            "test_automation_action_duration_seconds", "Duração das ações por tipo",
+            ("action_type",)
+        )
+        self.wait_seconds = Counter(
+            "test_automation_wait_seconds_total",
+            "Tempo em esperas por controles (control_wait) e pausas fixas (sleep)", ("kind",)
+        )
+        self.screenshot_bytes = Counter(
+            "test_automation_screenshot_bytes_total", "Bytes de screenshots gravados em disco"
+        )
+        self.app_starts = Counter(
+            "test_automation_app_starts_total", "Inicializações da aplicação"
+        )
+        self._metrics = [
+            self.tests, self.tests_planned, self.actions, self.action_duration,
+            self.wait_seconds, self.screenshot_bytes, self.app_starts,
+        ]
+
+    def render(self) -> str:
+        """
+        Gera o texto no formato de exposição do Prometheus.
+
+        Returns:
+            Texto com todas as métricas
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """
+        Grava as métricas para o textfile collector (troca atômica do arquivo).
+
+        Args:
+            path: Arquivo .prom
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(target.name + ".tmp")
+        temporary.write_text(self.render(), encoding="utf-8")
+        os.replace(temporary, target)
+
+
+class MetricsPublisher:
+    """
+    Publica as métricas por HTTP e/ou por arquivo enquanto a execução acontece.
+    """
+
+    def __init__(self, metrics: ExecutionMetrics, port: Optional[int] = None,
+                 textfile: Optional[str] = None, interval: float = 10.0,
+                 host: str = "127.0.0.1"):
+        """
+        Inicializa o publicador.
+
+        Args:
+            metrics: Métricas da execução
+            port: Porta do endpoint HTTP /metrics (None = sem endpoint)
+            textfile: Arquivo .prom atualizado periodicamente (None = sem arquivo)
+            interval: Intervalo de atualização do arquivo em segundos
+            host: Endereço do endpoint HTTP
+        """
+        self.metrics = metrics
+        self.port = port
+        self.textfile = textfile
+        self.interval = interval
+        self.host = host
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """
+        Inicia o endpoint HTTP e a atualização do arquivo.
+
+        Se o arquivo não puder ser gravado, o endpoint já iniciado é encerrado
+        antes de repassar o erro.
+        """
+        if self.port is not None:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+            self._server.daemon_threads = True
+            self._start_thread(self._server.serve_forever, "metrics-http")
+        if self.textfile:
+            try:
+                self.metrics.write_textfile(self.textfile)
+            except Exception:
+                self._stop_server()
+                raise
+            self._start_thread(self._write_periodically, "metrics-textfile")
+
+    def stop(self):
+        """Grava o arquivo uma última vez e encerra as threads."""
+        self._stop_server()
+        if self.textfile:
+            self.metrics.write_textfile(self.textfile)
+
+    def _stop_server(self):
+        """Encerra o endpoint HTTP e aguarda as threads."""
+        self._stop_event.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def _start_thread(self, target, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _write_periodically(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.metrics.write_textfile(self.textfile)
+            except OSError:
+                pass
+
+    def _handler_class(self):
+        metrics = self.metrics
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Sem log de acesso no console
+                pass
+
+        return _MetricsHandler
+
+
+_metrics: Optional[ExecutionMetrics] = None
+
+
+def set_metrics(metrics: Optional[ExecutionMetrics]):
+    """
+    Ativa (ou desativa, com None) as métricas globais.
+
+    Args:
+        metrics: Métricas que recebem as atualizações
+    """
+    global _metrics
+    _metrics = metrics
+
+
+def get_metrics() -> Optional[ExecutionMetrics]:
+    """Métricas ativas (None quando desligadas)."""
+    return _metrics
@@ -0,0 +1,115 @@
+"""
+Perfil (cProfile) de cada caso de teste, com as funções mais custosas da execução.
+"""
+import cProfile
+import pstats
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+
+@dataclass
+class HotFunction:
+    """Função com o tempo gasto nela somado em todos os testes."""
+    function: str
+    calls: int
+    own_time: float
+    cumulative_time: float
+
+
+class RunProfiler:
+    """
+    Executa cada teste sob o cProfile e soma os perfis da execução.
+
+    O cProfile mede apenas a thread que o habilitou, então cada worker tem o
+    seu perfil. A partir do Python 3.12 só um perfil pode estar ativo por
+    vez no processo: com vários workers, os testes iniciados enquanto outro
+    está sendo medido ficam sem perfil (contados em ``skipped``).
+    """
+
+    def __init__(self):
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+        self.profiled = 0
+        self.skipped = 0
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """
+        Começa a medir a thread atual.
+
+        Returns:
+            Perfil em andamento, ou None se outro perfil já estiver ativo
+        """
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            with self._lock:
+                self.skipped += 1
+            return None
+        return profiler
+
+    def stop(self, profiler: cProfile.Profile, path: Optional[Path]) -> Optional[Path]:
+        """
+        Encerra a medição, grava o perfil do teste e o soma ao da execução.
+
+        Args:
+            profiler: Perfil retornado por start
+            path: Arquivo do perfil (abre com pstats ou snakeviz); None não grava
+
+        Returns:
+            Caminho gravado, ou None
+        """
+        profiler.disable()
+        written = None
+        if path is not None:
+            try:
+                profiler.dump_stats(str(path))
+                written = path
+            except OSError:
+                written = None
+
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profiler)
+            else:
+                self._stats.add(profiler)
+            self.profiled += 1
+        return written
+
+    def hottest(self, limit: int = 15) -> List[HotFunction]:
+        """
+        Funções com maior tempo próprio somado em todos os testes.
+
+        Args:
+            limit: Quantidade de funções
+
+        Returns:
+            Funções, da mais custosa para a menos custosa
+        """
+        with self._lock:
+            if self._stats is None:
+                return []
+            entries = list(self._stats.stats.items())
+
+        entries.sort(key=lambda entry: -entry[1][2])
+        return [
+            HotFunction(
+                function=_describe(function),
+                calls=calls,
+                own_time=own_time,
+                cumulative_time=cumulative_time
+            )
+            for function, (_, calls, own_time, cumulative_time, _) in entries[:limit]
+        ]
+
+
+def _describe(function) -> str:
+    """Formata (arquivo, linha, nome) como 'arquivo:linha(nome)', com caminhos curtos."""
+    filename, line, name = function
+    if filename == "~":
+        # Funções embutidas (ex.: <built-in method time.sleep>)
+        return name
+    parts = Path(filename).parts
+    return f"{'/'.join(parts[-2:])}:{line}({name})"
@@ -0,0 +1,210 @@
+"""
+Rastreamento das fases de execução (spans) exportável como Chrome trace.
+
+O rastreamento é desligado por padrão: ``span()`` devolve um contexto vazio
+compartilhado e não mede nada. Com um Tracer ativo (``set_tracer``), cada
+span registra início e duração (time.perf_counter_ns) e a thread de origem.
+O arquivo exportado abre em chrome://tracing ou https://ui.perfetto.dev.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_NO_SPAN = nullcontext()
+
+
+@dataclass
+class PhaseStats:
+    """Totais de uma fase (spans com o mesmo nome)."""
+    count: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+
+
+class _Span:
+    """Span em andamento (usado como gerenciador de contexto)."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start_ns", "children_ns")
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.children_ns = 0
+
+    def __enter__(self) -> '_Span':
+        self.tracer._stack().append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        end_ns = time.perf_counter_ns()
+        stack = self.tracer._stack()
+        stack.pop()
+        duration = end_ns - self.start_ns
+        if stack:
+            stack[-1].children_ns += duration
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self, duration)
+        return False
+
+
+class Tracer:
+    """Coleta spans de todas as threads."""
+
+    def __init__(self):
+        self._origin_ns = time.perf_counter_ns()
+        self._events: List[Dict[str, Any]] = []
+        self._phases: Dict[str, PhaseStats] = {}
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def span(self, name: str, category: str = "phase", **args) -> _Span:
+        """
+        Cria um span (use com ``with``).
+
+        Args:
+            name: Nome da fase
+            category: Categoria (agrupamento no visualizador)
+            **args: Dados exibidos no visualizador
+
+        Returns:
+            Gerenciador de contexto do span
+        """
+        return _Span(self, name, category, args)
+
+    def phase_stats(self) -> Dict[str, PhaseStats]:
+        """
+        Totais por fase: quantidade, tempo total e tempo próprio (sem os spans internos).
+
+        Returns:
+            Dicionário nome -> totais, do maior tempo próprio ao menor
+        """
+        with self._lock:
+            items = sorted(self._phases.items(), key=lambda item: -item[1].self_ns)
+            return {name: PhaseStats(s.count, s.total_ns, s.self_ns) for name, s in items}
+
+    def export_chrome(self, path: str):
+        """
+        Grava os spans no formato Trace Event (JSON) do Chrome.
+
+        Args:
+            path: Arquivo de saída
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            for event in self._events:
+                events.append(dict(event, pid=pid))
+
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _thread_id(self) -> int:
+        # Identificadores de thread do SO são reaproveitados; cada thread recebe um número próprio
+        tid = getattr(self._local, "tid", None)
+        if tid is None:
+            with self._lock:
+                tid = self._local.tid = len(self._threads) + 1
+                self._threads[tid] = threading.current_thread().name
+        return tid
+
+    def _record(self, span: _Span, duration: int):
+        tid = self._thread_id()
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (span.start_ns - self._origin_ns) / 1000,
+            "dur": duration / 1000,
+            "tid": tid,
+            "args": span.args,
+        }
+        with self._lock:
+            self._events.append(event)
+            stats = self._phases.get(span.name)
+            if stats is None:
+                stats = self._phases[span.name] = PhaseStats()
+            stats.count += 1
+            stats.total_ns += duration
+            stats.self_ns += duration - span.children_ns
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """
+    Ativa (ou desativa, com None) o rastreamento global.
+
+    Args:
+        tracer: Tracer que recebe os spans
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Tracer ativo (None quando o rastreamento está desligado)."""
+    return _tracer
+
+
+def span(name: str, category: str = "phase", **args):
+    """
+    Mede uma fase com o tracer ativo; sem tracer, não faz nada.
+
+    Args:
+        name: Nome da fase
+        category: Categoria (agrupamento no visualizador)
+        **args: Dados exibidos no visualizador
+
+    Returns:
+        Gerenciador de contexto
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, category, **args)
+
+
+def traced(name: str, category: str = "phase"):
+    """
+    Decorador que mede cada chamada da função como um span.
+
+    Args:
+        name: Nome da fase
+        category: Categoria (agrupamento no visualizador)
+
+    Returns:
+        Decorador
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return function(*args, **kwargs)
+            with tracer.span(name, category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
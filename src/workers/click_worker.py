@@ -1,8 +1,20 @@
 """
-Classe que carrega uma nova tela de forma assíncrona.
+Worker que executa cliques em um processo separado.
+
+Modo persistente (``--serve <backend> [pid]``): lê comandos JSON (um por linha)
+da entrada padrão e responde na saída padrão quando o clique retorna ou fica bloqueado em uma
+janela modal; falhas do clique são devolvidas ao cliente. A conexão com a
+aplicação (pelo processo, quando informado) e os controles resolvidos são
+mantidos entre os comandos.
+
+Modo legado: ``click_worker.py <titulo_janela> <nome_botao>`` executa um único clique.
 """
 import sys
+import json
+import threading
 import time
+from typing import Optional
+
 from pywinauto import Application
 
 try:
@@ -12,40 +24,232 @@ try:
 except ImportError:
     HAS_WIN32 = False
 
-titulo_janela = sys.argv[1]
-nome_botao = sys.argv[2]
-
-app = Application(backend="uia").connect(title_re=titulo_janela)
-window = app.window(title_re=titulo_janela)
-
-# Tentar trazer para foco usando pywinauto
-window.set_focus()
-time.sleep(0.2)
-
-# Tentar usar win32 para garantir que fica no topo
-if HAS_WIN32:
-    try:
-        hwnd = window.handle
-        # Mostrar e ativar a janela
-        win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
-        win32gui.SetForegroundWindow(hwnd)
-        win32gui.BringWindowToTop(hwnd)
-        time.sleep(0.2)
-    except Exception:
-        pass
-
-control = window.child_window(auto_id=nome_botao, control_type="Button")
-if not control.exists():
-    control = window.child_window(title=nome_botao, control_type="Button")
-    if not control.exists():
-        control = window.child_window(class_name=nome_botao, control_type="Button")
-
-if control.exists():
-    try:
-        control.set_focus()
-        time.sleep(0.2)
-    except Exception:
-        pass
-
-    control.click()
-    time.sleep(0.5) 
+try:
+    import pythoncom
+    HAS_PYTHONCOM = True
+except ImportError:
+    HAS_PYTHONCOM = False
+
+# Tempo máximo aguardando o clique retornar; depois disso ele é tratado como
+# bloqueado no laço de uma janela modal
+DISPATCH_TIMEOUT = 2.0
+DISPATCH_POLL_INTERVAL = 0.05
+
+
+class ClickWorkerService:
+    """
+    Mantém a conexão com a aplicação e os controles resolvidos para cliques sucessivos.
+
+    A conexão é feita pelo processo da aplicação (quando informado), pois com
+    --workers todas as instâncias têm o mesmo título. Janelas e controles são
+    guardados já resolvidos (wrapper_object) e, antes de reutilizados, só é
+    verificado se ainda existem (IsWindow ou runtime id), sem nova busca na
+    árvore de automação.
+    """
+
+    def __init__(self, backend: str = "uia", process_id: Optional[int] = None):
+        self.backend = backend
+        self.process_id = process_id
+        self._app = None
+        self._windows = {}
+        self._controls = {}
+
+    def _connect(self, window_title: str):
+        """Conecta à aplicação pelo processo ou, sem ele, pelo título da janela."""
+        if self._app is None:
+            if self.process_id is not None:
+                self._app = Application(backend=self.backend).connect(process=self.process_id)
+            else:
+                self._app = Application(backend=self.backend).connect(title_re=window_title)
+        return self._app
+
+    @staticmethod
+    def _runtime_id(wrapper):
+        """Identificação do elemento na UIA (None no backend win32)."""
+        try:
+            return wrapper.element_info.runtime_id
+        except Exception:
+            return None
+
+    @staticmethod
+    def _is_alive(wrapper, runtime_id) -> bool:
+        """Verifica, sem buscar na árvore, se o elemento resolvido ainda existe."""
+        try:
+            handle = wrapper.handle
+            if handle and HAS_WIN32:
+                return bool(win32gui.IsWindow(handle))
+            # Sem handle (controles UIA): o runtime id de um elemento destruído falha ou muda
+            return runtime_id is not None and wrapper.element_info.runtime_id == runtime_id
+        except Exception:
+            return False
+
+    def _get_window(self, window_title: str):
+        """Obtém a janela pelo título, reutilizando a já resolvida se ainda existir."""
+        cached = self._windows.get(window_title)
+        if cached is not None:
+            if self._is_alive(*cached):
+                return cached[0]
+            self._windows.pop(window_title, None)
+
+        try:
+            window = self._connect(window_title).window(title_re=window_title).wrapper_object()
+        except Exception:
+            if self.process_id is not None:
+                raise
+            # Sem o processo, a aplicação conectada pelo título pode ter sido reaberta
+            self._app = None
+            window = self._connect(window_title).window(title_re=window_title).wrapper_object()
+        self._windows[window_title] = (window, self._runtime_id(window))
+        return window
+
+    def _get_control(self, window, window_title: str, control_name: str):
+        """Obtém o botão por auto_id, título ou classe, reutilizando o já resolvido."""
+        key = (window_title, control_name)
+        cached = self._controls.get(key)
+        if cached is not None:
+            if self._is_alive(*cached):
+                return cached[0]
+            self._controls.pop(key, None)
+
+        parent = self._app.window(handle=window.handle)
+        for criteria in ("auto_id", "title", "class_name"):
+            try:
+                control = parent.child_window(
+                    control_type="Button", **{criteria: control_name}
+                ).wrapper_object()
+            except Exception:
+                continue
+            self._controls[key] = (control, self._runtime_id(control))
+            return control
+
+        raise LookupError(f"Controle não encontrado: {control_name}")
+
+    def _bring_to_foreground(self, window):
+        """Traz a janela para o primeiro plano."""
+        try:
+            window.set_focus()
+        except Exception:
+            pass
+
+        if HAS_WIN32:
+            try:
+                hwnd = window.handle
+                win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
+                win32gui.SetForegroundWindow(hwnd)
+                win32gui.BringWindowToTop(hwnd)
+            except Exception:
+                pass
+
+    def click(self, window_title: str, control_name: str, wait: bool = False) -> bool:
+        """
+        Dispara o clique e, por padrão, retorna sem aguardar o seu término.
+
+        O clique pode bloquear (ex.: botão que abre uma janela modal), por isso
+        roda em uma thread própria. Retornamos quando o clique termina ou
+        quando fica claro que ele está preso no laço da janela modal (a janela
+        dona foi desabilitada, ou o clique não retornou em DISPATCH_TIMEOUT).
+
+        Returns:
+            True se o clique ainda está bloqueado (janela modal aberta)
+
+        Raises:
+            Exception: Se o clique falhou
+        """
+        window = self._get_window(window_title)
+        self._bring_to_foreground(window)
+        control = self._get_control(window, window_title, control_name)
+
+        done = threading.Event()
+        errors = []
+
+        def _dispatch():
+            if HAS_PYTHONCOM:
+                pythoncom.CoInitialize()
+            try:
+                try:
+                    control.set_focus()
+                except Exception:
+                    pass
+                control.click()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                done.set()
+                if HAS_PYTHONCOM:
+                    pythoncom.CoUninitialize()
+
+        thread = threading.Thread(target=_dispatch, daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        else:
+            self._wait_dispatch(window, done)
+
+        if errors:
+            raise Exception(f"Falha ao clicar em '{control_name}': {errors[0]}")
+        return not done.is_set()
+
+    def _wait_dispatch(self, window, done: threading.Event):
+        """Aguarda o clique terminar ou a janela ser desabilitada por uma janela modal."""
+        hwnd = None
+        if HAS_WIN32:
+            try:
+                hwnd = window.handle
+            except Exception:
+                hwnd = None
+
+        deadline = time.monotonic() + DISPATCH_TIMEOUT
+        while not done.wait(DISPATCH_POLL_INTERVAL):
+            if hwnd is not None:
+                try:
+                    if not win32gui.IsWindowEnabled(hwnd):
+                        return
+                except Exception:
+                    hwnd = None
+            if time.monotonic() >= deadline:
+                return
+
+    def handle(self, request: dict) -> dict:
+        """Executa um comando e monta a resposta."""
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True}
+        if command == "click":
+            blocked = self.click(request["window"], request["control"])
+            return {"ok": True, "dispatched": True, "blocked": blocked}
+        raise ValueError(f"Comando desconhecido: {command}")
+
+    def serve(self, stdin, stdout):
+        """Laço principal do modo persistente."""
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            request = {}
+            try:
+                request = json.loads(line)
+                if request.get("command") == "shutdown":
+                    break
+                response = self.handle(request)
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            response["id"] = request.get("id")
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        backend = sys.argv[2] if len(sys.argv) > 2 else "uia"
+        process_id = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        ClickWorkerService(backend, process_id).serve(sys.stdin, sys.stdout)
+        return
+
+    titulo_janela = sys.argv[1]
+    nome_botao = sys.argv[2]
+    ClickWorkerService().click(titulo_janela, nome_botao, wait=True)
+    time.sleep(0.5)
+
+
+if __name__ == "__main__":
+    main()
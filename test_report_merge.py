@@ -0,0 +1,63 @@
+"""
+Testes da combinação dos relatórios de shards (--merge-reports).
+
+Os relatórios são montados em memória; nenhum teste depende da aplicação.
+Execute com pytest ou diretamente:
+
+    python test_report_merge.py
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.report_merge import merge_results
+from src.models.test_result import (
+    TestCaseResult, TestExecutionResult, TestStatus, TestSuiteResult
+)
+
+START = datetime(2026, 1, 1, 10, 0, 0)
+TEST_ORDER = ["S1/a", "S1/c", "S2/b"]
+
+
+def build_shard(index: int, tests) -> TestExecutionResult:
+    """Relatório de um shard com os testes (suíte, id) informados."""
+    start_ns = int(START.timestamp() * 1e9)
+    result = TestExecutionResult(
+        application_name="App", start_time=START, end_time=START, duration=0.0,
+        shard={
+            "index": index, "count": 2, "strategy": "count", "fingerprint": "f",
+            "test_order": TEST_ORDER
+        }
+    )
+    suites = {}
+    for suite_name, test_id in tests:
+        if suite_name not in suites:
+            suites[suite_name] = TestSuiteResult(
+                suite_name=suite_name, start_time=START, end_time=START, duration=0.0
+            )
+            result.add_suite_result(suites[suite_name])
+        suites[suite_name].add_test_result(TestCaseResult(
+            test_id=test_id, test_name=test_id, status=TestStatus.PASSED,
+            start_ns=start_ns, end_ns=start_ns
+        ))
+    return result
+
+
+def test_suites_follow_script_order():
+    """As suítes saem na ordem do script, mesmo com os relatórios fora de ordem."""
+    shard1 = build_shard(1, [("S1", "a")])
+    shard2 = build_shard(2, [("S2", "b"), ("S1", "c")])
+    merged, warnings = merge_results([shard2, shard1])
+
+    assert warnings == []
+    assert [s.suite_name for s in merged.suite_results] == ["S1", "S2"]
+    assert [t.test_id for t in merged.suite_results[0].test_results] == ["a", "c"]
+    assert merged.total_tests == 3
+
+
+if __name__ == "__main__":
+    test_suites_follow_script_order()
+    print("✓ Testes da combinação de relatórios concluídos")
@@ -0,0 +1,173 @@
+"""
+Testes da retenção de screenshots (escolha dos diretórios removidos e dos
+objetos deduplicados) em um diretório temporário.
+
+Os diretórios de execuções anteriores são criados com datas antigas; nenhum
+teste depende da aplicação. Execute com pytest ou diretamente:
+
+    python test_screenshot_retention.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PIL import Image
+
+from src.core.screenshot_retention import OBJECT_REFERENCES_FILE, ScreenshotRetention
+from src.core.screenshot_store import ScreenshotStore
+from src.models.test_script import RetentionSettings
+
+# Execuções anteriores: um dia antes do teste
+OLD = time.time() - 86400
+
+
+def create_object(root: Path, name: str, size: int = 5000) -> str:
+    """Cria um objeto antigo em objects/ e retorna o caminho relativo à raiz."""
+    relative = f"objects/{name[:2]}/{name}.png"
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"o" * size)
+    os.utime(path, (OLD, OLD))
+    return relative
+
+
+def create_test_dir(root: Path, name: str, objects=(), size: int = 1000):
+    """Cria um diretório de teste antigo que referencia os objetos informados."""
+    test_dir = root / name
+    test_dir.mkdir()
+    (test_dir / "screenshot.png").write_bytes(b"s" * size)
+    (test_dir / OBJECT_REFERENCES_FILE).write_text(
+        "".join(f"{relative}\n" for relative in objects), encoding="utf-8"
+    )
+    os.utime(test_dir, (OLD, OLD))
+
+
+def create_retention(directory: Path, **settings) -> ScreenshotRetention:
+    return ScreenshotRetention(
+        directory / "screenshots", RetentionSettings(**settings), reports_dir=directory / "reports"
+    )
+
+
+def build_tree(directory: Path):
+    """Duas execuções antigas (pelo horário no nome): a mais recente usa o objeto cc."""
+    root = directory / "screenshots"
+    root.mkdir()
+    aa = create_object(root, "aa")
+    bb = create_object(root, "bb")
+    cc = create_object(root, "cc")
+    create_test_dir(root, "Suite_TC01_20260101_100000", [aa, bb])
+    create_test_dir(root, "Suite_TC02_20260101_100010_w1", [bb])
+    create_test_dir(root, "Suite_TC03_20260102_100000", [cc])
+    return root
+
+
+def remaining(root: Path):
+    return sorted(path.relative_to(root).as_posix() for path in root.rglob("*.png"))
+
+
+def test_keep_runs_groups_unindexed_directories_by_name():
+    """Diretórios sem índice são agrupados em execuções pelo horário do nome."""
+    with tempfile.TemporaryDirectory() as directory:
+        root = build_tree(Path(directory))
+        retention = create_retention(Path(directory), keep_runs=1)
+        retention.enforce()
+
+        assert remaining(root) == [
+            "Suite_TC03_20260102_100000/screenshot.png", "objects/cc/cc.png"
+        ]
+        assert retention.stats()["evicted"] == 2
+        assert retention.stats()["evicted_objects"] == 2
+
+
+def test_quota_counts_objects_freed_by_each_directory():
+    """Na cota, remover um diretório libera também os objetos que só ele usava."""
+    with tempfile.TemporaryDirectory() as directory:
+        root = build_tree(Path(directory))
+        # ~18 KB no total; remover o TC01 libera o diretório e o objeto aa (bb segue em uso)
+        retention = create_retention(Path(directory), max_size_mb=15000 / (1024 * 1024))
+        retention.enforce()
+
+        assert remaining(root) == [
+            "Suite_TC02_20260101_100010_w1/screenshot.png",
+            "Suite_TC03_20260102_100000/screenshot.png",
+            "objects/bb/bb.png",
+            "objects/cc/cc.png",
+        ]
+
+
+def test_failure_object_referenced_by_report_is_protected():
+    """Um objeto usado como screenshot de falha em um relatório recente não é removido."""
+    with tempfile.TemporaryDirectory() as directory:
+        root = build_tree(Path(directory))
+        reports = Path(directory) / "reports"
+        reports.mkdir()
+        report = reports / "report_20260101_100000.json"
+        report.write_text(json.dumps({"suite_results": [{"test_results": [{
+            "status": "failed",
+            "action_results": [
+                {"status": "failed", "screenshot_path": str(root / "objects/aa/aa.png")}
+            ]
+        }]}]}), encoding="utf-8")
+        os.utime(report, (OLD, OLD))
+
+        retention = create_retention(Path(directory), keep_runs=1)
+        retention.enforce()
+
+        assert "objects/aa/aa.png" in remaining(root)
+        assert "objects/bb/bb.png" not in remaining(root)
+
+
+def test_reused_object_is_not_evicted():
+    """
+    Um objeto antigo reutilizado pela execução atual não é removido pela
+    retenção em segundo plano (o uso é registrado ao conferir a existência).
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory) / "screenshots"
+        image = Image.new("RGB", (4, 4), (10, 20, 30))
+        path, _ = ScreenshotStore(root / "objects").put(image)
+        path.write_bytes(b"o" * 100)
+        os.utime(path, (OLD, OLD))
+
+        retention = create_retention(Path(directory), keep_runs=1)
+        store = ScreenshotStore(root / "objects", on_reference=retention.reference_file)
+        reused, is_new = store.put(image)
+        assert reused == path and not is_new
+
+        # Nenhum diretório referencia o objeto: sem o registro, ele seria removido
+        retention.enforce()
+        assert path.exists()
+        assert retention.stats()["evicted_objects"] == 0
+
+
+def test_object_evicted_before_reuse_is_written_again():
+    """Se a retenção remove o objeto antes da captura, ele é tratado como novo."""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory) / "screenshots"
+        image = Image.new("RGB", (4, 4), (10, 20, 30))
+        path, _ = ScreenshotStore(root / "objects").put(image)
+        path.write_bytes(b"o" * 100)
+        os.utime(path, (OLD, OLD))
+
+        retention = create_retention(Path(directory), keep_runs=1)
+        retention.enforce()
+        assert not path.exists()
+
+        store = ScreenshotStore(root / "objects", on_reference=retention.reference_file)
+        rewritten, is_new = store.put(image)
+        assert rewritten == path and is_new
+
+
+if __name__ == "__main__":
+    test_keep_runs_groups_unindexed_directories_by_name()
+    test_quota_counts_objects_freed_by_each_directory()
+    test_failure_object_referenced_by_report_is_protected()
+    test_reused_object_is_not_evicted()
+    test_object_evicted_before_reuse_is_written_again()
+    print("✓ Testes da retenção de screenshots concluídos")
@@ -0,0 +1,150 @@
+"""
+Testes do WindowWaiter e do AppManager.wait_window com a fonte de eventos falsa.
+
+Os eventos são disparados manualmente (FakeWindowEventSource), sem desktop.
+O intervalo de verificação de salvaguarda é longo, de modo que os testes só
+terminam rápido se a espera acordar pelo evento. Execute com pytest ou
+diretamente:
+
+    python test_window_events.py
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.app_manager import AppManager
+from src.core.window_events import (
+    WINDOW_CREATED, WINDOW_SHOWN, FakeWindowEventSource, WindowWaiter
+)
+from src.core.window_registry import WindowRegistry
+
+# Salvaguarda por polling bem maior que os prazos dos testes
+FALLBACK_INTERVAL = 30.0
+
+
+def create_waiter():
+    source = FakeWindowEventSource()
+    waiter = WindowWaiter(source, fallback_interval=FALLBACK_INTERVAL)
+    source.start(process_id=1)
+    return source, waiter
+
+
+def emit_later(source: FakeWindowEventSource, delay: float, before_emit=None):
+    """Dispara um evento de janela criada em outra thread após alguns instantes."""
+    def _emit():
+        time.sleep(delay)
+        if before_emit is not None:
+            before_emit()
+        source.emit(WINDOW_CREATED, handle=100)
+
+    thread = threading.Thread(target=_emit, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_window_appears_before_timeout():
+    """A espera termina assim que o evento chega, sem aguardar o polling."""
+    source, waiter = create_waiter()
+    window = threading.Event()
+    thread = emit_later(source, 0.1, before_emit=window.set)
+
+    started_at = time.monotonic()
+    assert waiter.wait_for(window.is_set, timeout=5)
+    elapsed = time.monotonic() - started_at
+    thread.join()
+
+    assert 0.05 <= elapsed < 1.0
+
+
+def test_timeout_expires_without_window():
+    """Sem a janela, a espera termina no prazo (e não no intervalo de polling)."""
+    source, waiter = create_waiter()
+
+    started_at = time.monotonic()
+    assert not waiter.wait_for(lambda: False, timeout=0.3)
+    elapsed = time.monotonic() - started_at
+
+    assert 0.3 <= elapsed < 1.0
+
+
+def test_timeout_expires_when_events_do_not_match():
+    """Eventos de outras janelas acordam a espera, mas ela continua até o prazo."""
+    source, waiter = create_waiter()
+    checks = []
+
+    def _never():
+        checks.append(time.monotonic())
+        return False
+
+    thread = emit_later(source, 0.1)
+    started_at = time.monotonic()
+    assert not waiter.wait_for(_never, timeout=0.4)
+    elapsed = time.monotonic() - started_at
+    thread.join()
+
+    assert 0.4 <= elapsed < 1.0
+    # Verificação inicial, a do evento e a final no prazo
+    assert len(checks) >= 3
+
+
+def test_event_before_wait_starts():
+    """A janela que apareceu (com o evento) antes da espera é encontrada de imediato."""
+    source, waiter = create_waiter()
+    window = threading.Event()
+    window.set()
+    source.emit(WINDOW_SHOWN, handle=100)
+
+    started_at = time.monotonic()
+    assert waiter.wait_for(window.is_set, timeout=5)
+    assert time.monotonic() - started_at < 0.1
+
+
+def test_event_during_check_is_not_lost():
+    """Um evento que chega entre a verificação e o início da espera não é perdido."""
+    source, waiter = create_waiter()
+    window = threading.Event()
+
+    def _check():
+        if window.is_set():
+            return True
+        # A janela aparece logo depois da verificação, antes de a espera começar
+        window.set()
+        source.emit(WINDOW_CREATED, handle=100)
+        return False
+
+    started_at = time.monotonic()
+    assert waiter.wait_for(_check, timeout=5)
+    assert time.monotonic() - started_at < 0.5
+
+
+def test_app_manager_wait_window():
+    """wait_window acorda com o evento e encontra a janela pelo registro."""
+    source = FakeWindowEventSource()
+    app_manager = AppManager(sys.executable, event_source=source)
+    app_manager.window_waiter.fallback_interval = FALLBACK_INTERVAL
+    windows = {1: "Principal"}
+    app_manager.window_registry = WindowRegistry(lambda: list(windows.items()))
+    source.start(process_id=1)
+
+    thread = emit_later(source, 0.1, before_emit=lambda: windows.update({2: "Salvar arquivo"}))
+    started_at = time.monotonic()
+    assert app_manager.wait_window("Salvar arquivo", timeout=5)
+    elapsed = time.monotonic() - started_at
+    thread.join()
+
+    assert elapsed < 1.0
+    assert not app_manager.wait_window("Exportar", timeout=0.2)
+
+
+if __name__ == "__main__":
+    test_window_appears_before_timeout()
+    test_timeout_expires_without_window()
+    test_timeout_expires_when_events_do_not_match()
+    test_event_before_wait_starts()
+    test_event_during_check_is_not_lost()
+    test_app_manager_wait_window()
+    print("✓ Testes de eventos de janela concluídos")
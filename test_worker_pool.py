@@ -0,0 +1,423 @@
+"""
+Testes da execução paralela (--workers) sem a aplicação real.
+
+O pool é exercitado com contextos falsos e o TestExecutor com um AppManager
+falso no lugar do pywinauto. Execute com pytest ou diretamente:
+
+    python test_worker_pool.py
+"""
+import os
+import sys
+import tempfile
+import _thread
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.actions.base_action import BaseAction
+from src.actions.wait_action import WaitAction
+from src.core.desktop_lock import desktop_lock
+from src.core.foreground_tracker import ForegroundTracker
+from src.core.locator_cache import LocatorCache
+from src.core.test_executor import TestExecutor
+from src.core.worker_pool import ScheduledTest, TestScheduler, WorkerContext, WorkerPool
+from src.models.execution_options import ExecutionOptions
+from src.models.test_result import TestStatus
+from src.models.test_script import TestScript
+from src.utils.logger import TestLogger
+
+
+class FakeLogger:
+    """Logger que apenas guarda as mensagens de erro."""
+
+    def __init__(self):
+        self.errors = []
+
+    def error(self, message, *args):
+        self.errors.append(message % args if args else message)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FakeAppManager:
+    """AppManager sem aplicação: inicia e fecha sem abrir janelas."""
+
+    instances = 0
+
+    def __init__(self, **kwargs):
+        FakeAppManager.instances += 1
+        self.timeout = kwargs.get("timeout", 10)
+        self.app = None
+        self.startup_latency = 0.01
+        self.foreground_tracker = ForegroundTracker()
+        self.locator_cache = LocatorCache()
+        self.closed = False
+
+    def start(self):
+        return True
+
+    def close(self, force=False):
+        self.closed = True
+
+    def get_window(self, title=None, **kwargs):
+        raise Exception("Sem janela")
+
+    def bring_to_foreground(self, window=None):
+        pass
+
+
+def build_script(suites: int = 3, tests_per_suite: int = 5) -> TestScript:
+    """Script com testes que apenas aguardam alguns milissegundos."""
+    return TestScript.from_dict({
+        "version": "1.0",
+        "application": {"name": "App Falsa", "path": "app.exe"},
+        "test_suites": [
+            {
+                "name": f"Suite{suite}",
+                "description": "Suíte de teste",
+                "test_cases": [
+                    {
+                        "id": f"TC{suite}{test:02d}",
+                        "name": f"Teste {test}",
+                        "description": "Teste",
+                        "actions": [
+                            {"type": "wait", "description": "Aguardar", "duration": 0.01}
+                        ]
+                    }
+                    for test in range(tests_per_suite)
+                ]
+            }
+            for suite in range(suites)
+        ]
+    })
+
+
+def build_plan(script: TestScript):
+    return [
+        ScheduledTest(suite_index, test_index, suite, test_case)
+        for suite_index, suite in enumerate(script.test_suites)
+        for test_index, test_case in enumerate(suite.test_cases)
+    ]
+
+
+def build_contexts(count: int):
+    return [
+        WorkerContext(worker_id, FakeAppManager(), None, FakeLogger())
+        for worker_id in range(1, count + 1)
+    ]
+
+
+def test_pool_runs_each_test_once():
+    """Cada teste agendado é executado exatamente uma vez, distribuído entre os workers."""
+    plan = build_plan(build_script())
+    contexts = build_contexts(4)
+    executed = []
+    workers = set()
+    lock = threading.Lock()
+
+    def run_test(context, scheduled):
+        time.sleep(0.005)
+        with lock:
+            executed.append(scheduled.test_case.test_id)
+            workers.add(context.worker_id)
+
+    pool = WorkerPool(contexts, TestScheduler(plan), run_test, FakeLogger())
+    pool.run()
+
+    counts = Counter(executed)
+    assert sorted(counts) == sorted(s.test_case.test_id for s in plan)
+    assert set(counts.values()) == {1}
+    assert len(workers) > 1
+
+
+def test_pool_reports_test_errors():
+    """Um teste que levanta exceção no worker é repassado a on_error, sem sumir da execução."""
+    plan = build_plan(build_script(suites=1, tests_per_suite=6))
+    failing = plan[2].test_case.test_id
+    executed = []
+    errors = []
+    lock = threading.Lock()
+
+    def run_test(context, scheduled):
+        if scheduled.test_case.test_id == failing:
+            raise RuntimeError("falha no worker")
+        with lock:
+            executed.append(scheduled.test_case.test_id)
+
+    def on_error(context, scheduled, error):
+        with lock:
+            errors.append((scheduled.test_case.test_id, str(error)))
+
+    pool = WorkerPool(build_contexts(3), TestScheduler(plan), run_test, FakeLogger(), on_error)
+    pool.run()
+
+    assert errors == [(failing, "falha no worker")]
+    assert sorted(executed + [failing]) == sorted(s.test_case.test_id for s in plan)
+
+
+def test_pool_interrupt_waits_for_running_tests():
+    """Com Ctrl+C, o pool aguarda os testes em andamento antes de repassar a interrupção."""
+    plan = build_plan(build_script(suites=2, tests_per_suite=6))
+    started = []
+    finished = []
+    lock = threading.Lock()
+
+    def run_test(context, scheduled):
+        with lock:
+            started.append(scheduled.test_case.test_id)
+            first = len(started) == 1
+        if first:
+            # Simula o Ctrl+C na thread principal durante a execução
+            _thread.interrupt_main()
+        time.sleep(0.2)
+        with lock:
+            finished.append(scheduled.test_case.test_id)
+
+    pool = WorkerPool(build_contexts(3), TestScheduler(plan), run_test, FakeLogger())
+    try:
+        pool.run()
+        assert False, "KeyboardInterrupt não repassado"
+    except KeyboardInterrupt:
+        pass
+
+    assert pool.stop_event.is_set()
+    assert sorted(finished) == sorted(started)
+    assert len(started) < len(plan)
+
+
+class DesktopProbe:
+    """Conta quantas threads estão ao mesmo tempo na seção da área de trabalho."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.entries = 0
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.entries += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def exit(self):
+        with self.lock:
+            self.active -= 1
+
+
+class ProbeAction(BaseAction):
+    """Ação que simula foco, teclas e captura, registrando a sobreposição entre workers."""
+
+    probe = None
+
+    def _execute_action(self, action):
+        self.probe.enter()
+        try:
+            # Foco, digitação e captura levam alguns milissegundos cada
+            time.sleep(0.01)
+            with desktop_lock():
+                time.sleep(0.005)
+        finally:
+            self.probe.exit()
+
+
+class ProbeActionFactory:
+    """Cria ProbeAction para as ações de entrada e a WaitAction real para as esperas."""
+
+    def create_action(self, action_type, app_manager, screenshot_manager, logger):
+        action_class = WaitAction if action_type == "wait" else ProbeAction
+        return action_class(app_manager, screenshot_manager, logger)
+
+
+def run_executor(script: TestScript, workers: int, failing_test: str = None,
+                 action_factory=None):
+    """Executa o script no TestExecutor com AppManagers falsos, em um diretório temporário."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+        # Screenshots, logs e relatórios da execução ficam no diretório temporário
+        os.chdir(directory)
+        try:
+            options = ExecutionOptions(
+                workers=workers, checkpoint_dir=None, history_path=None, log_capture="off"
+            )
+            executor = TestExecutor(TestLogger(), options, app_manager_factory=FakeAppManager)
+            if action_factory is not None:
+                executor.action_factory = action_factory
+            if failing_test is not None:
+                execute_test_case = executor._execute_test_case
+
+                def failing_execute(suite_name, test_case, context, on_action=None):
+                    if test_case.test_id == failing_test:
+                        raise RuntimeError("falha no worker")
+                    return execute_test_case(suite_name, test_case, context, on_action)
+
+                executor._execute_test_case = failing_execute
+            return executor.execute_script(script)
+        finally:
+            os.chdir(cwd)
+
+
+def test_executor_parallel_with_stub_application():
+    """O TestExecutor com --workers 3 reúne todos os testes em um único resultado."""
+    script = build_script()
+    before = FakeAppManager.instances
+    result = run_executor(script, workers=3)
+
+    assert FakeAppManager.instances - before == 3
+    assert result.total_tests == 15
+    assert result.passed_tests == 15
+    for suite, suite_result in zip(script.test_suites, result.suite_results):
+        assert [t.test_id for t in suite_result.test_results] == [
+            t.test_id for t in suite.test_cases
+        ]
+
+
+def test_executor_parallel_records_worker_errors():
+    """Um teste que levanta exceção no worker entra no resultado com status ERROR."""
+    script = build_script()
+    result = run_executor(script, workers=3, failing_test="TC102")
+
+    assert result.total_tests == 15
+    assert result.error_tests == 1
+    test_results = {t.test_id: t for s in result.suite_results for t in s.test_results}
+    assert test_results["TC102"].status == TestStatus.ERROR
+    assert "falha no worker" in test_results["TC102"].error_message
+
+
+def test_workers_never_overlap_on_desktop():
+    """Com --workers, foco, entrada e captura de workers diferentes nunca se sobrepõem."""
+    script = TestScript.from_dict({
+        "version": "1.0",
+        "application": {"name": "App Falsa", "path": "app.exe"},
+        "test_suites": [
+            {
+                "name": "Suite",
+                "description": "Suíte de teste",
+                "test_cases": [
+                    {
+                        "id": f"TC{test:02d}",
+                        "name": f"Teste {test}",
+                        "description": "Teste",
+                        "actions": [
+                            {"type": "type_text", "description": "Digitar", "text": "abc"},
+                            {"type": "wait", "description": "Aguardar", "duration": 0.01},
+                            {"type": "type_text", "description": "Digitar", "text": "def"}
+                        ]
+                    }
+                    for test in range(8)
+                ]
+            }
+        ]
+    })
+    probe = DesktopProbe()
+    ProbeAction.probe = probe
+    result = run_executor(script, workers=3, action_factory=ProbeActionFactory())
+
+    assert result.passed_tests == 8
+    assert probe.entries == 16
+    assert probe.max_active == 1
+
+
+def test_executor_closes_instances_that_fail_to_start():
+    """A instância que falha ao iniciar é fechada (processo e threads), e as demais executam."""
+    created = []
+
+    class FailingAppManager(FakeAppManager):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            created.append(self)
+
+        def start(self):
+            if len(created) == 2 and self is created[1]:
+                raise TimeoutError("aplicação não ficou pronta")
+            return True
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+        os.chdir(directory)
+        try:
+            options = ExecutionOptions(
+                workers=3, checkpoint_dir=None, history_path=None, log_capture="off"
+            )
+            executor = TestExecutor(TestLogger(), options, app_manager_factory=FailingAppManager)
+            result = executor.execute_script(build_script())
+        finally:
+            os.chdir(cwd)
+
+    assert result.total_tests == 15
+    assert all(app_manager.closed for app_manager in created)
+
+
+def test_executor_tears_down_on_unexpected_error():
+    """Um erro inesperado na execução ainda fecha relatório, logs, histórico e checkpoint."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+        os.chdir(directory)
+        try:
+            options = ExecutionOptions(
+                workers=2, report_format="jsonl", history_path="history/history.db",
+                log_capture="all"
+            )
+            executor = TestExecutor(TestLogger(), options, app_manager_factory=FakeAppManager)
+
+            def broken_parallel(test_script, plan):
+                raise RuntimeError("falha no agendamento")
+
+            executor._execute_parallel = broken_parallel
+            try:
+                executor.execute_script(build_script())
+                assert False, "RuntimeError não repassado"
+            except RuntimeError:
+                pass
+        finally:
+            os.chdir(cwd)
+
+    assert executor._report_stream is None
+    assert executor._log_capture is None
+    assert executor._history is None
+    assert executor._checkpoint is None
+
+
+def test_profile_stops_when_test_raises():
+    """O perfil de um teste que levanta exceção é encerrado; os seguintes continuam medidos."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+        os.chdir(directory)
+        try:
+            options = ExecutionOptions(
+                workers=3, checkpoint_dir=None, history_path=None, log_capture="off",
+                profile=True
+            )
+            executor = TestExecutor(TestLogger(), options, app_manager_factory=FakeAppManager)
+            execute_test_case = executor._execute_test_case
+
+            def failing_execute(suite_name, test_case, context, on_action=None):
+                if test_case.test_id == "TC102":
+                    raise RuntimeError("falha no worker")
+                return execute_test_case(suite_name, test_case, context, on_action)
+
+            executor._execute_test_case = failing_execute
+            result = executor.execute_script(build_script())
+        finally:
+            os.chdir(cwd)
+
+    assert result.error_tests == 1
+    assert executor._profiler.profiled + executor._profiler.skipped == 15
+
+
+if __name__ == "__main__":
+    test_pool_runs_each_test_once()
+    test_pool_reports_test_errors()
+    test_pool_interrupt_waits_for_running_tests()
+    test_executor_parallel_with_stub_application()
+    test_executor_parallel_records_worker_errors()
+    test_workers_never_overlap_on_desktop()
+    test_executor_closes_instances_that_fail_to_start()
+    test_executor_tears_down_on_unexpected_error()
+    test_profile_stops_when_test_raises()
+    print("✓ Testes da execução paralela concluídos")